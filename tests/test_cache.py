@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+
+from todoist_api_python._core.cache import EntityStore, LRUCache, estimate_size
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[int] = LRUCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now the least recently used entry
+    cache["c"] = 3
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.evictions == 1
+
+
+def test_lru_cache_evicts_to_stay_under_max_bytes() -> None:
+    value = {"content": "x" * 1000}
+    size = estimate_size(value)
+    cache: LRUCache[dict[str, str]] = LRUCache(max_bytes=size * 2)
+
+    cache["a"] = value
+    cache["b"] = {"content": "y" * 1000}
+    cache["c"] = {"content": "z" * 1000}
+
+    assert len(cache) == 2
+    assert "a" not in cache
+    assert cache.nbytes <= size * 2
+
+
+def test_lru_cache_skips_values_larger_than_max_bytes() -> None:
+    cache: LRUCache[str] = LRUCache(max_bytes=100)
+    cache["a"] = "x" * 1000
+
+    assert "a" not in cache
+    assert cache.nbytes == 0
+
+
+def test_lru_cache_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache: LRUCache[int] = LRUCache(ttl=10, clock=clock)
+    cache["a"] = 1
+    cache.set("b", 2, ttl=20)
+
+    clock.now = 15
+    assert "a" not in cache
+    assert cache["b"] == 2
+    with pytest.raises(KeyError):
+        cache["a"]
+
+    clock.now = 25
+    assert "b" not in cache
+    assert cache.nbytes == 0
+
+
+def test_lru_cache_reports_entry_age() -> None:
+    clock = FakeClock()
+    cache: LRUCache[int] = LRUCache(clock=clock)
+    cache["a"] = 1
+
+    clock.now = 7
+    assert cache.age("a") == 7
+    with pytest.raises(KeyError):
+        cache.age("b")
+
+
+def test_lru_cache_invalidates_by_tag() -> None:
+    cache: LRUCache[int] = LRUCache()
+    cache.set("a", 1, tags={"x"})
+    cache.set("b", 2, tags={"x", "y"})
+    cache.set("c", 3, tags={"z"})
+
+    removed = cache.invalidate({"y", "missing"})
+
+    assert removed == [2]
+    assert "a" in cache
+    assert "b" not in cache
+
+    assert sorted(cache.invalidate({"x", "z"})) == [1, 3]
+    assert len(cache) == 0
+    assert cache._tagged == {}
+
+
+def test_lru_cache_replace_keeps_expiry_and_position() -> None:
+    clock = FakeClock()
+    cache: LRUCache[int] = LRUCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", 1, tags={"x"})
+    cache["b"] = 2
+
+    clock.now = 5
+    cache.replace("a", 10, tags={"y"})
+    cache["c"] = 3  # "a" is still the least recently used entry
+
+    assert "a" not in cache
+    assert cache._tagged == {}
+    clock.now = 10
+    assert "b" not in cache
+
+
+def test_entity_store_keeps_entities_while_referenced() -> None:
+    store: EntityStore[dict[str, str]] = EntityStore()
+    store.acquire(("task", "1"), {"id": "1"}, tags={("in", "project", "A")})
+    store.acquire(("task", "1"), {"id": "1", "content": "new"})
+    store.update(("task", "2"), {"id": "2"})
+
+    assert store.get(("task", "1")) == {"id": "1", "content": "new"}
+    assert ("task", "2") not in store
+    assert store.tagged(("in", "project", "A")) == set()
+
+    store.release(("task", "1"))
+    assert ("task", "1") in store
+    store.release(("task", "1"))
+    assert ("task", "1") not in store
+    assert store.nbytes == 0
+
+
+def test_entity_store_respects_max_age() -> None:
+    clock = FakeClock()
+    store: EntityStore[dict[str, str]] = EntityStore(clock=clock)
+    store.acquire(("task", "1"), {"id": "1"})
+
+    clock.now = 10
+    assert store.get(("task", "1"), max_age=20) == {"id": "1"}
+    assert store.get(("task", "1"), max_age=5) is None
+
+
+def test_entity_store_reacquiring_keeps_fetch_time() -> None:
+    clock = FakeClock()
+    store: EntityStore[dict[str, str]] = EntityStore(clock=clock)
+    task = {"id": "1"}
+    store.acquire(("task", "1"), task)
+
+    clock.now = 10
+    store.acquire(("task", "1"), task)
+    assert store.age(("task", "1")) == 10
+    store.acquire(("task", "1"), {"id": "1"}, age=3)
+    assert store.age(("task", "1")) == 3
+    store.acquire(("task", "1"), {"id": "1"})
+    assert store.age(("task", "1")) == 0
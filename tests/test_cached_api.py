@@ -0,0 +1,536 @@
+from __future__ import annotations
+
+import gc
+import json
+import threading
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock, create_autospec
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests
+import responses
+from responses.matchers import query_param_matcher
+
+from tests.data.test_defaults import DEFAULT_API_URL, DEFAULT_TOKEN
+from todoist_api_python._core.cache import EntityStore
+from todoist_api_python.cached_api import CachedTodoistAPI, cached
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests import PreparedRequest
+
+
+@dataclass(eq=False)
+class Fetcher:
+    calls: list[str] = field(default_factory=list)
+
+    @cached
+    def fetch(self, task_id: str) -> dict[str, Any]:
+        self.calls.append(task_id)
+        return {"id": task_id}
+
+    @cached(max_entries=2)
+    def fetch_bounded(self, task_id: str) -> dict[str, Any]:
+        self.calls.append(task_id)
+        return {"id": task_id}
+
+
+def test_cached_returns_stored_value() -> None:
+    fetcher = Fetcher()
+
+    assert fetcher.fetch("1") == {"id": "1"}
+    assert fetcher.fetch("1") == {"id": "1"}
+    assert fetcher.calls == ["1"]
+
+
+def test_cached_is_bounded_by_max_entries() -> None:
+    fetcher = Fetcher()
+
+    fetcher.fetch_bounded("1")
+    fetcher.fetch_bounded("2")
+    fetcher.fetch_bounded("3")
+    fetcher.fetch_bounded("1")
+
+    assert fetcher.calls == ["1", "2", "3", "1"]
+
+
+def test_cached_is_scoped_to_instance() -> None:
+    first, second = Fetcher(), Fetcher()
+
+    first.fetch("1")
+    second.fetch("1")
+    first.fetch.cache_clear()
+    second.fetch("1")
+
+    assert first.calls == ["1"]
+    assert second.calls == ["1"]
+
+
+def test_cached_does_not_keep_instance_alive() -> None:
+    fetcher = Fetcher()
+    fetcher.fetch("1")
+    ref = weakref.ref(fetcher)
+
+    del fetcher
+    gc.collect()
+
+    assert ref() is None
+
+
+@dataclass(eq=False)
+class SlowFetcher:
+    calls: list[str] = field(default_factory=list)
+    entered: threading.Event = field(default_factory=threading.Event)
+    release: threading.Event = field(default_factory=threading.Event)
+
+    @cached
+    def fetch(self, task_id: str) -> dict[str, Any]:
+        self.calls.append(task_id)
+        self.entered.set()
+        self.release.wait(timeout=5)
+        return {"id": task_id}
+
+
+def test_concurrent_misses_send_one_request() -> None:
+    fetcher = SlowFetcher()
+    results: list[dict[str, Any]] = []
+
+    def fetch() -> None:
+        results.append(fetcher.fetch("1"))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    threads[0].start()
+    fetcher.entered.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    fetcher.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert fetcher.calls == ["1"]
+    assert results == [{"id": "1"}] * 8
+
+
+def test_result_outdated_in_flight_is_not_cached() -> None:
+    fetcher = SlowFetcher()
+
+    thread = threading.Thread(target=fetcher.fetch, args=("1",))
+    thread.start()
+    fetcher.entered.wait(timeout=5)
+    fetcher.fetch.cache_clear()
+    fetcher.release.set()
+    thread.join(timeout=5)
+    fetcher.fetch("1")
+
+    assert fetcher.calls == ["1", "1"]
+
+
+@dataclass(eq=False)
+class VersionedFetcher:
+    version: int = 0
+
+    @cached(soft_ttl=0)
+    def fetch(self, task_id: str) -> dict[str, Any]:
+        self.version += 1
+        return {"id": task_id, "version": self.version}
+
+
+def test_stale_entries_are_returned_and_refreshed_in_background() -> None:
+    fetcher = VersionedFetcher()
+
+    assert fetcher.fetch("1")["version"] == 1
+    assert fetcher.fetch("1")["version"] == 1
+    vars(fetcher)["_cache_refresher"].shutdown(wait=True)
+
+    assert fetcher.version == 2
+    cache = vars(fetcher)["_caches"]["fetch"]
+    assert cache.peek(fetcher.fetch.cache_key("1"))["version"] == 2
+
+
+@responses.activate
+def test_cached_api_options_override_method_limits() -> None:
+    endpoint = f"{DEFAULT_API_URL}/tasks/1"
+    responses.add(responses.GET, endpoint, json={"id": "1"})
+
+    api = CachedTodoistAPI(
+        DEFAULT_TOKEN, cache_ttl={"get_task": 30}, cache_max_entries=10
+    )
+    api.get_task("1")
+    api.get_task("1")
+
+    assert len(responses.calls) == 1
+    assert api._caches["get_task"].ttl == 30
+    assert api._caches["get_task"].max_entries == 10
+    assert api._caches["get_tasks"].ttl is None
+
+
+@responses.activate
+def test_cache_stats_snapshot_and_reset() -> None:
+    responses.add(responses.GET, f"{DEFAULT_API_URL}/tasks/1", json={"id": "1"})
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN)
+    api.get_task("1")
+    api.get_task("1")
+    api.get_task("1")
+    stats = api.cache_stats(reset=True)
+
+    assert stats.transport is not None
+    task_stats = stats.methods["get_task"]
+    assert (task_stats.hits, task_stats.misses, task_stats.fetches) == (2, 1, 1)
+    assert task_stats.entries == 1
+    assert task_stats.hit_ratio == 2 / 3
+    assert task_stats.seconds_saved == 2 * task_stats.fetch_seconds
+    assert stats.entities == 1
+    assert stats.entity_nbytes > 0
+    assert stats.transport.requests == 1
+    assert api.cache_stats().methods["get_task"].hits == 0
+    transport = api.cache_stats().transport
+    assert transport is not None
+    assert transport.requests == 0
+
+
+def _task(task_id: str, project_id: str, **fields: object) -> dict[str, Any]:
+    return {"id": task_id, "project_id": project_id, **fields}
+
+
+def _page(*results: dict[str, Any]) -> dict[str, Any]:
+    return {"results": list(results), "next_cursor": None}
+
+
+@responses.activate
+def test_update_task_only_invalidates_related_entries() -> None:
+    tasks = f"{DEFAULT_API_URL}/tasks"
+    responses.add(responses.GET, f"{tasks}/1", json=_task("1", "A"))
+    responses.add(responses.GET, f"{tasks}/2", json=_task("2", "B"))
+    responses.add(
+        responses.GET,
+        tasks,
+        json=_page(_task("1", "A")),
+        match=[query_param_matcher({"project_id": "A"})],
+    )
+    responses.add(
+        responses.GET,
+        tasks,
+        json=_page(_task("2", "B")),
+        match=[query_param_matcher({"project_id": "B"})],
+    )
+    responses.add(responses.POST, f"{tasks}/1", json=_task("1", "A", content="x"))
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN)
+
+    def read_all() -> None:
+        api.get_task("1")
+        api.get_task("2")
+        api.get_tasks(project_id="A")
+        api.get_tasks(project_id="B")
+
+    read_all()
+    assert len(responses.calls) == 4
+
+    api.update_task("1", content="x")
+    read_all()
+
+    refetched = [call.request.url for call in responses.calls[5:]]
+    assert refetched == [f"{tasks}/1", f"{tasks}?project_id=A"]
+
+
+@responses.activate
+def test_delete_project_invalidates_contained_entities() -> None:
+    responses.add(
+        responses.GET,
+        f"{DEFAULT_API_URL}/tasks/2",
+        json=_task("2", "A", parent_id="1"),
+    )
+    responses.add(
+        responses.GET,
+        f"{DEFAULT_API_URL}/tasks/3",
+        json=_task("3", "B", parent_id="2"),
+    )
+    responses.add(responses.DELETE, f"{DEFAULT_API_URL}/projects/A", status=204)
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN)
+    api.get_task("2")
+    api.get_task("3")
+    api.delete_project("A")
+
+    assert api.get_task.cache_key("2") not in api._caches["get_task"]
+    assert api.get_task.cache_key("3") not in api._caches["get_task"]
+
+
+@responses.activate
+def test_write_through_serves_reads_after_writes() -> None:
+    tasks = f"{DEFAULT_API_URL}/tasks"
+    responses.add(
+        responses.GET,
+        tasks,
+        json=_page(_task("1", "A", labels=["x"]), _task("2", "A")),
+        match=[query_param_matcher({"project_id": "A"})],
+    )
+    responses.add(
+        responses.GET,
+        tasks,
+        json=_page(_task("1", "A", labels=["x"])),
+        match=[query_param_matcher({"label": "x"})],
+    )
+    responses.add(responses.POST, f"{tasks}/1", json=_task("1", "A", labels=["y"]))
+    responses.add(responses.POST, tasks, json=_task("3", "A"))
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN, cache_write_through=True)
+    api.get_tasks(project_id="A")
+    api.get_tasks(label="x")
+
+    api.update_task("1", labels=["y"])
+    # The patched list still counts the entities it references against max_bytes
+    patched = api._caches["get_tasks"]._entries[api.get_tasks.cache_key(project_id="A")]
+    store = api._entity_store
+    assert patched.size > sum(store.size(key) for key in patched.value.keys)
+    assert api.get_task("1") == _task("1", "A", labels=["y"])
+    assert api.get_tasks(project_id="A")[0] == _task("1", "A", labels=["y"])
+    assert len(responses.calls) == 3
+
+    # The task no longer carries the label, so that list is refetched
+    api.get_tasks(label="x")
+    assert len(responses.calls) == 4
+
+    api.add_task("new", project_id="A")
+    assert api.get_task("3") == _task("3", "A")
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_entities_are_shared_between_cached_results() -> None:
+    tasks = f"{DEFAULT_API_URL}/tasks"
+    responses.add(
+        responses.GET,
+        tasks,
+        json=_page(_task("1", "A"), _task("2", "A")),
+        match=[query_param_matcher({"project_id": "A"})],
+    )
+    responses.add(
+        responses.GET,
+        tasks,
+        json=_page(_task("1", "A", content="new")),
+        match=[query_param_matcher({"label": "x"})],
+    )
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN)
+    api.get_tasks(project_id="A")
+
+    assert api.get_task("2") == _task("2", "A")
+    assert len(responses.calls) == 1
+
+    api.get_tasks(label="x")
+    assert len(api._entity_store) == 2
+    assert api.get_tasks(project_id="A")[0] == _task("1", "A", content="new")
+
+    api.get_tasks.cache_clear()
+    api.get_task.cache_clear()
+    assert len(api._entity_store) == 0
+
+
+@responses.activate
+def test_not_found_errors_are_cached_until_recreated() -> None:
+    tasks = f"{DEFAULT_API_URL}/tasks"
+    missing = responses.add(responses.GET, f"{tasks}/9", status=404)
+    responses.add(responses.POST, tasks, json=_task("10", "A"))
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN, cache_not_found_ttl=60)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            api.get_task("9")
+    assert missing.call_count == 1
+
+    api.add_task("new")
+    with pytest.raises(requests.HTTPError):
+        api.get_task("9")
+    assert missing.call_count == 2
+
+
+@responses.activate
+def test_cache_keys_are_canonical() -> None:
+    responses.add(
+        responses.GET,
+        f"{DEFAULT_API_URL}/tasks",
+        json=_page(_task("1", "A")),
+        match=[query_param_matcher({"ids": "1"})],
+    )
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN)
+    api.get_tasks(ids=["1"])
+    api.get_tasks(ids=("1",), project_id=None)
+
+    assert len(responses.calls) == 1
+    assert api.get_task.cache_key("1") == api.get_task.cache_key(task_id="1")
+    since = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+    until = since + timedelta(days=7)
+    assert api.get_completed_tasks_by_due_date.cache_key(
+        since=since, until=until
+    ) == api.get_completed_tasks_by_due_date.cache_key(
+        until=until.astimezone(timezone(timedelta(hours=2))), since=since
+    )
+
+
+@responses.activate
+def test_cache_path_warms_new_clients(tmp_path: Path) -> None:
+    responses.add(responses.GET, f"{DEFAULT_API_URL}/projects", json=_page({"id": "A"}))
+    path = tmp_path / "cache.sqlite"
+
+    with CachedTodoistAPI(DEFAULT_TOKEN, cache_path=path) as api:
+        api.get_projects()
+
+    with CachedTodoistAPI(DEFAULT_TOKEN, cache_path=path) as api:
+        assert api.get_projects() == [{"id": "A"}]
+        assert api.get_project("A") == {"id": "A"}
+
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_disk_cache_is_used_without_holding_the_lock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tasks = f"{DEFAULT_API_URL}/tasks"
+    responses.add(responses.GET, f"{tasks}/1", json=_task("1", "A"))
+    responses.add(responses.GET, tasks, json=_page(_task("1", "A")))
+    responses.add(responses.POST, f"{tasks}/1", json=_task("1", "A", content="x"))
+    used: list[tuple[str, bool]] = []
+
+    def lock_is_free(lock: threading.RLock) -> bool:
+        # An RLock held by this thread would be re-entered, so try from another one
+        free = [False]
+
+        def try_acquire() -> None:
+            free[0] = lock.acquire(blocking=False)
+            if free[0]:
+                lock.release()
+
+        thread = threading.Thread(target=try_acquire)
+        thread.start()
+        thread.join()
+        return free[0]
+
+    with CachedTodoistAPI(
+        DEFAULT_TOKEN, cache_path=tmp_path / "cache.sqlite", cache_write_through=True
+    ) as api:
+        persistent = api._persistent_cache
+        for name in ("get", "set", "delete", "invalidate"):
+
+            def spy(*args: object, _name: str = name, **kwargs: object) -> object:
+                used.append((_name, lock_is_free(api._cache_lock)))
+                return getattr(type(persistent), _name)(persistent, *args, **kwargs)
+
+            monkeypatch.setattr(persistent, name, spy)
+
+        api.get_task("1")
+        api.get_tasks()
+        api.update_task("1", content="x")
+        api.get_task.invalidate_cache_entry(("1",))
+
+    assert {name for name, _ in used} == {"get", "set", "delete", "invalidate"}
+    assert all(free for _, free in used)
+
+
+@responses.activate
+def test_streams_resume_from_cached_pages() -> None:
+    projects = f"{DEFAULT_API_URL}/projects"
+    first = responses.add(
+        responses.GET,
+        projects,
+        json={"results": [{"id": "A"}, {"id": "B"}], "next_cursor": "c1"},
+        match=[query_param_matcher({})],
+    )
+    second = responses.add(
+        responses.GET,
+        projects,
+        json=_page({"id": "C"}),
+        match=[query_param_matcher({"cursor": "c1"})],
+    )
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN, cache_streaming=True)
+    stream = api.get_projects()
+    assert next(stream) == {"id": "A"}
+    stream.close()
+
+    assert [project["id"] for project in api.get_projects()] == ["A", "B", "C"]
+    assert [project["id"] for project in api.get_projects()] == ["A", "B", "C"]
+    assert (first.call_count, second.call_count) == (1, 1)
+
+
+def _add_task_pages(pages: int, page_size: int) -> None:
+    def callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        query = dict(parse_qsl(urlsplit(request.url or "").query))
+        number = int(query.get("cursor", 0))
+        start = number * page_size
+        body = {
+            "results": [_task(str(i), "A") for i in range(start, start + page_size)],
+            "next_cursor": str(number + 1) if number + 1 < pages else None,
+        }
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(responses.GET, f"{DEFAULT_API_URL}/tasks", callback)
+
+
+def _count_acquires(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    acquire = create_autospec(EntityStore.acquire, side_effect=EntityStore.acquire)
+    monkeypatch.setattr(EntityStore, "acquire", acquire)
+    return acquire
+
+
+@responses.activate
+def test_streaming_records_each_page_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    _add_task_pages(pages=50, page_size=20)
+    acquires = _count_acquires(monkeypatch)
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN, cache_streaming=True)
+    assert len(list(api.get_tasks())) == 1000
+    assert acquires.call_count == 1000
+
+    assert len(list(api.get_tasks())) == 1000
+    assert len(responses.calls) == 50
+    stats = api.cache_stats().methods["get_tasks"]
+    assert stats.entries == 1
+    assert stats.nbytes >= api.cache_stats().entity_nbytes
+
+
+@responses.activate
+def test_streaming_stops_recording_results_too_big_to_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _add_task_pages(pages=50, page_size=20)
+    acquires = _count_acquires(monkeypatch)
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN, cache_max_bytes=50_000)
+    assert len(api.get_tasks()) == 1000
+
+    stats = api.cache_stats()
+    assert stats.methods["get_tasks"].entries == 0
+    assert stats.entities == 0
+    assert acquires.call_count < 1000
+
+
+@responses.activate
+def test_entity_store_hits_expire_with_the_entity() -> None:
+    tasks = f"{DEFAULT_API_URL}/tasks"
+    responses.add(responses.GET, tasks, json=_page(_task("1", "A")))
+    single = responses.add(responses.GET, f"{tasks}/1", json=_task("1", "A"))
+    now = [0.0]
+
+    api = CachedTodoistAPI(DEFAULT_TOKEN, cache_ttl=60)
+    api._entity_store._clock = lambda: now[0]
+    for cache in api._caches.values():
+        cache._clock = lambda: now[0]
+
+    api.get_tasks()
+    now[0] = 50
+    assert api.get_task("1") == _task("1", "A")
+    assert single.call_count == 0
+
+    # Fetched at 0, so stale at 60 however often it was read from the store since
+    now[0] = 61
+    api.get_task("1")
+    assert single.call_count == 1
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from todoist_api_python._core.deadline import (
+    DeadlineExceeded,
+    bound_timeout,
+    current_deadline,
+    deadline,
+    time_left,
+    use_deadline,
+)
+
+
+def test_no_deadline_by_default() -> None:
+    assert current_deadline() is None
+    assert time_left() is None
+    assert bound_timeout((10, 60)) == (10, 60)
+
+
+def test_deadline_shortens_timeouts() -> None:
+    with deadline(5):
+        connect, read = bound_timeout((10, 60))
+        single = bound_timeout(2)
+
+    assert 4 < connect <= 5
+    assert 4 < read <= 5
+    assert single == 2
+    assert current_deadline() is None
+
+
+def test_nested_deadlines_only_shorten() -> None:
+    with deadline(5):
+        outer = current_deadline()
+        assert outer is not None
+        with deadline(60):
+            assert current_deadline() == outer
+        with deadline(1):
+            inner = current_deadline()
+            assert inner is not None
+            assert inner < outer
+        assert current_deadline() == outer
+
+
+def test_expired_deadline_raises() -> None:
+    with use_deadline(time.monotonic() - 1), pytest.raises(DeadlineExceeded):
+        bound_timeout((10, 60))
@@ -23,3 +23,8 @@ def test_create_headers_request_id() -> None:
     request_id = "12345"
     headers = create_headers(request_id=request_id)
     assert headers["X-Request-Id"] == request_id
+
+
+def test_create_headers_accept_encoding() -> None:
+    headers = create_headers(accept_encoding="gzip,deflate")
+    assert headers["Accept-Encoding"] == "gzip,deflate"
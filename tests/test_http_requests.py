@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
+import gzip
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
 
 import pytest
 import responses
+from requests import ConnectionError as RequestsConnectionError
 from requests import HTTPError, Session
-from responses.matchers import query_param_matcher
+from responses.matchers import header_matcher, query_param_matcher
 
 from tests.data.test_defaults import DEFAULT_REQUEST_ID, DEFAULT_TOKEN
 from tests.utils.test_utils import (
@@ -14,13 +19,29 @@ from tests.utils.test_utils import (
     param_matcher,
     request_id_matcher,
 )
-from todoist_api_python._core.http_requests import delete, get, post
+from todoist_api_python._core.deadline import DeadlineExceeded, deadline
+from todoist_api_python._core.http_requests import (
+    RESPONSE_ENCODINGS,
+    HttpxAsyncTransport,
+    Request,
+    RequestsTransport,
+    create_session,
+    delete,
+    get,
+    post,
+)
+from todoist_api_python._core.rate_limit import RateLimiter
+from todoist_api_python._core.retry import RetryPolicy
+from todoist_api_python.api import TodoistAPI
+from todoist_api_python.api_async import TodoistAPIAsync
 
 EXAMPLE_URL = "https://example.com/"
 EXAMPLE_PARAMS = {"param1": "value1", "param2": "value2"}
 EXAMPLE_DATA = {"param3": "value31", "param4": "value4"}
 EXAMPLE_RESPONSE = {"result": "ok"}
 
+T = TypeVar("T")
+
 
 @responses.activate
 def test_get_with_params(default_task_response: dict[str, Any]) -> None:
@@ -148,3 +169,472 @@ def test_delete_raise_for_status() -> None:
 
     with pytest.raises(HTTPError):
         delete(session=Session(), url=EXAMPLE_URL, token=DEFAULT_TOKEN)
+
+
+@responses.activate
+def test_transport_authenticates_every_request() -> None:
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        json=EXAMPLE_RESPONSE,
+        match=[auth_matcher(), request_id_matcher("first")],
+    )
+    responses.add(
+        method=responses.POST,
+        url=EXAMPLE_URL,
+        json=EXAMPLE_RESPONSE,
+        match=[auth_matcher(), data_matcher(EXAMPLE_DATA)],
+    )
+
+    transport = RequestsTransport(Session(), DEFAULT_TOKEN)
+    assert transport.get(EXAMPLE_URL, "first") == EXAMPLE_RESPONSE
+    assert transport.post(EXAMPLE_URL, data=EXAMPLE_DATA) == EXAMPLE_RESPONSE
+    assert "X-Request-Id" not in responses.calls[1].request.headers
+
+
+@dataclass(eq=False)
+class FakeTransport:
+    requests: list[tuple[str, str]] = field(default_factory=list)
+    closed: bool = False
+
+    def get(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        self.requests.append(("GET", url))
+        return cast("T", {"id": "1"})
+
+    def post(
+        self,
+        url: str,
+        request_id: str | None = None,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        self.requests.append(("POST", url))
+        return cast("T", data)
+
+    def delete(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> bool:
+        self.requests.append(("DELETE", url))
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_api_sends_requests_through_given_transport() -> None:
+    transport = FakeTransport()
+
+    with TodoistAPI(DEFAULT_TOKEN, transport=transport) as api:
+        assert api.get_task("1") == {"id": "1"}
+        assert api.delete_task("1") is True
+
+    assert [method for method, _ in transport.requests] == ["GET", "DELETE"]
+    assert transport.closed
+
+
+def test_create_session_sizes_connection_pool() -> None:
+    session = create_session(pool_maxsize=32, pool_block=True)
+    adapter = session.get_adapter(EXAMPLE_URL)
+
+    assert vars(adapter)["_pool_maxsize"] == 32
+    assert vars(adapter)["_pool_block"] is True
+    assert create_session(session) is session
+
+
+def test_api_pool_options_size_its_session() -> None:
+    session = Session()
+    api = TodoistAPI(DEFAULT_TOKEN, session=session, pool_maxsize=32)
+
+    assert vars(session.get_adapter(EXAMPLE_URL))["_pool_maxsize"] == 32
+    api.__exit__(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_httpx_transport_sends_requests() -> None:
+    pytest.importorskip("httpx")
+    import httpx
+
+    sent: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        if request.url.path == "/missing":
+            return httpx.Response(404, json="<error description>")
+        return httpx.Response(200, json=EXAMPLE_RESPONSE)
+
+    transport = HttpxAsyncTransport(
+        DEFAULT_TOKEN, client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    response: dict[str, Any] = await transport.send(
+        Request("POST", EXAMPLE_URL, DEFAULT_REQUEST_ID, data=EXAMPLE_DATA)
+    )
+    with pytest.raises(HTTPError) as error_info:
+        await transport.send(Request("GET", f"{EXAMPLE_URL}missing"))
+    await transport.aclose()
+
+    assert response == EXAMPLE_RESPONSE
+    assert sent[0].headers["Authorization"] == f"Bearer {DEFAULT_TOKEN}"
+    assert sent[0].headers["X-Request-Id"] == DEFAULT_REQUEST_ID
+    assert json.loads(sent[0].content) == EXAMPLE_DATA
+    assert error_info.value.response.status_code == 404
+
+
+@dataclass(eq=False)
+class FakeAsyncTransport:
+    requests: list[Request] = field(default_factory=list)
+
+    async def send(self, request: Request) -> T:
+        self.requests.append(request)
+        if request.params is not None and "cursor" not in request.params:
+            return cast("T", {"results": [{"id": "1"}], "next_cursor": "next"})
+        if request.params is not None:
+            return cast("T", {"results": [{"id": "2"}], "next_cursor": None})
+        return cast("T", {"id": "1"})
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_async_api_sends_requests_natively() -> None:
+    transport = FakeAsyncTransport()
+
+    async with TodoistAPIAsync(DEFAULT_TOKEN, async_transport=transport) as api:
+        task = await api.get_task("1")
+        projects: list[object] = [project async for project in await api.get_projects()]
+
+    assert task == {"id": "1"}
+    assert projects == [{"id": "1"}, {"id": "2"}]
+    assert [request.params for request in transport.requests[1:]] == [
+        {},
+        {"cursor": "next"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_httpx_transport_accepts_a_single_timeout() -> None:
+    pytest.importorskip("httpx")
+    import httpx
+
+    timeouts: list[dict[str, float]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json=EXAMPLE_RESPONSE)
+
+    default = HttpxAsyncTransport(timeout=5)
+    assert default.client.timeout == httpx.Timeout(5)
+    await default.aclose()
+
+    transport = HttpxAsyncTransport(
+        timeout=5, client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    with deadline(60):
+        await transport.send(Request("GET", EXAMPLE_URL))
+    await transport.aclose()
+
+    assert timeouts[0]["connect"] == timeouts[0]["read"] == 5
+
+
+@responses.activate
+def test_transport_retries_throttled_requests() -> None:
+    responses.add(
+        method=responses.POST,
+        url=EXAMPLE_URL,
+        status=429,
+        headers={"Retry-After": "0"},
+    )
+    responses.add(method=responses.POST, url=EXAMPLE_URL, json=EXAMPLE_RESPONSE)
+    limiter = RateLimiter(max_concurrency=4)
+
+    transport = RequestsTransport(token=DEFAULT_TOKEN, rate_limiter=limiter)
+    response: dict[str, Any] = transport.post(
+        EXAMPLE_URL, DEFAULT_REQUEST_ID, data=EXAMPLE_DATA
+    )
+
+    assert len(responses.calls) == 2
+    assert response == EXAMPLE_RESPONSE
+    assert limiter.throttled == 1
+    assert limiter.concurrency == 2
+
+
+@responses.activate
+def test_transport_gives_up_after_max_retries() -> None:
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        status=429,
+        headers={"Retry-After": "0"},
+    )
+
+    transport = RequestsTransport(rate_limiter=RateLimiter(max_retries=2))
+    with pytest.raises(HTTPError) as error_info:
+        transport.get(EXAMPLE_URL)
+
+    assert len(responses.calls) == 3
+    assert error_info.value.response.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_httpx_transport_retries_throttled_requests() -> None:
+    pytest.importorskip("httpx")
+    import httpx
+
+    statuses = [429, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            statuses.pop(0), headers={"Retry-After": "0"}, json=EXAMPLE_RESPONSE
+        )
+
+    limiter = RateLimiter()
+    transport = HttpxAsyncTransport(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+    )
+    response: dict[str, Any] = await transport.send(Request("GET", EXAMPLE_URL))
+    await transport.aclose()
+
+    assert response == EXAMPLE_RESPONSE
+    assert statuses == []
+    assert limiter.throttled == 1
+
+
+NO_WAIT_RETRIES = RetryPolicy(max_retries=2, sleep=lambda _: None)
+
+
+@responses.activate
+def test_transport_retries_server_errors() -> None:
+    responses.add(method=responses.GET, url=EXAMPLE_URL, status=503)
+    responses.add(method=responses.GET, url=EXAMPLE_URL, body=RequestsConnectionError())
+    responses.add(method=responses.GET, url=EXAMPLE_URL, json=EXAMPLE_RESPONSE)
+
+    transport = RequestsTransport(retry_policy=NO_WAIT_RETRIES)
+
+    assert transport.get(EXAMPLE_URL) == EXAMPLE_RESPONSE
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_transport_retries_posts_with_the_same_request_id() -> None:
+    responses.add(method=responses.POST, url=EXAMPLE_URL, status=502)
+    responses.add(
+        method=responses.POST,
+        url=EXAMPLE_URL,
+        json=EXAMPLE_RESPONSE,
+        match=[request_id_matcher(DEFAULT_REQUEST_ID)],
+    )
+
+    transport = RequestsTransport(retry_policy=NO_WAIT_RETRIES)
+    response: dict[str, Any] = transport.post(
+        EXAMPLE_URL, DEFAULT_REQUEST_ID, data=EXAMPLE_DATA
+    )
+
+    assert response == EXAMPLE_RESPONSE
+    assert [call.request.headers["X-Request-Id"] for call in responses.calls] == [
+        DEFAULT_REQUEST_ID,
+        DEFAULT_REQUEST_ID,
+    ]
+
+
+@responses.activate
+def test_transport_does_not_retry_posts_without_request_id() -> None:
+    responses.add(method=responses.POST, url=EXAMPLE_URL, status=502)
+
+    transport = RequestsTransport(retry_policy=NO_WAIT_RETRIES)
+    with pytest.raises(HTTPError):
+        transport.post(EXAMPLE_URL, data=EXAMPLE_DATA)
+
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_transport_gives_up_after_retries() -> None:
+    responses.add(method=responses.DELETE, url=EXAMPLE_URL, status=500)
+
+    transport = RequestsTransport(retry_policy=NO_WAIT_RETRIES)
+    with pytest.raises(HTTPError):
+        transport.delete(EXAMPLE_URL)
+
+    assert len(responses.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_httpx_transport_retries_server_errors() -> None:
+    pytest.importorskip("httpx")
+    import httpx
+
+    sent: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        if len(sent) == 1:
+            raise httpx.ConnectError("Connection reset", request=request)
+        if len(sent) == 2:
+            return httpx.Response(500)
+        return httpx.Response(200, json=EXAMPLE_RESPONSE)
+
+    transport = HttpxAsyncTransport(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        retry_policy=RetryPolicy(backoff=0),
+    )
+    response: dict[str, Any] = await transport.send(
+        Request("POST", EXAMPLE_URL, DEFAULT_REQUEST_ID, data=EXAMPLE_DATA)
+    )
+    await transport.aclose()
+
+    assert response == EXAMPLE_RESPONSE
+    assert {request.headers["X-Request-Id"] for request in sent} == {DEFAULT_REQUEST_ID}
+
+
+@dataclass(eq=False)
+class RecordingCodec:
+    name: str = "recording"
+    decoded: list[bytes] = field(default_factory=list)
+
+    def dumps(self, obj: object) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> object:
+        self.decoded.append(data)
+        return json.loads(data)
+
+
+@responses.activate
+def test_transport_uses_codec() -> None:
+    responses.add(
+        method=responses.POST,
+        url=EXAMPLE_URL,
+        json=EXAMPLE_RESPONSE,
+        match=[data_matcher(EXAMPLE_DATA)],
+    )
+    codec = RecordingCodec()
+
+    response: dict[str, Any] = RequestsTransport(codec=codec).post(
+        EXAMPLE_URL, data=EXAMPLE_DATA
+    )
+
+    assert response == EXAMPLE_RESPONSE
+    assert codec.decoded == [b'{"result": "ok"}']
+    assert responses.calls[0].request.body == b'{"param3":"value31","param4":"value4"}'
+
+
+@responses.activate
+def test_transport_respects_deadline() -> None:
+    responses.add(method=responses.GET, url=EXAMPLE_URL, status=503)
+    transport = RequestsTransport(
+        retry_policy=RetryPolicy(max_retries=10, backoff=1, jitter=lambda: 1.0)
+    )
+
+    with deadline(0.5), pytest.raises(HTTPError):
+        transport.get(EXAMPLE_URL)
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        transport.get(EXAMPLE_URL)
+
+    # The first backoff would overrun the deadline, so there were no retries
+    assert len(responses.calls) == 1
+    assert vars(responses.calls[0].request)["req_kwargs"]["timeout"][1] <= 0.5
+
+
+@responses.activate
+def test_transport_does_not_wait_out_retry_after_past_deadline() -> None:
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        status=429,
+        headers={"Retry-After": "3"},
+    )
+    transport = RequestsTransport(rate_limiter=RateLimiter(), retry_policy=None)
+
+    started = time.monotonic()
+    with deadline(0.5), pytest.raises(DeadlineExceeded):
+        transport.get(EXAMPLE_URL)
+
+    assert time.monotonic() - started < 0.5
+    assert len(responses.calls) == 1
+
+
+LARGE_DATA = {"content": "Task", "description": "A long description. " * 100}
+
+
+@responses.activate
+def test_transport_negotiates_compressed_responses() -> None:
+    payload = json.dumps({"results": [LARGE_DATA] * 10}).encode()
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        body=gzip.compress(payload),
+        headers={"Content-Encoding": "gzip"},
+        match=[header_matcher({"Accept-Encoding": RESPONSE_ENCODINGS})],
+    )
+    transport = RequestsTransport()
+
+    response: dict[str, Any] = transport.get(EXAMPLE_URL)
+    stats = transport.stats(reset=True)
+
+    assert response == {"results": [LARGE_DATA] * 10}
+    assert "gzip" in RESPONSE_ENCODINGS
+    assert stats.requests == 1
+    assert stats.response_bytes == len(payload)
+    assert stats.response_wire_bytes == len(gzip.compress(payload))
+    assert stats.bytes_saved > 0
+    assert transport.stats().requests == 0
+
+
+@responses.activate
+def test_transport_compresses_large_request_bodies() -> None:
+    responses.add(method=responses.POST, url=EXAMPLE_URL, json=EXAMPLE_RESPONSE)
+    transport = RequestsTransport(compress_min_bytes=1024)
+
+    transport.post(EXAMPLE_URL, data=EXAMPLE_DATA)
+    transport.post(EXAMPLE_URL, data=LARGE_DATA)
+    stats = transport.stats()
+
+    small, large = (call.request for call in responses.calls)
+    small_body, large_body = cast("bytes", small.body), cast("bytes", large.body)
+    assert "Content-Encoding" not in small.headers
+    assert json.loads(small_body) == EXAMPLE_DATA
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(large_body)) == LARGE_DATA
+    assert stats.request_bytes == len(small_body) + len(json.dumps(LARGE_DATA))
+    assert stats.request_wire_bytes == len(small_body) + len(large_body)
+
+
+@pytest.mark.asyncio
+async def test_httpx_transport_compresses_and_counts_bytes() -> None:
+    pytest.importorskip("httpx")
+    import httpx
+
+    payload = json.dumps(LARGE_DATA).encode()
+    sent: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(
+            200, content=gzip.compress(payload), headers={"Content-Encoding": "gzip"}
+        )
+
+    transport = HttpxAsyncTransport(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        compress_min_bytes=1024,
+    )
+    response: dict[str, Any] = await transport.send(
+        Request("POST", EXAMPLE_URL, data=LARGE_DATA)
+    )
+    await transport.aclose()
+    stats = transport.stats()
+
+    assert response == LARGE_DATA
+    assert sent[0].headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(sent[0].content)) == LARGE_DATA
+    assert stats.response_bytes == len(payload)
+    assert stats.bytes_saved > len(payload)
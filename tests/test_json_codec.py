@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+import sys
+
+import pytest
+
+from todoist_api_python._core.json_codec import StdlibCodec, get_codec
+
+DATA = {"id": "1", "content": "Café ☕", "labels": ["a", "b"], "is_done": False}
+
+
+@pytest.mark.parametrize("name", ["auto", "json", "orjson", "msgspec"])
+def test_codecs_round_trip(name: str) -> None:
+    codec = get_codec(name)
+    encoded = codec.dumps(DATA)
+
+    assert (
+        codec.loads(encoded if isinstance(encoded, bytes) else encoded.encode()) == DATA
+    )
+    assert codec.loads(b'{"id": "1", "content": "Caf\xc3\xa9"}') == {
+        "id": "1",
+        "content": "Café",
+    }
+
+
+def test_missing_codec_falls_back_to_stdlib(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    get_codec.cache_clear()
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    try:
+        with caplog.at_level(logging.WARNING):
+            codec = get_codec("orjson")
+    finally:
+        get_codec.cache_clear()
+
+    assert isinstance(codec, StdlibCodec)
+    assert "orjson is not installed" in caplog.text
+
+
+def test_auto_codec_falls_back_to_stdlib_quietly(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    get_codec.cache_clear()
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    try:
+        with caplog.at_level(logging.WARNING):
+            codec = get_codec()
+    finally:
+        get_codec.cache_clear()
+
+    assert isinstance(codec, StdlibCodec)
+    assert not caplog.text
+
+
+def test_unknown_codec() -> None:
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_codec("yaml")
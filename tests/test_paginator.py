@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+import pytest
+import responses
+from requests import HTTPError
+from responses.matchers import query_param_matcher
+
+from tests.data.test_defaults import DEFAULT_TOKEN
+from todoist_api_python._core.http_requests import Request, RequestsTransport
+from todoist_api_python.api import DEFAULT_PAGE_SIZE, ResultsPaginator, TodoistAPI
+from todoist_api_python.api_async import TodoistAPIAsync
+
+EXAMPLE_URL = "https://example.com/"
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False)
+class PagedTransport:
+    """
+    Serves `total` items for every query, in pages of the request's `limit`.
+
+    Pages hold `page_size` items when the request sets no limit, and the cursor of a
+    page is the number of its first item. Items are numbered from 0, after the
+    query's project ID if any. The page starting at item `fail_at`, and every page
+    of project "bad", fail.
+    """
+
+    total: int
+    page_size: int = DEFAULT_PAGE_SIZE
+    fail_at: int | None = None
+    params: list[dict[str, Any]] = field(default_factory=list)
+    threads: set[str] = field(default_factory=set)
+    _fetched: threading.Condition = field(
+        default_factory=threading.Condition, init=False
+    )
+
+    @property
+    def cursors(self) -> list[str | None]:
+        return [params.get("cursor") for params in self.params]
+
+    def get(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        params = params or {}
+        with self._fetched:
+            self.params.append(params)
+            self.threads.add(threading.current_thread().name)
+            self._fetched.notify_all()
+        start = int(params.get("cursor", 0))
+        if start == self.fail_at or params.get("project_id") == "bad":
+            raise HTTPError("Server error")
+        end = min(start + int(params.get("limit", self.page_size)), self.total)
+        prefix = f"{params['project_id']}." if "project_id" in params else ""
+        return cast(
+            "T",
+            {
+                "results": [{"id": f"{prefix}{i}"} for i in range(start, end)],
+                "next_cursor": str(end) if end < self.total else None,
+            },
+        )
+
+    def post(
+        self,
+        url: str,
+        request_id: str | None = None,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        raise NotImplementedError
+
+    def delete(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> bool:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def wait_for(self, count: int) -> None:
+        with self._fetched:
+            assert self._fetched.wait_for(lambda: len(self.params) >= count, 5)
+
+
+@dataclass(eq=False)
+class AsyncPagedTransport:
+    """Serves the pages of a `PagedTransport` to the async client."""
+
+    pages: PagedTransport
+
+    async def send(self, request: Request) -> T:
+        return self.pages.get(request.url, request.request_id, request.params)
+
+    async def aclose(self) -> None:
+        pass
+
+
+@responses.activate
+def test_paginator_iterates_pages() -> None:
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        json={"results": [{"id": "1"}, {"id": "2"}], "next_cursor": "next"},
+        match=[query_param_matcher({})],
+    )
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        json={"results": [{"id": "3"}], "next_cursor": None},
+        match=[query_param_matcher({"cursor": "next"})],
+    )
+    paginator = ResultsPaginator(RequestsTransport(), EXAMPLE_URL, "results", None, {})
+
+    first = next(paginator)
+    pages = list(paginator.iter_pages())
+
+    assert first == {"id": "1"}
+    assert pages == [[{"id": "2"}], [{"id": "3"}]]
+    assert list(paginator) == []
+
+
+@responses.activate
+def test_paginator_keeps_deadline_it_was_created_with() -> None:
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        json={"results": [{"id": "1"}], "next_cursor": "next"},
+        match=[query_param_matcher({})],
+    )
+    responses.add(
+        method=responses.GET,
+        url=EXAMPLE_URL,
+        json={"results": [{"id": "2"}], "next_cursor": None},
+        match=[query_param_matcher({"cursor": "next"})],
+    )
+    api = TodoistAPI(DEFAULT_TOKEN, request_id_fn=None)
+
+    with api.deadline(30):
+        paginator = ResultsPaginator(api._transport, EXAMPLE_URL, "results", None, {})
+    pages = list(paginator)
+
+    assert pages == [{"id": "1"}, {"id": "2"}]
+    assert all(
+        vars(call.request)["req_kwargs"]["timeout"][1] <= 30 for call in responses.calls
+    )
+
+
+def test_paginator_prefetches_pages_up_to_depth() -> None:
+    transport = PagedTransport(total=20, page_size=2)
+    paginator = ResultsPaginator(
+        transport, EXAMPLE_URL, "results", None, {}, prefetch=2
+    )
+
+    first = paginator.next_page()
+    transport.wait_for(3)
+
+    # The first page has been taken, so up to two more are fetched ahead
+    assert first == [{"id": "0"}, {"id": "1"}]
+    assert transport.cursors == [None, "2", "4"]
+    assert paginator.cursor == "2"
+
+    items = list(paginator)
+    assert len(items) == 18
+    assert items[-1] == {"id": "19"}
+    assert len(transport.params) == 10
+
+
+def test_paginator_prefetch_raises_errors_in_order() -> None:
+    transport = PagedTransport(total=10, page_size=2, fail_at=4)
+    paginator = ResultsPaginator(
+        transport, EXAMPLE_URL, "results", None, {}, prefetch=3
+    )
+
+    pages = [paginator.next_page(), paginator.next_page()]
+    with pytest.raises(HTTPError):
+        paginator.next_page()
+
+    assert [page[0]["id"] for page in pages] == ["0", "2"]
+    assert paginator.cursor == "4"
+
+
+def test_paginator_prefetch_restarts_after_skip() -> None:
+    transport = PagedTransport(total=20, page_size=2)
+    paginator = ResultsPaginator(
+        transport, EXAMPLE_URL, "results", None, {}, prefetch=1
+    )
+
+    paginator.next_page()
+    paginator.skip_to("16")
+    remaining = list(paginator.iter_pages())
+    paginator.close()
+
+    assert [page[0]["id"] for page in remaining] == ["16", "18"]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_paginator_resumes_from_checkpoint(prefetch: int) -> None:
+    transport = PagedTransport(total=10)
+    paginator = ResultsPaginator(
+        transport, EXAMPLE_URL, "results", None, {"limit": 2}, prefetch=prefetch
+    )
+    taken = [next(paginator) for _ in range(3)]
+    checkpoint = json.loads(json.dumps(paginator.checkpoint()))
+    paginator.close()
+
+    api = TodoistAPI(DEFAULT_TOKEN, transport=transport, prefetch_pages=prefetch)
+    resumed = api.resume(checkpoint)
+    first = next(resumed)
+    # That was the last item of the resumed page
+    assert resumed.checkpoint() == {**checkpoint, "cursor": "4", "skip": 0}
+    rest = [first, *resumed]
+
+    assert checkpoint == {
+        "url": EXAMPLE_URL,
+        "results_field": "results",
+        "params": {"limit": 2},
+        "cursor": "2",
+        "skip": 1,
+    }
+    assert [item["id"] for item in taken + rest] == [str(i) for i in range(10)]
+    assert resumed.checkpoint()["cursor"] is None
+
+
+def test_paginator_checkpoint_between_pages() -> None:
+    transport = PagedTransport(total=6, page_size=2)
+    paginator = ResultsPaginator(transport, EXAMPLE_URL, "results", None, {})
+
+    assert paginator.checkpoint()["cursor"] == ""
+    paginator.next_page()
+    assert (paginator.checkpoint()["cursor"], paginator.checkpoint()["skip"]) == (
+        "2",
+        0,
+    )
+
+
+def test_bulk_mode_uses_largest_pages() -> None:
+    transport = PagedTransport(total=450)
+    api = TodoistAPI(DEFAULT_TOKEN, transport=transport, bulk=True)
+
+    tasks = list(api.get_tasks(project_id="1"))
+    projects = list(api.get_projects(limit=10))
+
+    assert len(tasks) == 450
+    assert [params.get("limit") for params in transport.params[:3]] == [200] * 3
+    assert transport.params[0]["project_id"] == "1"
+    assert transport.params[3]["limit"] == 10
+    assert len(projects) == 450
+    # 450 tasks take 9 pages of 50 rather than 3 of 200
+    assert api.requests_saved == 6
+
+
+def test_bulk_mode_counts_no_requests_saved_with_an_explicit_limit() -> None:
+    transport = PagedTransport(total=450)
+    api = TodoistAPI(DEFAULT_TOKEN, transport=transport, bulk=True)
+
+    assert len(list(api.get_tasks(limit=200))) == 450
+    assert len(list(api.get_projects(limit=100))) == 450
+    assert [params["limit"] for params in transport.params] == [200] * 3 + [100] * 5
+    assert api.requests_saved == 0
+
+
+def test_bulk_mode_is_off_by_default() -> None:
+    transport = PagedTransport(total=60)
+    api = TodoistAPI(DEFAULT_TOKEN, transport=transport)
+
+    assert len(list(api.get_tasks())) == 60
+    assert "limit" not in transport.params[0]
+    assert api.requests_saved == 0
+
+
+def test_fan_out_merges_results_of_all_queries() -> None:
+    transport = PagedTransport(total=3, page_size=1)
+    api = TodoistAPI(DEFAULT_TOKEN, transport=transport)
+    queries = [{"project_id": str(i)} for i in range(6)]
+
+    results = list(api.fan_out(api.get_tasks, queries, max_workers=3, tag=True))
+
+    assert len(results) == 18
+    for query in queries:
+        ids = [item["id"] for q, item in results if q is query]
+        project_id = query["project_id"]
+        assert ids == [f"{project_id}.0", f"{project_id}.1", f"{project_id}.2"]
+    assert all(name.startswith("todoist-fan-out") for name in transport.threads)
+
+
+def test_fan_out_raises_errors_of_any_query() -> None:
+    api = TodoistAPI(DEFAULT_TOKEN, transport=PagedTransport(total=3, page_size=1))
+    queries = [{"project_id": "1"}, {"project_id": "bad"}]
+
+    with pytest.raises(HTTPError):
+        list(api.fan_out(api.get_tasks, queries))
+    with pytest.raises(ValueError, match="max_workers"):
+        api.fan_out(api.get_tasks, queries, max_workers=0)
+
+
+def test_fan_out_stops_when_closed() -> None:
+    api = TodoistAPI(DEFAULT_TOKEN, transport=PagedTransport(total=3, page_size=1))
+    results = api.fan_out(api.get_tasks, [{"project_id": "1"}] * 50, max_workers=2)
+
+    assert next(results)["id"] == "1.0"
+    results.close()  # type: ignore[attr-defined]
+    assert list(results) == []
+
+
+@pytest.mark.asyncio
+async def test_async_fan_out_merges_results_of_all_queries() -> None:
+    transport = PagedTransport(total=2, page_size=1)
+    queries = [{"project_id": "1"}, {"project_id": "2"}]
+
+    async with TodoistAPIAsync(
+        DEFAULT_TOKEN, async_transport=AsyncPagedTransport(transport)
+    ) as api:
+        results = [
+            (query["project_id"], task["id"])
+            async for query, task in await api.fan_out(
+                api.get_tasks, queries, max_workers=2, tag=True
+            )
+        ]
+
+    assert sorted(results) == [("1", "1.0"), ("1", "1.1"), ("2", "2.0"), ("2", "2.1")]
+    assert len(transport.params) == 4
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from todoist_api_python._core.persistent_cache import SQLiteCache, token_namespace
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@dataclass
+class FakeClock:
+    now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sqlite_cache_survives_reopening(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    cache = SQLiteCache(path, "ns")
+    cache.set("get_task", ("1",), {"id": "1"}, tags={("task", "1")})
+    cache.close()
+
+    reopened = SQLiteCache(path, "ns")
+    assert reopened.get("get_task", ("1",)) == ({"id": "1"}, [("task", "1")], None)
+    assert SQLiteCache(path, "other").get("get_task", ("1",)) is None
+
+
+def test_sqlite_cache_respects_ttl(tmp_path: Path) -> None:
+    clock = FakeClock()
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "ns", clock=clock)
+    cache.set("get_projects", (), [], ttl=60)
+
+    clock.now += 45
+    assert cache.get("get_projects", ()) == ([], [], 15)
+    clock.now += 30
+    assert cache.get("get_projects", ()) is None
+
+
+def test_sqlite_cache_invalidates_by_tag(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "ns")
+    cache.set("get_task", ("1",), {"id": "1"}, tags={("task", "1")})
+    cache.set("get_task", ("2",), {"id": "2"}, tags={("task", "2")})
+    cache.set("get_tasks", (), [{"id": "1"}], tags={("task", "1")})
+
+    cache.invalidate({("task", "1")}, keep={"get_task": [("1",)]})
+
+    assert cache.get("get_task", ("1",)) is not None
+    assert cache.get("get_task", ("2",)) is not None
+    assert cache.get("get_tasks", ()) is None
+
+
+def test_token_namespace_does_not_contain_token() -> None:
+    assert "secret" not in token_namespace("secret")
+    assert token_namespace("a") != token_namespace("b")
+
+
+def test_sqlite_cache_replaces_tags_with_entry(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "ns")
+    cache.set("get_task", ("1",), {"id": "1"}, tags={("has_label", "a")})
+    cache.set("get_task", ("1",), {"id": "1"}, tags={("has_label", "b")})
+
+    cache.invalidate({("has_label", "a")})
+
+    assert cache.get("get_task", ("1",)) == ({"id": "1"}, [("has_label", "b")], None)
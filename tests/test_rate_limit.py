@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from todoist_api_python._core.deadline import DeadlineExceeded, deadline
+from todoist_api_python._core.rate_limit import RateLimiter, _parse_retry_after
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_bursts_then_paces() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2, burst=2, clock=clock)
+
+    with limiter._condition:
+        assert limiter._try_acquire() == 0
+        assert limiter._try_acquire() == 0
+        assert limiter._try_acquire() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    with limiter._condition:
+        assert limiter._try_acquire() == 0
+
+
+def test_throttling_halves_concurrency_and_pauses() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(max_concurrency=8, clock=clock)
+
+    assert limiter.record(429, "3") is True
+    assert limiter.concurrency == 4
+    assert limiter.throttled == 1
+    with limiter._condition:
+        assert limiter._try_acquire() == pytest.approx(3)
+
+    clock.now = 3
+    with limiter.limit():
+        pass
+
+
+def test_successes_ramp_concurrency_back_up() -> None:
+    limiter = RateLimiter(max_concurrency=4, clock=FakeClock())
+    limiter.record(429, "0")
+    limiter.record(429, "0")
+    assert limiter.concurrency == 1
+
+    assert limiter.record(200) is False
+    assert limiter.concurrency == 2
+    for _ in range(3):
+        limiter.record(200)
+    assert limiter.concurrency == 3
+
+    for _ in range(20):
+        limiter.record(200)
+    assert limiter.concurrency == 4
+
+
+def test_concurrency_never_drops_below_minimum() -> None:
+    limiter = RateLimiter(max_concurrency=4, min_concurrency=2, clock=FakeClock())
+    for _ in range(5):
+        limiter.record(429, "0")
+
+    assert limiter.concurrency == 2
+
+
+def test_concurrency_limit_holds_requests_back() -> None:
+    limiter = RateLimiter(max_concurrency=1, clock=FakeClock())
+
+    with limiter.limit(), limiter._condition:
+        assert limiter._try_acquire() == float("inf")
+    with limiter._condition:
+        assert limiter._try_acquire() == 0
+
+
+def _acquire(limiter: RateLimiter) -> None:
+    with limiter.limit():
+        pass
+
+
+def test_waits_are_bounded_by_the_deadline() -> None:
+    limiter = RateLimiter(max_concurrency=1)
+
+    # Waiting for a slot gives up once the deadline has passed
+    with limiter.limit(), deadline(0.05), pytest.raises(DeadlineExceeded):
+        _acquire(limiter)
+
+    # A pause known to outlast the deadline isn't waited out at all
+    limiter.record(429, "3")
+    started = time.monotonic()
+    with deadline(1), pytest.raises(DeadlineExceeded):
+        _acquire(limiter)
+    assert time.monotonic() - started < 1
+
+
+async def _acquire_async(limiter: RateLimiter) -> None:
+    async with limiter.limit_async():
+        pass
+
+
+@pytest.mark.asyncio
+async def test_async_waits_are_bounded_by_the_deadline() -> None:
+    limiter = RateLimiter()
+    limiter.record(429, "3")
+
+    with deadline(1), pytest.raises(DeadlineExceeded):
+        async with limiter.limit_async():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_async_waiters_are_woken_when_a_request_completes() -> None:
+    limiter = RateLimiter(max_concurrency=1)
+    slot = limiter.limit()
+    slot.__enter__()
+
+    waiter = asyncio.ensure_future(_acquire_async(limiter))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    assert list(limiter._async_waiters) == [asyncio.get_running_loop()]
+
+    # The request completes on another thread, as for a synchronous client
+    releaser = threading.Thread(target=slot.__exit__, args=(None, None, None))
+    releaser.start()
+    await asyncio.wait_for(waiter, 1)
+    releaser.join()
+    assert limiter._async_waiters == {}
+
+
+def test_parse_retry_after() -> None:
+    in_a_minute = datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    assert _parse_retry_after("5", 1.0) == 5
+    assert _parse_retry_after(None, 1.0) == 1
+    assert _parse_retry_after("soon", 1.0) == 1
+    assert 55 < _parse_retry_after(format_datetime(in_a_minute, usegmt=True), 1.0) <= 60
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from todoist_api_python._core.retry import RetryPolicy
+
+
+def test_only_idempotent_or_identified_requests_are_retried() -> None:
+    policy = RetryPolicy()
+
+    assert policy.can_retry("GET", None)
+    assert policy.can_retry("delete", None)
+    assert policy.can_retry("POST", "<request id>")
+    assert not policy.can_retry("POST", None)
+
+
+def test_backoff_grows_exponentially_up_to_a_cap() -> None:
+    policy = RetryPolicy(
+        max_retries=10, backoff=1, max_backoff=5, deadline=None, jitter=lambda: 1.0
+    )
+
+    assert [policy.delay(attempt, 0) for attempt in range(5)] == [1, 2, 4, 5, 5]
+    assert policy.delay(10, 0) is None
+
+
+def test_backoff_is_jittered() -> None:
+    policy = RetryPolicy(backoff=2, deadline=None, jitter=lambda: 0.25)
+
+    assert policy.delay(1, 0) == pytest.approx(1)
+
+
+def test_retries_stop_at_the_deadline() -> None:
+    now = 8.0
+    policy = RetryPolicy(backoff=4, deadline=10, jitter=lambda: 1.0, clock=lambda: now)
+
+    assert policy.delay(0, started_at=5) == 4
+    assert policy.delay(0, started_at=2) is None
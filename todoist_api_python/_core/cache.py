@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Iterator
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    stored_at: float
+    expires_at: float | None
+    tags: frozenset[Hashable]
+
+
+class LRUCache(Generic[V]):
+    """
+    Bounded mapping with least-recently-used eviction and per-entry expiry.
+
+    Entries are evicted oldest-first once either `max_entries` or `max_bytes` would
+    be exceeded. Expired entries are dropped lazily when they are looked up.
+
+    Entries can be labelled with tags, so that every entry depending on some piece
+    of data can be dropped at once with `invalidate`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_remove: Callable[[Hashable, V], None] | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        :param max_entries: Maximum number of entries to hold, or None for no limit.
+        :param max_bytes: Maximum approximate size of the held values in bytes,
+                          or None for no limit.
+        :param ttl: Number of seconds after which an entry expires,
+                    or None for entries that never expire.
+        :param clock: Monotonic clock used to compute expiry times.
+        :param on_remove: Called with the key and value of every entry that leaves
+                          the cache, whether evicted, expired, invalidated or cleared.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._on_remove = on_remove
+        self._entries: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+        self._tagged: dict[Hashable, set[Hashable]] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries held, including ones not yet reaped."""
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Iterate over the keys held, from least to most recently used."""
+        return iter(list(self._entries))
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a live entry exists for the key, without touching it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        if self._is_expired(entry):
+            self._remove(key)
+            return False
+        return True
+
+    def __getitem__(self, key: Hashable) -> V:
+        """
+        Return the value for a key and mark it as most recently used.
+
+        Hits and misses are counted in `hits` and `misses`.
+
+        :raises KeyError: If there is no live entry for the key.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            raise KeyError(key)
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def __setitem__(self, key: Hashable, value: V) -> None:
+        """Store a value, evicting least recently used entries to make room."""
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        """
+        Remove the entry for a key.
+
+        :raises KeyError: If there is no entry for the key.
+        """
+        if key not in self._entries:
+            raise KeyError(key)
+        self._remove(key)
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        ttl: float | None = None,
+        tags: Iterable[Hashable] = (),
+        size: int | None = None,
+    ) -> None:
+        """
+        Store a value, evicting least recently used entries to make room.
+
+        Values larger than `max_bytes` on their own are not stored at all.
+
+        :param key: The key to store the value under.
+        :param value: The value to store.
+        :param ttl: Overrides the cache-wide TTL for this entry.
+        :param tags: Tags the entry can later be invalidated by.
+        :param size: Overrides the estimated size of the value in bytes.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        size = estimate_size(value) if size is None else size
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        now = self._clock()
+        expires_at = now + ttl if ttl is not None else None
+        entry = _Entry(value, size, now, expires_at, frozenset(tags))
+        self._entries[key] = entry
+        self.nbytes += size
+        self._tag(key, entry)
+        self._evict()
+
+    def peek(self, key: Hashable, default: V | None = None) -> V | None:
+        """Return the live value for a key without marking it as used or counting."""
+        if key not in self:
+            return default
+        return self._entries[key].value
+
+    def age(self, key: Hashable) -> float:
+        """
+        Return the number of seconds since the value for a key was stored.
+
+        :raises KeyError: If there is no live entry for the key.
+        """
+        if key not in self:
+            raise KeyError(key)
+        return self._clock() - self._entries[key].stored_at
+
+    def replace(
+        self,
+        key: Hashable,
+        value: V,
+        tags: Iterable[Hashable],
+        size: int | None = None,
+    ) -> None:
+        """
+        Swap the value and tags of an existing entry, keeping its expiry and position.
+
+        Only the tags added or removed are re-indexed, so entries can be grown in
+        place cheaply, e.g. page by page.
+
+        :param key: The key of the entry.
+        :param value: The new value.
+        :param tags: The new tags of the entry.
+        :param size: Overrides the estimated size of the value in bytes.
+        :raises KeyError: If there is no entry for the key.
+        """
+        entry = self._entries[key]
+        if value is not entry.value and self._on_remove is not None:
+            self._on_remove(key, entry.value)
+        tags = frozenset(tags)
+        for tag in entry.tags - tags:
+            self._untag_one(key, tag)
+        for tag in tags - entry.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        size = estimate_size(value) if size is None else size
+        self.nbytes += size - entry.size
+        entry.value = value
+        entry.size = size
+        entry.tags = tags
+        self._evict()
+
+    def tagged(self, tag: Hashable) -> list[tuple[Hashable, V, frozenset[Hashable]]]:
+        """Return the key, value and tags of every live entry labelled with a tag."""
+        keys = [key for key in self._tagged.get(tag, ()) if key in self]
+        return [
+            (key, self._entries[key].value, self._entries[key].tags) for key in keys
+        ]
+
+    def invalidate(
+        self, tags: Iterable[Hashable], keep: Iterable[Hashable] = ()
+    ) -> list[V]:
+        """
+        Remove every entry labelled with any of the given tags.
+
+        :param tags: The tags to invalidate.
+        :param keep: Keys to leave in place even if they carry one of the tags.
+        :return: The values of the removed entries.
+        """
+        keys: set[Hashable] = set()
+        for tag in tags:
+            keys |= self._tagged.get(tag, set())
+        return [self._remove(key).value for key in keys - set(keep)]
+
+    def pop(self, key: Hashable, default: V | None = None) -> V | None:
+        """Remove the entry for a key and return its value, or `default`."""
+        if key not in self._entries:
+            return default
+        return self._remove(key).value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        entries, self._entries = self._entries, OrderedDict()
+        self._tagged.clear()
+        self.nbytes = 0
+        if self._on_remove is not None:
+            for key, entry in entries.items():
+                self._on_remove(key, entry.value)
+
+    def reset_stats(self) -> None:
+        """Zero the hit, miss and eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _is_expired(self, entry: _Entry[V]) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= self._clock()
+
+    def _remove(self, key: Hashable) -> _Entry[V]:
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.size
+        self._untag(key, entry)
+        if self._on_remove is not None:
+            self._on_remove(key, entry.value)
+        return entry
+
+    def _tag(self, key: Hashable, entry: _Entry[V]) -> None:
+        for tag in entry.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+
+    def _untag(self, key: Hashable, entry: _Entry[V]) -> None:
+        for tag in entry.tags:
+            self._untag_one(key, tag)
+
+    def _untag_one(self, key: Hashable, tag: Hashable) -> None:
+        keys = self._tagged[tag]
+        keys.discard(key)
+        if not keys:
+            del self._tagged[tag]
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+
+@dataclass
+class _StoredEntity(Generic[V]):
+    value: V
+    size: int
+    fetched_at: float
+    tags: frozenset[Hashable]
+    refs: int = 0
+
+
+class EntityStore(Generic[V]):
+    """
+    Table of entities shared between cache entries, keyed by kind and ID.
+
+    Cache entries hold references into the table instead of their own copies, so an
+    entity appearing in several results is stored once, and the latest version
+    fetched is seen by all of them. An entity is kept as long as at least one
+    entry references it.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the store.
+
+        :param clock: Monotonic clock used to record when entities were fetched.
+        """
+        self._clock = clock
+        self._entities: dict[Hashable, _StoredEntity[V]] = {}
+        self._tagged: dict[Hashable, set[Hashable]] = {}
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        """Return the number of entities held."""
+        return len(self._entities)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether an entity is held for the key."""
+        return key in self._entities
+
+    def get(self, key: Hashable, max_age: float | None = None) -> V | None:
+        """
+        Return the entity for a key, or None.
+
+        :param key: The key of the entity.
+        :param max_age: Only return the entity if it was fetched at most this many
+                        seconds ago.
+        """
+        stored = self._entities.get(key)
+        if stored is None:
+            return None
+        if max_age is not None and self._clock() - stored.fetched_at > max_age:
+            return None
+        return stored.value
+
+    def size(self, key: Hashable) -> int:
+        """Return the estimated size of the entity for a key, or 0 if none is held."""
+        stored = self._entities.get(key)
+        return stored.size if stored is not None else 0
+
+    def age(self, key: Hashable) -> float:
+        """
+        Return the number of seconds since the entity for a key was fetched.
+
+        :raises KeyError: If no entity is held for the key.
+        """
+        return self._clock() - self._entities[key].fetched_at
+
+    def acquire(
+        self,
+        key: Hashable,
+        value: V,
+        tags: Iterable[Hashable] = (),
+        size: int | None = None,
+        age: float | None = None,
+    ) -> None:
+        """
+        Store (or refresh) an entity and add a reference to it.
+
+        Re-acquiring the entity already held keeps the time it was fetched, so
+        references taken from the store don't make it look fresher than it is.
+
+        :param key: The key of the entity.
+        :param value: The entity.
+        :param tags: Tags the entity can later be looked up by.
+        :param size: The estimated size of the entity, if already known.
+        :param age: Seconds since the entity was fetched, if not just now.
+        """
+        stored = self._entities.get(key)
+        refs = stored.refs + 1 if stored is not None else 1
+        if age is None and stored is not None and stored.value is value:
+            fetched_at = stored.fetched_at
+        else:
+            fetched_at = self._clock() - (age or 0.0)
+        self._put(key, value, tags, refs, size, fetched_at)
+
+    def update(self, key: Hashable, value: V, tags: Iterable[Hashable] = ()) -> None:
+        """Refresh an entity that is already held. Does nothing for other keys."""
+        stored = self._entities.get(key)
+        if stored is not None:
+            self._put(key, value, tags, stored.refs, None, self._clock())
+
+    def release(self, key: Hashable) -> None:
+        """Drop a reference to an entity, removing it once none are left."""
+        stored = self._entities.get(key)
+        if stored is None:
+            return
+        stored.refs -= 1
+        if stored.refs <= 0:
+            self._remove(key)
+
+    def tagged(self, tag: Hashable) -> set[Hashable]:
+        """Return the keys of every entity labelled with a tag."""
+        return set(self._tagged.get(tag, ()))
+
+    def _put(
+        self,
+        key: Hashable,
+        value: V,
+        tags: Iterable[Hashable],
+        refs: int,
+        size: int | None,
+        fetched_at: float,
+    ) -> None:
+        if key in self._entities:
+            self._remove(key)
+        size = estimate_size(value) if size is None else size
+        stored = _StoredEntity(value, size, fetched_at, frozenset(tags), refs)
+        self._entities[key] = stored
+        self.nbytes += stored.size
+        for tag in stored.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+
+    def _remove(self, key: Hashable) -> None:
+        stored = self._entities.pop(key)
+        self.nbytes -= stored.size
+        for tag in stored.tags:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+
+
+def estimate_size(obj: object) -> int:
+    """
+    Approximate the memory held by a value in bytes.
+
+    Walks through dicts, lists, tuples and sets, summing `sys.getsizeof` of every
+    container and leaf. Shared objects are only counted once.
+    """
+    seen: set[int] = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, overload
+
+from requests import Timeout
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Absolute monotonic time by which the requests of the current call must complete
+_deadline: ContextVar[float | None] = ContextVar("todoist_deadline", default=None)
+
+
+class DeadlineExceeded(Timeout):
+    """Raised instead of sending a request once the deadline has passed."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Bound the total time spent on the requests made within the block.
+
+    The deadline covers every page of paginated results and every retry, and each
+    request's connect and read timeouts are shortened to the time left. It applies
+    to the current thread or asyncio task, and to the sync calls it runs on the
+    event loop's thread pool. Nested deadlines can only shorten the outer one.
+
+    :param seconds: Time budget in seconds, or None for no deadline.
+    """
+    if seconds is None:
+        yield
+        return
+    with use_deadline(time.monotonic() + seconds):
+        yield
+
+
+@contextmanager
+def use_deadline(at: float | None) -> Iterator[None]:
+    """
+    Apply a deadline previously read from `current_deadline`.
+
+    :param at: The deadline, as a `time.monotonic` timestamp, or None.
+    """
+    current = _deadline.get()
+    if at is None or (current is not None and current <= at):
+        yield
+        return
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    """Return the deadline in effect, as a `time.monotonic` timestamp, or None."""
+    return _deadline.get()
+
+
+def time_left() -> float | None:
+    """Return the seconds left until the deadline in effect, or None."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+@overload
+def bound_timeout(timeout: float) -> float: ...
+
+
+@overload
+def bound_timeout(timeout: tuple[float, float]) -> tuple[float, float]: ...
+
+
+def bound_timeout(
+    timeout: float | tuple[float, float],
+) -> float | tuple[float, float]:
+    """
+    Shorten a request's timeouts so they don't run past the deadline in effect.
+
+    :param timeout: A timeout, or connect and read timeouts, in seconds.
+    :raises DeadlineExceeded: If the deadline has already passed.
+    """
+    left = time_left()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before the request could be sent")
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return min(connect, left), min(read, left)
+    return min(timeout, left)
@@ -3,12 +3,15 @@ from __future__ import annotations
 CONTENT_TYPE = ("Content-Type", "application/json; charset=utf-8")
 AUTHORIZATION = ("Authorization", "Bearer %s")
 X_REQUEST_ID = ("X-Request-Id", "%s")
+ACCEPT_ENCODING = ("Accept-Encoding", "%s")
+CONTENT_ENCODING = ("Content-Encoding", "gzip")
 
 
 def create_headers(
     token: str | None = None,
     with_content: bool = False,
     request_id: str | None = None,
+    accept_encoding: str | None = None,
 ) -> dict[str, str]:
     headers: dict[str, str] = {}
 
@@ -18,5 +21,7 @@ def create_headers(
         headers.update([CONTENT_TYPE])
     if request_id:
         headers.update([(X_REQUEST_ID[0], X_REQUEST_ID[1] % request_id)])
+    if accept_encoding:
+        headers.update([(ACCEPT_ENCODING[0], ACCEPT_ENCODING[1] % accept_encoding)])
 
     return headers
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
-import json
-from typing import TYPE_CHECKING, Any, TypeVar, cast
+import asyncio
+import gzip
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol, TypeVar, cast
 
+from requests import HTTPError, Response, Session, Timeout
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.status_codes import codes
+from urllib3.util import make_headers
 
-from todoist_api_python._core.http_headers import create_headers
+from todoist_api_python._core.deadline import bound_timeout, time_left
+from todoist_api_python._core.http_headers import (
+    CONTENT_ENCODING,
+    X_REQUEST_ID,
+    create_headers,
+)
+from todoist_api_python._core.json_codec import get_codec
 
 if TYPE_CHECKING:
-    from requests import Session
+    import httpx
+
+    from todoist_api_python._core.json_codec import JSONCodec
+    from todoist_api_python._core.rate_limit import RateLimiter
+    from todoist_api_python._core.retry import RetryPolicy
 
 
 # Timeouts for requests.
@@ -20,9 +37,612 @@ if TYPE_CHECKING:
 # forcefully terminated after this time, so there is no point waiting any longer.
 TIMEOUT = (10, 60)
 
+# Response encodings urllib3 can decode: gzip and deflate, plus br and zstd when the
+# brotli and zstandard packages are installed (`pip install todoist-api-python[brotli]`)
+RESPONSE_ENCODINGS = make_headers(accept_encoding=True)["accept-encoding"]
+
+# Compression level of request bodies, favouring speed over the last few bytes
+_GZIP_LEVEL = 5
+
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class TransportStats:
+    """Sizes of the request and response bodies a transport sent and received."""
+
+    requests: int
+    # Request bodies before and after compression, counted once per call
+    request_bytes: int
+    request_wire_bytes: int
+    # Response bodies after and before decompression, counted for every attempt
+    response_bytes: int
+    response_wire_bytes: int
+
+    @property
+    def bytes_saved(self) -> int:
+        """Return the number of bytes compression kept off the wire."""
+        return (self.request_bytes - self.request_wire_bytes) + (
+            self.response_bytes - self.response_wire_bytes
+        )
+
+
+class _StatsRecorder:
+    """Thread-safe counters behind `TransportStats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = [0] * 5
+
+    def record_request(self, size: int, wire_size: int) -> None:
+        with self._lock:
+            self._counts[1] += size
+            self._counts[2] += wire_size
+
+    def record_response(self, size: int, wire_size: int) -> None:
+        with self._lock:
+            self._counts[0] += 1
+            self._counts[3] += size
+            self._counts[4] += wire_size
+
+    def snapshot(self, reset: bool = False) -> TransportStats:
+        with self._lock:
+            stats = TransportStats(*self._counts)
+            if reset:
+                self._counts = [0] * 5
+        return stats
+
+
+def _encode_body(
+    codec: JSONCodec, data: dict[str, Any], compress_min_bytes: int | None
+) -> tuple[bytes | str, int, bool]:
+    """
+    Serialize a request body, compressing it if it's large enough.
+
+    :return: The body, its size before compression, and whether it was compressed.
+    """
+    body = codec.dumps(data)
+    raw = body.encode() if isinstance(body, str) else body
+    if compress_min_bytes is None or len(raw) < compress_min_bytes:
+        return body, len(raw), False
+    return gzip.compress(raw, compresslevel=_GZIP_LEVEL), len(raw), True
+
+
+def create_session(
+    session: Session | None = None,
+    *,
+    pool_connections: int | None = None,
+    pool_maxsize: int | None = None,
+    pool_block: bool | None = None,
+) -> Session:
+    """
+    Create a requests Session with a sized connection pool, or resize an existing one.
+
+    Connections are kept alive and reused between requests. Pass the same session to
+    several clients (and to the authentication helpers) to share one pool between them.
+
+    :param session: A session to resize the pool of, instead of creating a new one.
+                    It is returned untouched if no pool options are given.
+    :param pool_connections: Number of per-host pools to keep (default 10).
+    :param pool_maxsize: Maximum number of connections kept per host (default 10).
+                         Set it to at least the number of threads making requests,
+                         or connections get discarded and new ones opened instead.
+    :param pool_block: Whether to wait for a free connection once `pool_maxsize`
+                       are in use, instead of opening (and then discarding) extra
+                       ones (default False).
+    """
+    if session is not None and (pool_connections, pool_maxsize, pool_block) == (
+        None,
+        None,
+        None,
+    ):
+        return session
+
+    session = session or Session()
+    adapter = HTTPAdapter(
+        pool_connections=(
+            DEFAULT_POOLSIZE if pool_connections is None else pool_connections
+        ),
+        pool_maxsize=DEFAULT_POOLSIZE if pool_maxsize is None else pool_maxsize,
+        pool_block=DEFAULT_POOLBLOCK if pool_block is None else pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class Transport(Protocol):
+    """
+    Sends requests to the Todoist API on behalf of a client.
+
+    A client holds a single transport, so how requests are made (the HTTP library,
+    connection pooling, retries, serialization, instrumentation) can be changed in one
+    place by passing a different one. Implementations send the client's credentials
+    with every request, and raise `requests.exceptions.HTTPError` for error responses.
+    """
+
+    def get(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        """Send a GET request and return the decoded JSON response."""
+        ...
+
+    def post(
+        self,
+        url: str,
+        request_id: str | None = None,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        """Send a POST request with an optional JSON body, returning the response."""
+        ...
+
+    def delete(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> bool:
+        """Send a DELETE request and return whether it succeeded."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held, e.g. pooled connections."""
+        ...
+
+
+class RequestsTransport:
+    """Transport sending requests through a `requests.Session`."""
+
+    def __init__(
+        self,
+        session: Session | None = None,
+        token: str | None = None,
+        timeout: float | tuple[float, float] = TIMEOUT,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        codec: JSONCodec | None = None,
+        compress_min_bytes: int | None = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Responses are always requested compressed (see `RESPONSE_ENCODINGS`), and
+        the bytes saved are counted in `stats`.
+
+        :param session: The requests Session to send requests through.
+                        A new one is created if omitted.
+        :param token: The authentication token to send with every request, if any.
+        :param timeout: Connect and read timeouts in seconds, or one value for both.
+                        They are shortened to the time left before the deadline of
+                        the current call, if any (see `deadline`).
+        :param rate_limiter: Paces requests and retries those rejected with a 429.
+                             Share one between transports using the same token.
+        :param retry_policy: Retries requests failing transiently, or None to not
+                             retry them.
+        :param codec: Encodes request bodies and decodes responses. Defaults to the
+                      fastest one installed (see `get_codec`).
+        :param compress_min_bytes: Gzip request bodies of at least this many bytes,
+                                   or None to never compress them.
+        """
+        self.session = session or Session()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.codec = codec or get_codec()
+        self.compress_min_bytes = compress_min_bytes
+        self._stats = _StatsRecorder()
+        # Built once, rather than for every request
+        self._headers = create_headers(token=token, accept_encoding=RESPONSE_ENCODINGS)
+        self._content_headers = create_headers(
+            token=token, with_content=True, accept_encoding=RESPONSE_ENCODINGS
+        )
+
+    def get(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        response = self._send(
+            "get",
+            url,
+            request_id,
+            params=params,
+            headers=self._headers_for(request_id),
+        )
+
+        if response.status_code == codes.OK:
+            return cast("T", self.codec.loads(response.content))
+
+        response.raise_for_status()
+        return cast("T", response.ok)
+
+    def post(
+        self,
+        url: str,
+        request_id: str | None = None,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> T:  # type: ignore[type-var]
+        headers = self._headers_for(request_id, with_content=bool(data))
+        body = None
+        if data:
+            body, size, compressed = _encode_body(
+                self.codec, data, self.compress_min_bytes
+            )
+            if compressed:
+                headers = {**headers, CONTENT_ENCODING[0]: CONTENT_ENCODING[1]}
+            self._stats.record_request(size, len(body) if compressed else size)
+
+        response = self._send(
+            "post",
+            url,
+            request_id,
+            headers=headers,
+            data=body,
+            params=params,
+        )
+
+        if response.status_code == codes.OK:
+            return cast("T", self.codec.loads(response.content))
+
+        response.raise_for_status()
+        return cast("T", response.ok)
+
+    def delete(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> bool:
+        response = self._send(
+            "delete",
+            url,
+            request_id,
+            params=params,
+            headers=self._headers_for(request_id),
+        )
+
+        response.raise_for_status()
+        return response.ok
+
+    def close(self) -> None:
+        self.session.close()
+
+    def stats(self, reset: bool = False) -> TransportStats:
+        """
+        Snapshot the sizes of the bodies sent and received so far.
+
+        :param reset: Zero the counters once read.
+        """
+        return self._stats.snapshot(reset)
+
+    def _send(
+        self, method: str, url: str, request_id: str | None, **kwargs: object
+    ) -> Response:
+        policy = self.retry_policy
+        if policy is None or not policy.can_retry(method, request_id):
+            return self._attempt(method, url, **kwargs)
+
+        # Every attempt reuses the same headers, so a POST keeps its request ID
+        started_at = policy.clock()
+        attempt = 0
+        while True:
+            try:
+                response = self._attempt(method, url, **kwargs)
+            except (RequestsConnectionError, Timeout):
+                delay = policy.delay(attempt, started_at)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in policy.statuses:
+                    return response
+                delay = policy.delay(attempt, started_at)
+                if delay is None:
+                    return response
+            policy.sleep(delay)
+            attempt += 1
+
+    def _attempt(self, method: str, url: str, **kwargs: object) -> Response:
+        if self.rate_limiter is None:
+            return self._request(method, url, **kwargs)
+
+        # Requests rejected with a 429 weren't processed, so are safe to send again
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            with self.rate_limiter.limit():
+                response = self._request(method, url, **kwargs)
+            throttled = self.rate_limiter.record(
+                response.status_code, response.headers.get("Retry-After")
+            )
+            if not throttled or attempt == self.rate_limiter.max_retries:
+                break
+        return response
+
+    def _request(self, method: str, url: str, **kwargs: object) -> Response:
+        send = getattr(self.session, method)
+        response = cast(
+            "Response", send(url, timeout=bound_timeout(self.timeout), **kwargs)
+        )
+        # The body has been read (and decompressed) by now, and `raw` counts the
+        # bytes read off the connection
+        size = len(response.content)
+        tell = getattr(response.raw, "tell", None)
+        self._stats.record_response(size, tell() if callable(tell) else size)
+        return response
+
+    def _headers_for(
+        self, request_id: str | None, with_content: bool = False
+    ) -> dict[str, str]:
+        headers = self._content_headers if with_content else self._headers
+        if request_id:
+            headers = {**headers, X_REQUEST_ID[0]: X_REQUEST_ID[1] % request_id}
+        return headers
+
+
+class Request(NamedTuple):
+    """Description of a request to the Todoist API, for a transport to send."""
+
+    method: str
+    url: str
+    request_id: str | None = None
+    params: dict[str, Any] | None = None
+    data: dict[str, Any] | None = None
+
+
+class RequestBuilder:
+    """
+    Transport returning a `Request` describing each call instead of sending it.
+
+    Lets the request-building logic of `TodoistAPI` be reused by clients that send
+    requests by other means, e.g. an `AsyncTransport`.
+    """
+
+    def get(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> Request:
+        return Request("GET", url, request_id, params)
+
+    def post(
+        self,
+        url: str,
+        request_id: str | None = None,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> Request:
+        return Request("POST", url, request_id, params, data)
+
+    def delete(
+        self,
+        url: str,
+        request_id: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> Request:
+        return Request("DELETE", url, request_id, params)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncTransport(Protocol):
+    """
+    Sends requests to the Todoist API without blocking the event loop.
+
+    Like `Transport`, implementations send the client's credentials with every
+    request, and raise `requests.exceptions.HTTPError` for error responses.
+    """
+
+    async def send(self, request: Request) -> T:
+        """
+        Send a request.
+
+        :return: The decoded JSON response, or for responses without a body
+                 (and DELETE requests) whether the request succeeded.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """Release any resources held, e.g. pooled connections."""
+        ...
+
+
+class HttpxAsyncTransport:
+    """
+    Transport sending requests through an `httpx.AsyncClient`.
+
+    Requires the optional `httpx` dependency (`pip install todoist-api-python[httpx]`).
+    A single event loop can keep many requests in flight without any threads.
+    """
+
+    def __init__(
+        self,
+        token: str | None = None,
+        client: httpx.AsyncClient | None = None,
+        timeout: float | tuple[float, float] = TIMEOUT,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        codec: JSONCodec | None = None,
+        compress_min_bytes: int | None = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        httpx asks for compressed responses by default (brotli and zstd too, when
+        installed), and the bytes saved are counted in `stats`.
+
+        :param token: The authentication token to send with every request, if any.
+        :param client: The httpx AsyncClient to send requests through.
+                       A new one is created if omitted, with the options below.
+        :param timeout: Connect and read timeouts in seconds, or a single timeout
+                        for both, shortened to the time left before the deadline of
+                        the current call, if any.
+        :param max_connections: Maximum number of concurrent connections,
+                                or None for no limit.
+        :param max_keepalive_connections: Maximum number of idle connections kept
+                                          alive for reuse, or None for no limit.
+        :param rate_limiter: Paces requests and retries those rejected with a 429.
+                             Share one between transports using the same token.
+        :param retry_policy: Retries requests failing transiently, or None to not
+                             retry them.
+        :param codec: Encodes request bodies and decodes responses. Defaults to the
+                      fastest one installed (see `get_codec`).
+        :param compress_min_bytes: Gzip request bodies of at least this many bytes,
+                                   or None to never compress them.
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "HttpxAsyncTransport requires httpx: "
+                "pip install todoist-api-python[httpx]"
+            ) from e
+
+        connect, read = _split_timeout(timeout)
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.codec = codec or get_codec()
+        self.compress_min_bytes = compress_min_bytes
+        self.timeout = timeout
+        self._stats = _StatsRecorder()
+        self._timeout_type = httpx.Timeout
+        self._transport_errors = (httpx.TransportError,)
+        self._headers = create_headers(token=token)
+        self._content_headers = create_headers(token=token, with_content=True)
+
+    async def send(self, request: Request) -> T:
+        headers = self._content_headers if request.data else self._headers
+        if request.request_id:
+            headers = {**headers, X_REQUEST_ID[0]: X_REQUEST_ID[1] % request.request_id}
+
+        body = None
+        if request.data:
+            body, size, compressed = _encode_body(
+                self.codec, request.data, self.compress_min_bytes
+            )
+            if compressed:
+                headers = {**headers, CONTENT_ENCODING[0]: CONTENT_ENCODING[1]}
+            self._stats.record_request(size, len(body) if compressed else size)
+
+        response = await self._send(request, headers, body)
+
+        if response.is_error:
+            _raise_for_status(response)
+        if request.method != "DELETE" and response.status_code == codes.OK:
+            return cast("T", self.codec.loads(response.content))
+        return cast("T", response.is_success)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self, reset: bool = False) -> TransportStats:
+        """
+        Snapshot the sizes of the bodies sent and received so far.
+
+        :param reset: Zero the counters once read.
+        """
+        return self._stats.snapshot(reset)
+
+    async def _send(
+        self, request: Request, headers: dict[str, str], content: bytes | str | None
+    ) -> httpx.Response:
+        policy = self.retry_policy
+        if policy is None or not policy.can_retry(request.method, request.request_id):
+            return await self._attempt(request, headers, content)
+
+        started_at = policy.clock()
+        attempt = 0
+        while True:
+            try:
+                response = await self._attempt(request, headers, content)
+            except self._transport_errors:
+                delay = policy.delay(attempt, started_at)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in policy.statuses:
+                    return response
+                delay = policy.delay(attempt, started_at)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(
+        self, request: Request, headers: dict[str, str], content: bytes | str | None
+    ) -> httpx.Response:
+        timeout = self.client.timeout
+        if time_left() is not None:
+            connect, read = _split_timeout(bound_timeout(self.timeout))
+            timeout = self._timeout_type(read, connect=connect)
+        if self.rate_limiter is None:
+            return await self._request(request, headers, content, timeout)
+
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            async with self.rate_limiter.limit_async():
+                response = await self._request(request, headers, content, timeout)
+            throttled = self.rate_limiter.record(
+                response.status_code, response.headers.get("Retry-After")
+            )
+            if not throttled or attempt == self.rate_limiter.max_retries:
+                break
+        return response
+
+    async def _request(
+        self,
+        request: Request,
+        headers: dict[str, str],
+        content: bytes | str | None,
+        timeout: httpx.Timeout,
+    ) -> httpx.Response:
+        response = await self.client.request(
+            request.method,
+            request.url,
+            params=request.params,
+            headers=headers,
+            content=content,
+            timeout=timeout,
+        )
+        self._stats.record_response(
+            len(response.content), response.num_bytes_downloaded
+        )
+        return response
+
+
+def _split_timeout(timeout: float | tuple[float, float]) -> tuple[float, float]:
+    """Return the connect and read timeouts, as requests would take them."""
+    return timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    """Raise the same `HTTPError` requests would have for an error response."""
+    converted = Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.url = str(response.url)
+    converted.headers.update(response.headers)
+    converted._content = response.content
+    converted.raise_for_status()
+    raise HTTPError(response=converted)
+
+
 def get(
     session: Session,
     url: str,
@@ -30,20 +650,7 @@ def get(
     request_id: str | None = None,
     params: dict[str, Any] | None = None,
 ) -> T:  # type: ignore[type-var]
-    headers = create_headers(token=token, request_id=request_id)
-
-    response = session.get(
-        url,
-        params=params,
-        headers=headers,
-        timeout=TIMEOUT,
-    )
-
-    if response.status_code == codes.OK:
-        return cast("T", response.json())
-
-    response.raise_for_status()
-    return cast("T", response.ok)
+    return RequestsTransport(session, token).get(url, request_id, params)
 
 
 def post(
@@ -55,24 +662,10 @@ def post(
     params: dict[str, Any] | None = None,
     data: dict[str, Any] | None = None,
 ) -> T:  # type: ignore[type-var]
-    headers = create_headers(
-        token=token, with_content=bool(data), request_id=request_id
+    return RequestsTransport(session, token).post(
+        url, request_id, params=params, data=data
     )
 
-    response = session.post(
-        url,
-        headers=headers,
-        data=json.dumps(data) if data else None,
-        params=params,
-        timeout=TIMEOUT,
-    )
-
-    if response.status_code == codes.OK:
-        return cast("T", response.json())
-
-    response.raise_for_status()
-    return cast("T", response.ok)
-
 
 def delete(
     session: Session,
@@ -81,9 +674,4 @@ def delete(
     request_id: str | None = None,
     params: dict[str, Any] | None = None,
 ) -> bool:
-    headers = create_headers(token=token, request_id=request_id)
-
-    response = session.delete(url, params=params, headers=headers, timeout=TIMEOUT)
-
-    response.raise_for_status()
-    return response.ok
+    return RequestsTransport(session, token).delete(url, request_id, params)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import logging
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec(Protocol):
+    """Serializes request bodies and deserializes response bodies."""
+
+    name: str
+
+    def dumps(self, obj: object) -> bytes | str:
+        """Serialize an object to JSON."""
+        ...
+
+    def loads(self, data: bytes) -> object:
+        """Deserialize JSON, straight from the raw (UTF-8) bytes of a response."""
+        ...
+
+
+class StdlibCodec:
+    """Codec using the standard library's `json` module."""
+
+    name = "json"
+
+    def dumps(self, obj: object) -> str:
+        return json.dumps(obj)
+
+    def loads(self, data: bytes) -> object:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec using `orjson` (`pip install todoist-api-python[orjson]`)."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson  # type: ignore[import-not-found]
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class MsgspecCodec:
+    """Codec using `msgspec` (`pip install todoist-api-python[msgspec]`)."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec  # type: ignore[import-not-found]
+
+        # Encoders and decoders are reusable, and faster than the module functions
+        self.dumps = msgspec.json.Encoder().encode
+        self.loads = msgspec.json.Decoder().decode
+
+
+_CODECS: dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": StdlibCodec,
+}
+
+
+@lru_cache
+def get_codec(name: str = "auto") -> JSONCodec:
+    """
+    Return a JSON codec by name.
+
+    Codecs whose library isn't installed fall back to the standard library's.
+
+    :param name: One of "orjson", "msgspec" or "json", or "auto" for the fastest
+                 one installed.
+    :raises ValueError: If the name is not known.
+    """
+    if name == "auto":
+        # Codecs are named after their library; "json" is always installed
+        name = next(codec for codec in _CODECS if find_spec(codec) is not None)
+    if name not in _CODECS:
+        raise ValueError(
+            f"Unknown JSON codec {name!r}, expected one of: auto, {', '.join(_CODECS)}"
+        )
+
+    try:
+        return _CODECS[name]()
+    except ImportError:
+        logger.warning("%s is not installed, falling back to the json module", name)
+        return StdlibCodec()
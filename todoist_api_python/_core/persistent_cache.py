@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+from weakref import finalize
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Mapping
+    from os import PathLike
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    method TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, method, key)
+);
+CREATE TABLE IF NOT EXISTS entry_tags (
+    namespace TEXT NOT NULL,
+    method TEXT NOT NULL,
+    key TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (namespace, tag, method, key),
+    FOREIGN KEY (namespace, method, key)
+        REFERENCES entries (namespace, method, key) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS entry_tags_by_entry ON entry_tags (namespace, method, key);
+"""
+
+
+def token_namespace(token: str) -> str:
+    """Derive a namespace for a token's entries, without storing the token itself."""
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+class SQLiteCache:
+    """
+    Cache entries persisted in an SQLite database.
+
+    Entries survive process restarts, and the database can be shared by concurrent
+    processes on one host: it runs in WAL mode, so readers never block the writer,
+    and writers wait for each other up to `timeout` seconds.
+
+    Entries are grouped under a namespace (e.g. one per token), and under the name
+    of the method that produced them. Values must be JSON-serializable. Expiry
+    times are wall-clock based, so they carry across runs.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        namespace: str,
+        timeout: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Open (or create) the database.
+
+        :param path: Path of the database file.
+        :param namespace: Namespace to read and write entries in.
+        :param timeout: Seconds to wait for other processes holding the write lock.
+        :param clock: Wall clock used to compute expiry times.
+        """
+        self._namespace = namespace
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._finalizer = finalize(self, self._connection.close)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_SCHEMA)
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (self._clock(),)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._finalizer()
+
+    def get(
+        self, method: str, key: Hashable
+    ) -> tuple[Any, list[Hashable], float | None] | None:
+        """
+        Look up a live entry.
+
+        :return: The value, tags and remaining seconds to live (None if it never
+                 expires) of the entry, or None if there is no live entry.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM entries "
+                "WHERE namespace = ? AND method = ? AND key = ?",
+                (self._namespace, method, _encode(key)),
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            now = self._clock()
+            if expires_at is not None and expires_at <= now:
+                return None
+            tags = self._connection.execute(
+                "SELECT tag FROM entry_tags "
+                "WHERE namespace = ? AND method = ? AND key = ?",
+                (self._namespace, method, _encode(key)),
+            ).fetchall()
+        ttl = expires_at - now if expires_at is not None else None
+        return json.loads(value), [_decode_tag(tag) for (tag,) in tags], ttl
+
+    def set(
+        self,
+        method: str,
+        key: Hashable,
+        value: object,
+        tags: Iterable[Hashable] = (),
+        ttl: float | None = None,
+    ) -> None:
+        """Store an entry, replacing any existing one."""
+        encoded_key = _encode(key)
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock, self._transaction():
+            # Delete first rather than INSERT OR REPLACE, so old tags are dropped too
+            self._connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND method = ? AND key = ?",
+                (self._namespace, method, encoded_key),
+            )
+            self._connection.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                (self._namespace, method, encoded_key, json.dumps(value), expires_at),
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO entry_tags VALUES (?, ?, ?, ?)",
+                [
+                    (self._namespace, method, encoded_key, _encode(tag))
+                    for tag in set(tags)
+                ],
+            )
+
+    def delete(self, method: str, key: Hashable) -> None:
+        """Remove an entry, if present."""
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND method = ? AND key = ?",
+                (self._namespace, method, _encode(key)),
+            )
+
+    def clear(self, method: str | None = None) -> None:
+        """Remove every entry in the namespace, or only those of one method."""
+        with self._lock, self._transaction():
+            if method is None:
+                self._connection.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (self._namespace,)
+                )
+            else:
+                self._connection.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND method = ?",
+                    (self._namespace, method),
+                )
+
+    def invalidate(
+        self,
+        tags: Iterable[Hashable],
+        keep: Mapping[str, Iterable[Hashable]] | None = None,
+    ) -> None:
+        """
+        Remove every entry labelled with any of the given tags.
+
+        :param tags: The tags to invalidate.
+        :param keep: Maps method names to keys to leave in place.
+        """
+        # Passed as one JSON array, so any number of tags fits in a single parameter
+        encoded_tags = json.dumps([_encode(tag) for tag in set(tags)])
+        kept = {
+            (method, _encode(key))
+            for method, keys in (keep or {}).items()
+            for key in keys
+        }
+        with self._lock, self._transaction():
+            entries = set(
+                self._connection.execute(
+                    "SELECT method, key FROM entry_tags WHERE namespace = ? "
+                    "AND tag IN (SELECT value FROM json_each(?))",
+                    (self._namespace, encoded_tags),
+                ).fetchall()
+            )
+            self._connection.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND method = ? AND key = ?",
+                [(self._namespace, method, key) for method, key in entries - kept],
+            )
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._connection)
+
+
+class _Transaction:
+    """Take the write lock up front, so concurrent writers queue instead of failing."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self) -> None:
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: object) -> None:
+        self._connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+def _encode(value: Hashable) -> str:
+    return json.dumps(value, default=repr)
+
+
+def _decode_tag(tag: str) -> Hashable:
+    decoded = json.loads(tag)
+    return tuple(decoded) if isinstance(decoded, list) else decoded
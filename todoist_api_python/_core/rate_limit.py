@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager, suppress
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+from todoist_api_python._core.deadline import DeadlineExceeded, time_left
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
+
+TOO_MANY_REQUESTS = 429
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for requests to the Todoist API.
+
+    Share one limiter between every client using the same token (or account), and
+    requests are paced in three ways:
+
+    - A token bucket allows at most `rate` requests per second on average, in bursts
+      of up to `burst` requests.
+    - An adaptive limit on concurrent requests backs off on "429 Too Many Requests"
+      responses, halving the limit, and ramps back up by one for every window of
+      successful requests (additive increase, multiplicative decrease).
+    - After a 429, no request is sent until the server's `Retry-After` has passed.
+
+    Transports retry requests rejected with a 429 up to `max_retries` times, as
+    such requests are known not to have been processed.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int | None = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+        default_retry_after: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the rate limiter.
+
+        :param rate: Average number of requests allowed per second, or None for
+                     no limit other than the concurrency limit.
+        :param burst: Number of requests that can be sent at once after a quiet
+                      period (defaults to `rate`, rounded up).
+        :param max_concurrency: Maximum (and initial) number of concurrent requests.
+        :param min_concurrency: Number of concurrent requests to never back off below.
+        :param max_retries: Number of times a request rejected with a 429 is retried.
+        :param default_retry_after: Seconds to pause after a 429 without a valid
+                                    `Retry-After` header.
+        :param clock: Monotonic clock used to pace requests.
+        """
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise ValueError("Concurrency limits must satisfy 1 <= min <= max.")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else math.ceil(rate or 1)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self._clock = clock
+        self._condition = threading.Condition()
+        # Events set on the next release, for the event loops with waiting coroutines,
+        # as a threading.Condition can't wake an event loop
+        self._async_waiters: dict[asyncio.AbstractEventLoop, asyncio.Event] = {}
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self.throttled = 0
+
+    @property
+    def concurrency(self) -> int:
+        """Return the current limit on concurrent requests."""
+        return int(self._limit)
+
+    @contextmanager
+    def limit(self) -> Iterator[None]:
+        """
+        Wait for the right to send a request, and hold it while sending.
+
+        :raises DeadlineExceeded: If the wait would run past the deadline in effect.
+        """
+        with self._condition:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    break
+                self._condition.wait(_bound_wait(wait))
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def limit_async(self) -> AsyncIterator[None]:
+        """
+        Wait for the right to send a request without blocking the event loop.
+
+        Like `limit`, a coroutine waiting for a concurrency slot is woken when a
+        request completes, from whichever thread or event loop sent it.
+
+        :raises DeadlineExceeded: If the wait would run past the deadline in effect.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                wait = self._try_acquire()
+                if wait == 0:
+                    break
+                released = self._async_waiters.get(loop)
+                if released is None:
+                    released = self._async_waiters[loop] = asyncio.Event()
+            timeout = _bound_wait(wait)
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(released.wait(), timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def record(self, status_code: int, retry_after: str | None = None) -> bool:
+        """
+        Adapt to the response to a request sent under `limit`.
+
+        :param status_code: The status code of the response.
+        :param retry_after: The `Retry-After` header of the response, if any.
+        :return: Whether the request was rejected with a 429, and should be retried.
+        """
+        with self._condition:
+            if status_code != TOO_MANY_REQUESTS:
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+                return False
+
+            self.throttled += 1
+            self._limit = max(self.min_concurrency, self._limit / 2)
+            self._tokens = 0.0
+            pause = _parse_retry_after(retry_after, self.default_retry_after)
+            self._paused_until = max(self._paused_until, self._clock() + pause)
+            return True
+
+    def _try_acquire(self) -> float:
+        """Take a token and a concurrency slot, or return how long to wait for them."""
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._limit):
+            return math.inf  # until a request completes
+        if self.rate is not None:
+            elapsed = now - self._refilled_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+        self._in_flight += 1
+        return 0
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+            async_waiters, self._async_waiters = self._async_waiters, {}
+        for loop, released in async_waiters.items():
+            # The loop may have been closed since its coroutines gave up waiting
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(released.set)
+
+
+def _bound_wait(wait: float) -> float | None:
+    """
+    Cap a wait for the limiter at the deadline in effect.
+
+    :param wait: Seconds to wait, or infinity to wait for a request to complete.
+    :return: Seconds to wait for, or None to wait indefinitely.
+    :raises DeadlineExceeded: If the deadline passes before the wait is over.
+    """
+    left = time_left()
+    if left is not None and (left <= 0 or (wait > left and not math.isinf(wait))):
+        raise DeadlineExceeded("Deadline exceeded while waiting for the rate limiter")
+    if math.isinf(wait):
+        return left
+    return wait
+
+
+def _parse_retry_after(value: str | None, default: float) -> float:
+    """Parse a `Retry-After` header, given either in seconds or as an HTTP date."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
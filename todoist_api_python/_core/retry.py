@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+from todoist_api_python._core.deadline import time_left
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection
+
+# Methods the API handles idempotently, which can always be sent again
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+
+# Responses to transient failures, e.g. a restarting or overloaded backend
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    When and how often transports retry requests that failed transiently.
+
+    Requests failing with a connection error, a timeout or one of `statuses` are
+    retried up to `max_retries` times, after an exponential backoff with full jitter,
+    so that clients recovering from an outage don't retry in lockstep.
+
+    GET and DELETE requests are always safe to retry. POST requests are only retried
+    if they carry an `X-Request-Id`, which is reused for every attempt so that the
+    server discards duplicates, e.g. of a task that was added before the connection
+    dropped.
+
+    Policies hold no state, so one can be shared by any number of transports.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        deadline: float | None = 60.0,
+        statuses: Collection[int] = RETRY_STATUSES,
+        jitter: Callable[[], float] = random.random,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the policy.
+
+        :param max_retries: Number of times a request is retried.
+        :param backoff: Upper bound of the first delay in seconds, doubled for every
+                        subsequent retry.
+        :param max_backoff: Cap of the delay between two attempts in seconds.
+        :param deadline: Seconds after which a call stops being retried, counted from
+                         its first attempt, or None for no limit.
+        :param statuses: Response status codes to retry.
+        :param jitter: Returns a random factor in [0, 1) applied to each delay.
+        :param sleep: Waits between attempts.
+        :param clock: Monotonic clock used to enforce the deadline.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.jitter = jitter
+        self.sleep = sleep
+        self.clock = clock
+
+    def can_retry(self, method: str, request_id: str | None) -> bool:
+        """Check whether a request can be sent more than once without side effects."""
+        return method.upper() in IDEMPOTENT_METHODS or bool(request_id)
+
+    def delay(self, attempt: int, started_at: float) -> float | None:
+        """
+        Compute how long to wait before retrying a failed attempt.
+
+        :param attempt: Number of the failed attempt, starting from 0.
+        :param started_at: Time of the first attempt, according to `clock`.
+        :return: The delay in seconds, or None if the request shouldn't be retried,
+                 because it ran out of retries or the delay would overrun either the
+                 policy's deadline or the one of the current call.
+        """
+        if attempt >= self.max_retries:
+            return None
+        delay = self.jitter() * min(self.max_backoff, self.backoff * 2**attempt)
+        if self.deadline is not None and (
+            self.clock() + delay - started_at >= self.deadline
+        ):
+            return None
+        left = time_left()
+        if left is not None and delay >= left:
+            return None
+        return delay
+
+
+# Used by clients unless told otherwise
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import sys
 import uuid
 from datetime import date, datetime, timezone
@@ -19,7 +20,9 @@ T = TypeVar("T")
 
 async def run_async(func: Callable[[], T]) -> T:
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, func)
+    # Carry context variables (e.g. a deadline) over to the executor's thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, context.run, func)
 
 
 async def generate_async(iterator: Iterator[T]) -> AsyncGenerator[T]:
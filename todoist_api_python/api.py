@@ -1,11 +1,19 @@
+from __future__ import annotations
+
+import queue
 import sys
-from collections.abc import Callable, Iterator
-from typing import TYPE_CHECKING, Annotated, Any, Literal, TypeVar
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Annotated, Any, Literal, TypedDict, TypeVar, cast
 from weakref import finalize
 
-import requests
 from annotated_types import Ge, Le, MaxLen, MinLen, Predicate
 
+from todoist_api_python._core.deadline import current_deadline, use_deadline
+from todoist_api_python._core.deadline import deadline as call_deadline
 from todoist_api_python._core.endpoints import (
     COLLABORATORS_PATH,
     COMMENTS_PATH,
@@ -24,15 +32,36 @@ from todoist_api_python._core.endpoints import (
     TASKS_QUICK_ADD_PATH,
     get_api_url,
 )
-from todoist_api_python._core.http_requests import delete, get, post
+from todoist_api_python._core.http_requests import (
+    TIMEOUT,
+    Request,
+    RequestsTransport,
+    Transport,
+    TransportStats,
+    create_session,
+)
+from todoist_api_python._core.json_codec import JSONCodec, get_codec
+from todoist_api_python._core.retry import DEFAULT_RETRY_POLICY, RetryPolicy
 from todoist_api_python._core.utils import (
     default_request_id_fn,
     format_date,
     format_datetime,
 )
 
-from datetime import date, datetime
-from types import TracebackType
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+    from datetime import date, datetime
+    from types import TracebackType
+
+    import requests
+
+    from todoist_api_python._core.rate_limit import RateLimiter
+
+
+# Largest page size the API allows for paginated results, and the page size it
+# defaults to otherwise
+MAX_PAGE_SIZE = 200
+DEFAULT_PAGE_SIZE = 50
 
 LanguageCode = Annotated[str, Predicate(lambda x: len(x) == 2)]  # noqa: PLR2004
 ColorString = Annotated[
@@ -82,18 +111,90 @@ class TodoistAPI:
         token: str,
         request_id_fn: Callable[[], str] | None = default_request_id_fn,
         session: requests.Session | None = None,
+        *,
+        transport: Transport | None = None,
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        pool_block: bool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = DEFAULT_RETRY_POLICY,
+        json_codec: JSONCodec | str = "auto",
+        timeout: float | tuple[float, float] = TIMEOUT,
+        compress_requests: int | None = None,
+        prefetch_pages: int = 0,
+        bulk: bool = False,
     ) -> None:
         """
         Initialize the TodoistAPI client.
 
+        The pool options size the connection pool of the client's session (see
+        `create_session`). To share one pool between clients and the authentication
+        helpers, pass them all the same session instead.
+
         :param token: Authentication token for the Todoist API.
         :param request_id_fn: Generator of request IDs for the `X-Request-ID` header.
         :param session: An optional pre-configured requests `Session` object.
+        :param transport: An optional transport to send requests through instead,
+                          e.g. one built on another HTTP library, or a fake for tests.
+                          It must authenticate requests with `token` itself.
+        :param pool_connections: Number of per-host connection pools to keep.
+        :param pool_maxsize: Maximum number of connections kept alive per host.
+                             Set it to at least the number of threads sharing the
+                             client.
+        :param pool_block: Wait for a free connection once `pool_maxsize` are in use.
+        :param rate_limiter: Paces requests to stay under the API's rate limits, and
+                             retries requests rejected with a 429. Share one between
+                             the clients using the same token. Unused with a
+                             `transport`.
+        :param retry_policy: How to retry requests failing with connection errors or
+                             5xx responses, or None to never retry them. By default,
+                             GET and DELETE requests are retried up to 3 times with
+                             backoff, and POST requests too as long as `request_id_fn`
+                             is set. Unused with a `transport`.
+        :param json_codec: JSON codec to encode requests and decode responses with, or
+                           the name of one ("orjson", "msgspec" or "json"). The default
+                           "auto" picks the fastest one installed. Unused with a
+                           `transport`.
+        :param timeout: Connect and read timeouts of each request in seconds, or one
+                        value for both. Use `deadline` to also bound whole calls.
+                        Unused with a `transport`.
+        :param compress_requests: Gzip request bodies of at least this many bytes, e.g.
+                                  tasks with long descriptions, or None to send them
+                                  as-is. Responses are always requested compressed.
+                                  Unused with a `transport`.
+        :param prefetch_pages: Number of pages of paginated results to fetch ahead,
+                               in the background, while the current one is consumed
+                               (see `ResultsPaginator`). 0 disables read-ahead.
+        :param bulk: Fetch paginated results in pages of the largest size allowed
+                     (`MAX_PAGE_SIZE`) unless a `limit` is given, for callers going
+                     through all of them, e.g. exports. See `requests_saved`.
         """
         self._token = token
         self._request_id_fn = request_id_fn
-        self._session = session or requests.Session()
-        self._finalizer = finalize(self, self._session.close)
+        self._prefetch_pages = prefetch_pages
+        self._bulk = bulk
+        self._requests_saved = 0
+        self._requests_saved_lock = threading.Lock()
+        if transport is None:
+            if isinstance(json_codec, str):
+                json_codec = get_codec(json_codec)
+            session = create_session(
+                session,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            transport = RequestsTransport(
+                session,
+                token,
+                timeout,
+                rate_limiter=rate_limiter,
+                retry_policy=retry_policy,
+                codec=json_codec,
+                compress_min_bytes=compress_requests,
+            )
+        self._transport = transport
+        self._finalizer = finalize(self, self._transport.close)
 
     def __enter__(self):
         """
@@ -112,9 +213,130 @@ class TodoistAPI:
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        """Exit the runtime context and closes the underlying requests session."""
+        """Exit the runtime context and closes the underlying transport."""
         self._finalizer()
 
+    def deadline(self, seconds: float | None) -> AbstractContextManager[None]:
+        """
+        Bound the total time of the calls made within a `with` block.
+
+        Covers every page and retry of those calls, and paginators created in the
+        block keep to the deadline after it. Once it has passed, requests raise
+        `DeadlineExceeded` (a `requests.exceptions.Timeout`) instead of being sent.
+
+        The deadline applies to every client used from the current thread (or
+        asyncio task), not only this one.
+
+        :param seconds: Time budget in seconds, or None for no deadline.
+        :return: A context manager.
+        """
+        return call_deadline(seconds)
+
+    def transport_stats(self, reset: bool = False) -> TransportStats | None:
+        """
+        Snapshot the sizes of the request and response bodies sent and received.
+
+        Shows how many bytes compression saved.
+
+        :param reset: Zero the counters once read.
+        :return: The statistics, or None if the transport doesn't keep any.
+        """
+        stats = getattr(self._transport, "stats", None)
+        return stats(reset) if stats is not None else None
+
+    @property
+    def requests_saved(self) -> int:
+        """
+        Estimate the number of requests bulk mode has saved so far.
+
+        Counts the extra pages that the results fetched would have taken at the
+        API's default page size (`DEFAULT_PAGE_SIZE`). Calls given an explicit
+        `limit` fetch pages of that size either way, so save nothing.
+        """
+        return self._requests_saved
+
+    def resume(self, checkpoint: PaginatorCheckpoint) -> ResultsPaginator:
+        """
+        Continue a paginated call from a checkpoint of its paginator.
+
+        E.g. to restart a long export where it stopped, save
+        `paginator.checkpoint()` as pages are processed, and pass the last one saved
+        (after a `json.dumps`/`json.loads` round trip if need be).
+
+        :param checkpoint: A checkpoint returned by `ResultsPaginator.checkpoint`.
+        :return: A paginator over the results not yet taken at the checkpoint.
+        """
+        return ResultsPaginator.from_checkpoint(
+            self._transport,
+            checkpoint,
+            self._request_id_fn,
+            prefetch=self._prefetch_pages,
+            # Bulk mode can't tell its own page size from an explicit limit of the
+            # same size, so counts those as saving requests too
+            on_page=(
+                self._count_bulk_page
+                if self._bulk and checkpoint["params"].get("limit") == MAX_PAGE_SIZE
+                else None
+            ),
+        )
+
+    def fan_out(
+        self,
+        method: Callable[..., Iterator[dict[str, Any]]],
+        queries: Iterable[dict[str, Any]],
+        *,
+        max_workers: int = 8,
+        tag: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Go through the results of a paginated call for many queries concurrently.
+
+        E.g. `api.fan_out(api.get_tasks, [{"project_id": id} for id in ids])` fetches
+        the tasks of every project, `max_workers` projects at a time. The results
+        are merged into one stream as their pages arrive: those of different queries
+        are interleaved, but those of each query stay in order.
+
+        Fetching stops when the iteration is stopped early or the iterator closed,
+        and keeps to a `deadline` in effect when this is called.
+
+        :param method: A paginated method of this client, e.g. `get_tasks`.
+        :param queries: The keyword arguments to call it with, one dict per query.
+        :param max_workers: Maximum number of queries fetched at once.
+        :param tag: Yield `(query, item)` pairs, telling which query each item
+                    came from, instead of the items alone.
+        :return: An iterator over the results of all queries.
+        :raises ValueError: If `max_workers` is less than 1.
+        :raises requests.exceptions.HTTPError: If an API request fails. The other
+                                               queries are stopped.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        return _fan_out(method, list(queries), max_workers, tag, current_deadline())
+
+    def _paginate(
+        self, endpoint: str, results_field: str, params: dict[str, Any]
+    ) -> ResultsPaginator:
+        """Create a paginator over the results of an endpoint."""
+        # An explicit limit is kept, so bulk mode saves no requests then
+        bulk = self._bulk and "limit" not in params
+        if bulk:
+            params = {"limit": MAX_PAGE_SIZE, **params}
+        return ResultsPaginator(
+            self._transport,
+            endpoint,
+            results_field,
+            self._request_id_fn,
+            params,
+            prefetch=self._prefetch_pages,
+            on_page=self._count_bulk_page if bulk else None,
+        )
+
+    def _count_bulk_page(self, size: int) -> None:
+        saved = max(1, -(-size // DEFAULT_PAGE_SIZE)) - 1
+        if saved:
+            with self._requests_saved_lock:
+                self._requests_saved += saved
+
     def get_task(self, task_id: str) -> dict[str, Any]:
         """
         Get a specific task by its ID.
@@ -125,10 +347,8 @@ class TodoistAPI:
         :raises TypeError: If the API response is not a valid Task dictionary.
         """
         endpoint = get_api_url(f"{TASKS_PATH}/{task_id}")
-        task_data: dict[str, Any] = get(
-            self._session,
+        task_data: dict[str, Any] = self._transport.get(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return task_data
@@ -176,14 +396,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def filter_tasks(
         self,
@@ -216,14 +429,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def add_task(  # noqa: PLR0912
         self,
@@ -314,10 +520,8 @@ class TodoistAPI:
         if deadline_lang is not None:
             data["deadline_lang"] = deadline_lang
 
-        task_data: dict[str, Any] = post(
-            self._session,
+        task_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -358,10 +562,8 @@ class TodoistAPI:
         if reminder is not None:
             data["reminder"] = reminder
 
-        task_data: dict[str, Any] = post(
-            self._session,
+        task_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -445,10 +647,8 @@ class TodoistAPI:
         if deadline_lang is not None:
             data["deadline_lang"] = deadline_lang
 
-        task_data: dict[str, Any] = post(
-            self._session,
+        task_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -467,10 +667,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{TASKS_PATH}/{task_id}/close")
-        return post(
-            self._session,
+        return self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -486,10 +684,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{TASKS_PATH}/{task_id}/reopen")
-        return post(
-            self._session,
+        return self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -530,10 +726,8 @@ class TodoistAPI:
         if parent_id is not None:
             data["parent_id"] = parent_id
         endpoint = get_api_url(f"{TASKS_PATH}/{task_id}/move")
-        return post(
-            self._session,
+        return self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -548,10 +742,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{TASKS_PATH}/{task_id}")
-        return delete(
-            self._session,
+        return self._transport.delete(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -612,14 +804,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "items",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "items", params)
 
     def get_completed_tasks_by_completion_date(
         self,
@@ -666,14 +851,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "items",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "items", params)
 
     def get_project(self, project_id: str) -> dict[str, Any]:
         """
@@ -685,10 +863,8 @@ class TodoistAPI:
         :raises TypeError: If the API response is not a valid Project dictionary.
         """
         endpoint = get_api_url(f"{PROJECTS_PATH}/{project_id}")
-        project_data: dict[str, Any] = get(
-            self._session,
+        project_data: dict[str, Any] = self._transport.get(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return project_data
@@ -713,14 +889,7 @@ class TodoistAPI:
         params: dict[str, Any] = {}
         if limit is not None:
             params["limit"] = limit
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def add_project(
         self,
@@ -759,10 +928,8 @@ class TodoistAPI:
         if view_style is not None:
             data["view_style"] = view_style
 
-        project_data: dict[str, Any] = post(
-            self._session,
+        project_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -807,10 +974,8 @@ class TodoistAPI:
         if view_style is not None:
             data["view_style"] = view_style
 
-        project_data: dict[str, Any] = post(
-            self._session,
+        project_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -831,10 +996,8 @@ class TodoistAPI:
         endpoint = get_api_url(
             f"{PROJECTS_PATH}/{project_id}/{PROJECT_ARCHIVE_PATH_SUFFIX}"
         )
-        project_data: dict[str, Any] = post(
-            self._session,
+        project_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return project_data
@@ -853,10 +1016,8 @@ class TodoistAPI:
         endpoint = get_api_url(
             f"{PROJECTS_PATH}/{project_id}/{PROJECT_UNARCHIVE_PATH_SUFFIX}"
         )
-        project_data: dict[str, Any] = post(
-            self._session,
+        project_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return project_data
@@ -873,10 +1034,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{PROJECTS_PATH}/{project_id}")
-        return delete(
-            self._session,
+        return self._transport.delete(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -902,14 +1061,7 @@ class TodoistAPI:
         params: dict[str, Any] = {}
         if limit is not None:
             params["limit"] = limit
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def get_section(self, section_id: str) -> dict[str, Any]:
         """
@@ -921,10 +1073,8 @@ class TodoistAPI:
         :raises TypeError: If the API response is not a valid Section dictionary.
         """
         endpoint = get_api_url(f"{SECTIONS_PATH}/{section_id}")
-        section_data: dict[str, Any] = get(
-            self._session,
+        section_data: dict[str, Any] = self._transport.get(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return section_data
@@ -958,14 +1108,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def add_section(
         self,
@@ -990,10 +1133,8 @@ class TodoistAPI:
         if order is not None:
             data["order"] = order
 
-        section_data: dict[str, Any] = post(
-            self._session,
+        section_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -1015,10 +1156,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{SECTIONS_PATH}/{section_id}")
-        section_data: dict[str, Any] = post(
-            self._session,
+        section_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data={"name": name},
         )
@@ -1036,10 +1175,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{SECTIONS_PATH}/{section_id}")
-        return delete(
-            self._session,
+        return self._transport.delete(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -1053,10 +1190,8 @@ class TodoistAPI:
         :raises TypeError: If the API response is not a valid Comment dictionary.
         """
         endpoint = get_api_url(f"{COMMENTS_PATH}/{comment_id}")
-        comment_data: dict[str, Any] = get(
-            self._session,
+        comment_data: dict[str, Any] = self._transport.get(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return comment_data
@@ -1098,14 +1233,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def add_comment(
         self,
@@ -1147,10 +1275,8 @@ class TodoistAPI:
         if uids_to_notify is not None:
             data["uids_to_notify"] = uids_to_notify
 
-        comment_data: dict[str, Any] = post(
-            self._session,
+        comment_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -1170,10 +1296,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{COMMENTS_PATH}/{comment_id}")
-        comment_data: dict[str, Any] = post(
-            self._session,
+        comment_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data={"content": content},
         )
@@ -1189,10 +1313,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{COMMENTS_PATH}/{comment_id}")
-        return delete(
-            self._session,
+        return self._transport.delete(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -1206,10 +1328,8 @@ class TodoistAPI:
         :raises TypeError: If the API response is not a valid Label dictionary.
         """
         endpoint = get_api_url(f"{LABELS_PATH}/{label_id}")
-        label_data: dict[str, Any] = get(
-            self._session,
+        label_data: dict[str, Any] = self._transport.get(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
         return label_data
@@ -1239,14 +1359,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def add_label(
         self,
@@ -1278,10 +1391,8 @@ class TodoistAPI:
         if is_favorite is not None:
             data["is_favorite"] = is_favorite
 
-        label_data: dict[str, Any] = post(
-            self._session,
+        label_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -1321,10 +1432,8 @@ class TodoistAPI:
         if is_favorite is not None:
             data["is_favorite"] = is_favorite
 
-        label_data: dict[str, Any] = post(
-            self._session,
+        label_data: dict[str, Any] = self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
@@ -1342,10 +1451,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(f"{LABELS_PATH}/{label_id}")
-        return delete(
-            self._session,
+        return self._transport.delete(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
         )
 
@@ -1378,14 +1485,7 @@ class TodoistAPI:
         if limit is not None:
             params["limit"] = limit
 
-        return ResultsPaginator(
-            self._session,
-            endpoint,
-            "results",
-            self._token,
-            self._request_id_fn,
-            params,
-        )
+        return self._paginate(endpoint, "results", params)
 
     def rename_shared_label(
         self,
@@ -1402,10 +1502,8 @@ class TodoistAPI:
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
         endpoint = get_api_url(SHARED_LABELS_RENAME_PATH)
-        return post(
-            self._session,
+        return self._transport.post(
             endpoint,
-            self._token,
             params={"name": name},
             data={"new_name": new_name},
         )
@@ -1422,14 +1520,25 @@ class TodoistAPI:
         """
         endpoint = get_api_url(SHARED_LABELS_REMOVE_PATH)
         data = {"name": name}
-        return post(
-            self._session,
+        return self._transport.post(
             endpoint,
-            self._token,
             self._request_id_fn() if self._request_id_fn else None,
             data=data,
         )
 
+
+class PaginatorCheckpoint(TypedDict):
+    """Serializable position of a `ResultsPaginator`, to resume it from."""
+
+    url: str
+    results_field: str
+    params: dict[str, Any]
+    # Cursor of the page to continue from: empty for the first page, None when done
+    cursor: str | None
+    # Number of items to drop from that page, already taken before the checkpoint
+    skip: int
+
+
 class ResultsPaginator(Iterator[dict[str, Any]]):
     """
     Iterator for paginated results from the Todoist API.
@@ -1437,41 +1546,153 @@ class ResultsPaginator(Iterator[dict[str, Any]]):
     It encapsulates the logic for fetching and iterating through paginated results
     from Todoist API endpoints. It handles cursor-based pagination automatically,
     requesting new pages as needed when iterating.
+
+    A paginator created within a `deadline` block keeps to that deadline for all of
+    its pages, even when iterated outside the block.
+
+    With `prefetch`, upcoming pages are fetched on a background thread while the
+    current one is being consumed, so network latency overlaps with processing.
+
+    Long iterations can be resumed after a failure or restart: save `checkpoint()`
+    as they progress, and continue with `from_checkpoint` (or `TodoistAPI.resume`).
     """
 
-    _session: requests.Session
+    _transport: Transport
     _url: str
     _results_field: str
-    _token: str
     _cursor: str | None
+    _skip: int
+    _page_cursor: str | None
+    _page_offset: int
+    _page_size: int
+    _queue: deque[dict[str, Any]]
+    _prefetcher: _Prefetcher | None
+    _on_page: Callable[[int], None] | None
+    deadline: float | None
+    prefetch: int
 
     def __init__(
         self,
-        session: requests.Session,
+        transport: Transport,
         url: str,
         results_field: str,
-        token: str,
         request_id_fn: Callable[[], str] | None,
         params: dict[str, Any],
+        *,
+        prefetch: int = 0,
+        on_page: Callable[[int], None] | None = None,
     ) -> None:
         """
         Initialize the ResultsPaginator.
 
-        :param session: The requests Session to use for API calls.
+        :param transport: The transport to send API requests through.
         :param url: The API endpoint URL to fetch results from.
         :param results_field: The key in the API response that contains the results.
-        :param results_inst: A callable that converts result items to objects of type T.
-        :param token: The authentication token for the Todoist API.
+        :param request_id_fn: Generator of request IDs for the `X-Request-ID` header.
         :param params: Query parameters to include in API requests.
+        :param prefetch: Number of pages to fetch ahead of the one being consumed, in
+                         the background. At most this many pages are held ahead, so
+                         memory stays bounded. 0 fetches pages only when needed.
+        :param on_page: Called with the number of items of every page fetched.
         """
-        self._session = session
+        self._transport = transport
         self._url = url
         self._results_field = results_field
-        self._token = token
         self._request_id_fn = request_id_fn
         self._params = params
         self._cursor = ""  # empty string for first page
-        self._queue = []
+        self._skip = 0  # items to drop from the next page, when resuming mid-page
+        # Where the page being consumed starts, for checkpoints
+        self._page_cursor = ""
+        self._page_offset = 0
+        self._page_size = 0
+        self._queue = deque()
+        self._prefetcher = None
+        self.deadline = current_deadline()
+        self.prefetch = prefetch
+        self._on_page = on_page
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        transport: Transport,
+        checkpoint: PaginatorCheckpoint,
+        request_id_fn: Callable[[], str] | None = None,
+        *,
+        prefetch: int = 0,
+        on_page: Callable[[int], None] | None = None,
+    ) -> ResultsPaginator:
+        """
+        Create a paginator continuing from a checkpoint of another.
+
+        :param transport: The transport to send API requests through.
+        :param checkpoint: A checkpoint returned by `checkpoint`.
+        :param request_id_fn: Generator of request IDs for the `X-Request-ID` header.
+        :param prefetch: Number of pages to fetch ahead in the background.
+        :param on_page: Called with the number of items of every page fetched.
+        :return: A paginator yielding the items the checkpointed one had yet to.
+        """
+        paginator = cls(
+            transport,
+            checkpoint["url"],
+            checkpoint["results_field"],
+            request_id_fn,
+            dict(checkpoint["params"]),
+            prefetch=prefetch,
+            on_page=on_page,
+        )
+        paginator._cursor = checkpoint["cursor"]
+        paginator._skip = checkpoint["skip"]
+        return paginator
+
+    def checkpoint(self) -> PaginatorCheckpoint:
+        """
+        Capture the position of the iteration, to resume it later.
+
+        The checkpoint is a JSON-serializable dict. Resuming from it yields exactly
+        the items not yet taken from this paginator, even mid-page.
+
+        :return: The endpoint, parameters and position of the iteration.
+        """
+        if self._queue:
+            # Restart from the current page, skipping the items already taken
+            taken = self._page_size - len(self._queue)
+            cursor, skip = self._page_cursor, self._page_offset + taken
+        else:
+            cursor, skip = self._cursor, self._skip
+        return {
+            "url": self._url,
+            "results_field": self._results_field,
+            "params": dict(self._params),
+            "cursor": cursor,
+            "skip": skip,
+        }
+
+    @property
+    def cursor(self) -> str | None:
+        """
+        Cursor of the next page to fetch.
+
+        Empty before the first page is fetched, and None once the last one has been.
+        """
+        return self._cursor
+
+    def skip_to(self, cursor: str) -> None:
+        """
+        Continue from the page a cursor points at, dropping any items left over.
+
+        :param cursor: A cursor previously read from `cursor`.
+        """
+        self.close()
+        self._cursor = cursor
+        self._skip = 0
+        self._queue.clear()
+
+    def close(self) -> None:
+        """Stop fetching pages in the background, if prefetching."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
 
     def __next__(self) -> dict[str, Any]:
         """
@@ -1484,28 +1705,276 @@ class ResultsPaginator(Iterator[dict[str, Any]]):
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response structure is unexpected.
         """
-        # Fetch new page if queue is empty
-        if not self._queue:
-            if self._cursor is None:
-                raise StopIteration
+        # Fetch new pages until there is an item to return
+        while not self._queue:
+            self._queue.extend(self._fetch_page())
+
+        # Return next item from queue
+        return self._queue.popleft()
+
+    def next_page(self) -> list[dict[str, Any]]:
+        """
+        Return the items left over from the current page, or else fetch the next page.
+
+        :return: A list of result items.
+        :raises StopIteration: When there are no more results.
+        :raises requests.exceptions.HTTPError: If the API request fails.
+        :raises TypeError: If the API response structure is unexpected.
+        """
+        if self._queue:
+            page = list(self._queue)
+            self._queue.clear()
+            return page
+        return self._fetch_page()
+
+    def iter_pages(self) -> Iterator[list[dict[str, Any]]]:
+        """
+        Iterate over the remaining results a page at a time.
+
+        Saves the per-item overhead of iterating over the paginator itself, for
+        consumers processing results in batches. Items already taken from the
+        current page are not repeated.
+
+        :return: An iterator over lists of result items.
+        :raises requests.exceptions.HTTPError: If an API request fails.
+        :raises TypeError: If the API response structure is unexpected.
+        """
+        # next_page() never returns None, and its StopIteration ends the iteration
+        yield from iter(self.next_page, None)
+
+    def page_request(self) -> Request | None:
+        """
+        Describe the request for the next page, without sending it.
+
+        Together with `read_page`, lets pages be fetched by other means,
+        e.g. asynchronously.
+
+        :return: The request, or None once the last page has been fetched.
+        """
+        if self._cursor is None:
+            return None
+        return _page_request(self._url, self._params, self._request_id_fn, self._cursor)
+
+    def read_page(self, data: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Move past a page, given the response to `page_request`.
+
+        :return: The items of the page.
+        """
+        return self._advance(data.get(self._results_field, []), data.get("next_cursor"))
 
-            params = self._params.copy()
-            if self._cursor != "":
-                params["cursor"] = self._cursor
+    def _advance(
+        self, items: list[dict[str, Any]], next_cursor: str | None
+    ) -> list[dict[str, Any]]:
+        if self._on_page is not None:
+            self._on_page(len(items))
+        self._page_cursor, self._page_offset = self._cursor, self._skip
+        if self._skip:
+            items = items[self._skip :]
+            self._skip = 0
+        self._page_size = len(items)
+        self._cursor = next_cursor
+        return items
 
-            data: dict[str, Any] = get(
-                self._session,
+    def _fetch_page(self) -> list[dict[str, Any]]:
+        if self._cursor is None:
+            raise StopIteration
+
+        if self.prefetch > 0:
+            page = self._take_prefetched()
+        else:
+            request = _page_request(
+                self._url, self._params, self._request_id_fn, self._cursor
+            )
+            page = self.read_page(_get_page(self._transport, self.deadline, request))
+
+        # If no results and no next cursor, we're done
+        if not page and self._cursor is None:
+            raise StopIteration
+
+        return page
+
+    def _take_prefetched(self) -> list[dict[str, Any]]:
+        if self._prefetcher is None:
+            fetch = partial(
+                _fetch_page_at,
+                self._transport,
+                self.deadline,
                 self._url,
-                self._token,
-                self._request_id_fn() if self._request_id_fn else None,
-                params,
+                self._results_field,
+                self._params,
+                self._request_id_fn,
             )
-            self._cursor = data.get("next_cursor")
-            self._queue: list[Any] = data.get(self._results_field, [])
+            self._prefetcher = _Prefetcher(
+                fetch, cast("str", self._cursor), self.prefetch
+            )
+            # Stop the background thread once the paginator is dropped half-way
+            finalize(self, self._prefetcher.close)
+        try:
+            page, next_cursor = self._prefetcher.take()
+        except BaseException:
+            # Start over from the current cursor if iterated again
+            self.close()
+            raise
+        return self._advance(page, next_cursor)
+
+
+def _page_request(
+    url: str,
+    params: dict[str, Any],
+    request_id_fn: Callable[[], str] | None,
+    cursor: str,
+) -> Request:
+    page_params = params.copy()
+    if cursor != "":  # empty string for first page
+        page_params["cursor"] = cursor
+    return Request("GET", url, request_id_fn() if request_id_fn else None, page_params)
+
+
+def _get_page(
+    transport: Transport, deadline: float | None, request: Request
+) -> dict[str, Any]:
+    with use_deadline(deadline):
+        return transport.get(request.url, request.request_id, request.params)
+
+
+def _fetch_page_at(
+    transport: Transport,
+    deadline: float | None,
+    url: str,
+    results_field: str,
+    params: dict[str, Any],
+    request_id_fn: Callable[[], str] | None,
+    cursor: str,
+) -> tuple[list[dict[str, Any]], str | None]:
+    request = _page_request(url, params, request_id_fn, cursor)
+    data = _get_page(transport, deadline, request)
+    return data.get(results_field, []), data.get("next_cursor")
+
+
+class _Prefetcher:
+    """Fetches the pages of a paginator ahead of its consumer on a background thread."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], tuple[list[dict[str, Any]], str | None]],
+        cursor: str,
+        depth: int,
+    ) -> None:
+        """
+        Start fetching pages.
 
-            # If no results and no next cursor, we're done
-            if not self._queue and self._cursor is None:
-                raise StopIteration
+        :param fetch: Fetches the page at a cursor, returning its items and the
+                      cursor of the next page. Must not reference the paginator,
+                      so it can be garbage collected while the thread runs.
+        :param cursor: Cursor of the first page to fetch.
+        :param depth: Maximum number of pages fetched but not yet taken.
+        """
+        self._pages: queue.SimpleQueue[
+            tuple[list[dict[str, Any]], str | None, BaseException | None]
+        ] = queue.SimpleQueue()
+        self._slots = threading.Semaphore(depth)
+        self._stopped = threading.Event()
+        threading.Thread(
+            target=self._run, args=(fetch, cursor), name="todoist-prefetch", daemon=True
+        ).start()
 
-        # Return next item from queue
-        return self._queue.pop(0)
+    def take(self) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Wait for the next page.
+
+        :return: Its items, and the cursor of the page after it.
+        :raises Exception: Whatever fetching the page raised.
+        """
+        page, cursor, error = self._pages.get()
+        self._slots.release()
+        if error is not None:
+            raise error
+        return page, cursor
+
+    def close(self) -> None:
+        """Stop fetching pages. A request already in flight is left to complete."""
+        self._stopped.set()
+        self._slots.release()  # wake the thread up if it is waiting for a slot
+
+    def _run(
+        self,
+        fetch: Callable[[str], tuple[list[dict[str, Any]], str | None]],
+        cursor: str | None,
+    ) -> None:
+        while cursor is not None:
+            self._slots.acquire()
+            if self._stopped.is_set():
+                return
+            try:
+                page, cursor = fetch(cursor)
+            except BaseException as error:  # noqa: BLE001
+                self._pages.put(([], None, error))
+                return
+            self._pages.put((page, cursor, None))
+
+
+def _fan_out(
+    method: Callable[..., Iterable[dict[str, Any]]],
+    queries: list[dict[str, Any]],
+    max_workers: int,
+    tag: bool,
+    deadline: float | None,
+) -> Iterator[Any]:
+    """Drain the paginated call for each query on a pool of threads."""
+    # A page of results, None once the query is done, or the error it raised
+    pages: queue.SimpleQueue[
+        tuple[dict[str, Any], list[dict[str, Any]] | None, BaseException | None]
+    ] = queue.SimpleQueue()
+    # Bounds the pages fetched but not yet consumed, holding back the workers
+    slots = threading.Semaphore(2 * max_workers)
+    stopped = threading.Event()
+
+    def drain(query: dict[str, Any]) -> None:
+        try:
+            with use_deadline(deadline):
+                results = method(**query)
+                # Cached methods may return all results at once rather than a paginator
+                page_iter = (
+                    results.iter_pages()
+                    if isinstance(results, ResultsPaginator)
+                    else iter([list(results)])
+                )
+                try:
+                    while True:
+                        slots.acquire()
+                        if stopped.is_set():
+                            return
+                        page = next(page_iter, None)
+                        if page is None:
+                            slots.release()
+                            break
+                        pages.put((query, page, None))
+                finally:
+                    if isinstance(results, ResultsPaginator):
+                        results.close()
+        except BaseException as error:  # noqa: BLE001
+            pages.put((query, None, error))
+            return
+        pages.put((query, None, None))
+
+    executor = ThreadPoolExecutor(max_workers, thread_name_prefix="todoist-fan-out")
+    try:
+        for query in queries:
+            executor.submit(drain, query)
+        remaining = len(queries)
+        while remaining:
+            query, page, error = pages.get()
+            if error is not None:
+                raise error
+            if page is None:
+                remaining -= 1
+                continue
+            slots.release()
+            for item in page:
+                yield (query, item) if tag else item
+    finally:
+        stopped.set()
+        for _ in range(max_workers):
+            slots.release()  # wake up the workers waiting for a slot
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import sys
-from typing import TYPE_CHECKING, Annotated, Callable, Literal, TypeVar
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Literal, TypeVar, cast
 
 from annotated_types import Ge, Le, MaxLen, MinLen
 
+from todoist_api_python._core.deadline import use_deadline
+from todoist_api_python._core.http_requests import TIMEOUT, RequestBuilder
+from todoist_api_python._core.retry import DEFAULT_RETRY_POLICY
 from todoist_api_python._core.utils import (
     default_request_id_fn,
     generate_async,
@@ -13,12 +17,23 @@ from todoist_api_python._core.utils import (
 from todoist_api_python.api import TodoistAPI
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Awaitable, Iterable, Iterator
+    from contextlib import AbstractContextManager
     from datetime import date, datetime
     from types import TracebackType
 
     import requests
 
+    from todoist_api_python._core.http_requests import (
+        AsyncTransport,
+        Request,
+        Transport,
+        TransportStats,
+    )
+    from todoist_api_python._core.json_codec import JSONCodec
+    from todoist_api_python._core.rate_limit import RateLimiter
+    from todoist_api_python._core.retry import RetryPolicy
+    from todoist_api_python.api import PaginatorCheckpoint, ResultsPaginator
     from todoist_api_python.models import (
         Attachment,
         Collaborator,
@@ -40,6 +55,8 @@ if sys.version_info >= (3, 11):
 else:
     Self = TypeVar("Self", bound="TodoistAPIAsync")
 
+T = TypeVar("T")
+
 
 class TodoistAPIAsync:
     """
@@ -57,14 +74,78 @@ class TodoistAPIAsync:
         token: str,
         request_id_fn: Callable[[], str] | None = default_request_id_fn,
         session: requests.Session | None = None,
+        *,
+        transport: Transport | None = None,
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        pool_block: bool | None = None,
+        async_transport: AsyncTransport | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = DEFAULT_RETRY_POLICY,
+        json_codec: JSONCodec | str = "auto",
+        timeout: float | tuple[float, float] = TIMEOUT,
+        compress_requests: int | None = None,
+        prefetch_pages: int = 0,
+        bulk: bool = False,
     ) -> None:
         """
         Initialize the TodoistAPIAsync client.
 
+        By default, each call runs the sync client on the event loop's default thread
+        pool, which caps how many requests can be in flight. With an `async_transport`
+        (e.g. `HttpxAsyncTransport(token)`), requests are sent natively from the event
+        loop instead, and the session, transport and pool options are unused.
+
         :param token: Authentication token for the Todoist API.
         :param session: An optional pre-configured requests `Session` object.
-        """
-        self._api = TodoistAPI(token, request_id_fn, session)
+        :param transport: An optional transport to send requests through instead.
+        :param pool_connections: Number of per-host connection pools to keep.
+        :param pool_maxsize: Maximum number of connections kept alive per host.
+                             Set it to at least the number of concurrent calls.
+        :param pool_block: Wait for a free connection once `pool_maxsize` are in use.
+        :param async_transport: An optional non-blocking transport to send requests
+                                through. It must authenticate requests with `token`.
+        :param rate_limiter: Paces requests and retries those rejected with a 429.
+                             With an `async_transport`, pass it to the transport instead
+                             (e.g. `HttpxAsyncTransport(token, rate_limiter=...)`).
+        :param retry_policy: How to retry requests failing transiently, or None to
+                             never retry them. With an `async_transport`, pass it to
+                             the transport instead.
+        :param json_codec: JSON codec to use, or the name of one (see `TodoistAPI`).
+                           With an `async_transport`, pass it to the transport instead.
+        :param timeout: Connect and read timeouts of each request in seconds. With an
+                        `async_transport`, pass it to the transport instead.
+        :param compress_requests: Gzip request bodies of at least this many bytes (see
+                                  `TodoistAPI`). With an `async_transport`, pass it to
+                                  the transport as `compress_min_bytes` instead.
+        :param prefetch_pages: Number of pages of paginated results to fetch ahead in
+                               the background (see `TodoistAPI`). Unused with an
+                               `async_transport`.
+        :param bulk: Fetch paginated results in pages of the largest size allowed
+                     unless a `limit` is given (see `TodoistAPI`).
+        """
+        self._async_transport = async_transport
+        if async_transport is not None:
+            # Only used to build requests, which the async transport then sends: the
+            # sync client's calls then return a `Request` in place of their result,
+            # which `_run` hands to the async transport
+            transport = cast("Transport", RequestBuilder())
+        self._api = TodoistAPI(
+            token,
+            request_id_fn,
+            session,
+            transport=transport,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            json_codec=json_codec,
+            timeout=timeout,
+            compress_requests=compress_requests,
+            prefetch_pages=prefetch_pages,
+            bulk=bulk,
+        )
 
     async def __aenter__(self) -> Self:
         """
@@ -77,13 +158,146 @@ class TodoistAPIAsync:
         """
         return self
 
-    def __aexit__(
+    async def __aexit__(
         self,
         exc_type: type[BaseException] | None,
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        """Exit the async runtime context and closes the underlying requests session."""
+        """Exit the async runtime context and closes the underlying transport."""
+        self._api.__exit__(exc_type, exc_value, traceback)
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+
+    def deadline(self, seconds: float | None) -> AbstractContextManager[None]:
+        """
+        Bound the total time of the calls awaited within a `with` block.
+
+        See `TodoistAPI.deadline`.
+
+        :param seconds: Time budget in seconds, or None for no deadline.
+        :return: A context manager.
+        """
+        return self._api.deadline(seconds)
+
+    def transport_stats(self, reset: bool = False) -> TransportStats | None:
+        """
+        Snapshot the sizes of the request and response bodies sent and received.
+
+        :param reset: Zero the counters once read.
+        :return: The statistics, or None if the transport doesn't keep any.
+        """
+        transport = self._async_transport or self._api._transport
+        stats = getattr(transport, "stats", None)
+        return stats(reset) if stats is not None else None
+
+    async def _run(self, func: Callable[[], T]) -> T:
+        """Run a call of the sync client, or send the request it builds natively."""
+        if self._async_transport is None:
+            return await run_async(func)
+        return cast("T", await self._async_transport.send(cast("Request", func())))
+
+    @property
+    def requests_saved(self) -> int:
+        """Estimate the number of requests bulk mode has saved so far."""
+        return self._api.requests_saved
+
+    async def resume(self, checkpoint: PaginatorCheckpoint) -> AsyncGenerator[Any]:
+        """
+        Continue a paginated call from a checkpoint of its paginator.
+
+        See `TodoistAPI.resume`.
+
+        :param checkpoint: A checkpoint returned by `ResultsPaginator.checkpoint`.
+        :return: An async generator over the results not yet taken at the checkpoint.
+        """
+        return self._generate(self._api.resume(checkpoint))
+
+    async def fan_out(
+        self,
+        method: Callable[..., Awaitable[AsyncGenerator[Any]]],
+        queries: Iterable[dict[str, Any]],
+        *,
+        max_workers: int = 8,
+        tag: bool = False,
+    ) -> AsyncGenerator[Any]:
+        """
+        Go through the results of a paginated call for many queries concurrently.
+
+        See `TodoistAPI.fan_out`; here each query is drained by an asyncio task.
+
+        :param method: A paginated method of this client, e.g. `get_tasks`.
+        :param queries: The keyword arguments to call it with, one dict per query.
+        :param max_workers: Maximum number of queries fetched at once.
+        :param tag: Yield `(query, item)` pairs instead of the items alone.
+        :return: An async generator over the results of all queries.
+        :raises ValueError: If `max_workers` is less than 1.
+        :raises requests.exceptions.HTTPError: If an API request fails. The other
+                                               queries are stopped.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        return self._fan_out(method, list(queries), max_workers, tag)
+
+    @staticmethod
+    async def _fan_out(
+        method: Callable[..., Awaitable[AsyncGenerator[Any]]],
+        queries: list[dict[str, Any]],
+        max_workers: int,
+        tag: bool,
+    ) -> AsyncGenerator[Any]:
+        done = object()
+        # An item, `done` once the query is done, or the error it raised
+        items: asyncio.Queue[tuple[dict[str, Any], Any, BaseException | None]] = (
+            asyncio.Queue(maxsize=2 * max_workers)
+        )
+        workers = asyncio.Semaphore(max_workers)
+
+        async def drain(query: dict[str, Any]) -> None:
+            async with workers:
+                try:
+                    async for item in await method(**query):
+                        await items.put((query, item, None))
+                except Exception as error:  # noqa: BLE001
+                    await items.put((query, done, error))
+                    return
+            await items.put((query, done, None))
+
+        tasks = [asyncio.ensure_future(drain(query)) for query in queries]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                query, item, error = await items.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield (query, item) if tag else item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _generate(self, paginator: Iterator[dict[str, Any]]) -> AsyncGenerator[Any]:
+        """Iterate over a paginator of the sync client, natively if possible."""
+        if self._async_transport is None:
+            return generate_async(paginator)
+        # The sync client's paginated methods all return a `ResultsPaginator`
+        return self._paginate(
+            self._async_transport, cast("ResultsPaginator", paginator)
+        )
+
+    @staticmethod
+    async def _paginate(
+        async_transport: AsyncTransport, paginator: ResultsPaginator
+    ) -> AsyncGenerator[Any]:
+        request = paginator.page_request()
+        while request is not None:
+            with use_deadline(paginator.deadline):
+                data: dict[str, Any] = await async_transport.send(request)
+            for item in paginator.read_page(data):
+                yield item
+            request = paginator.page_request()
 
     async def get_task(self, task_id: str) -> Task:
         """
@@ -94,7 +308,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Task dictionary.
         """
-        return await run_async(lambda: self._api.get_task(task_id))
+        return await self._run(lambda: self._api.get_task(task_id))
 
     async def get_tasks(
         self,
@@ -128,7 +342,7 @@ class TodoistAPIAsync:
             limit=limit,
         )
 
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def filter_tasks(
         self,
@@ -156,7 +370,7 @@ class TodoistAPIAsync:
             lang=lang,
             limit=limit,
         )
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def add_task(
         self,
@@ -207,7 +421,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Task dictionary.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.add_task(
                 content,
                 description=description,
@@ -253,7 +467,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response cannot be parsed into a QuickAddResult.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.add_task_quick(
                 text, note=note, reminder=reminder, auto_reminder=auto_reminder
             )
@@ -303,7 +517,7 @@ class TodoistAPIAsync:
         :return: the updated Task.
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.update_task(
                 task_id,
                 content=content,
@@ -336,7 +550,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.complete_task(task_id))
+        return await self._run(lambda: self._api.complete_task(task_id))
 
     async def uncomplete_task(self, task_id: str) -> bool:
         """
@@ -349,7 +563,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.uncomplete_task(task_id))
+        return await self._run(lambda: self._api.uncomplete_task(task_id))
 
     async def move_task(
         self,
@@ -375,7 +589,7 @@ class TodoistAPIAsync:
         :raises ValueError: If neither `project_id`, `section_id`,
                 nor `parent_id` is provided.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.move_task(
                 task_id,
                 project_id=project_id,
@@ -393,7 +607,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.delete_task(task_id))
+        return await self._run(lambda: self._api.delete_task(task_id))
 
     async def get_completed_tasks_by_due_date(
         self,
@@ -442,7 +656,7 @@ class TodoistAPIAsync:
             filter_lang=filter_lang,
             limit=limit,
         )
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def get_completed_tasks_by_completion_date(
         self,
@@ -482,7 +696,7 @@ class TodoistAPIAsync:
             filter_lang=filter_lang,
             limit=limit,
         )
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def get_project(self, project_id: str) -> Project:
         """
@@ -493,7 +707,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Project dictionary.
         """
-        return await run_async(lambda: self._api.get_project(project_id))
+        return await self._run(lambda: self._api.get_project(project_id))
 
     async def get_projects(
         self,
@@ -508,7 +722,7 @@ class TodoistAPIAsync:
         :raises TypeError: If the API response structure is unexpected.
         """
         paginator = self._api.get_projects(limit=limit)
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def add_project(
         self,
@@ -533,7 +747,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Project dictionary.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.add_project(
                 name,
                 description=description,
@@ -568,7 +782,7 @@ class TodoistAPIAsync:
         :return: the updated Project.
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.update_project(
                 project_id,
                 name=name,
@@ -591,7 +805,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Project dictionary.
         """
-        return await run_async(lambda: self._api.archive_project(project_id))
+        return await self._run(lambda: self._api.archive_project(project_id))
 
     async def unarchive_project(self, project_id: str) -> Project:
         """
@@ -604,7 +818,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Project dictionary.
         """
-        return await run_async(lambda: self._api.unarchive_project(project_id))
+        return await self._run(lambda: self._api.unarchive_project(project_id))
 
     async def delete_project(self, project_id: str) -> bool:
         """
@@ -617,7 +831,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.delete_project(project_id))
+        return await self._run(lambda: self._api.delete_project(project_id))
 
     async def get_collaborators(
         self,
@@ -634,7 +848,7 @@ class TodoistAPIAsync:
         :raises TypeError: If the API response structure is unexpected.
         """
         paginator = self._api.get_collaborators(project_id, limit=limit)
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def get_section(self, section_id: str) -> Section:
         """
@@ -645,7 +859,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Section dictionary.
         """
-        return await run_async(lambda: self._api.get_section(section_id))
+        return await self._run(lambda: self._api.get_section(section_id))
 
     async def get_sections(
         self,
@@ -665,7 +879,7 @@ class TodoistAPIAsync:
         :raises TypeError: If the API response structure is unexpected.
         """
         paginator = self._api.get_sections(project_id=project_id, limit=limit)
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def add_section(
         self,
@@ -684,7 +898,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Section dictionary.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.add_section(name, project_id, order=order)
         )
 
@@ -703,7 +917,7 @@ class TodoistAPIAsync:
         :return: the updated Section.
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.update_section(section_id, name))
+        return await self._run(lambda: self._api.update_section(section_id, name))
 
     async def delete_section(self, section_id: str) -> bool:
         """
@@ -716,7 +930,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.delete_section(section_id))
+        return await self._run(lambda: self._api.delete_section(section_id))
 
     async def get_comment(self, comment_id: str) -> Comment:
         """
@@ -727,7 +941,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Comment dictionary.
         """
-        return await run_async(lambda: self._api.get_comment(comment_id))
+        return await self._run(lambda: self._api.get_comment(comment_id))
 
     async def get_comments(
         self,
@@ -752,7 +966,7 @@ class TodoistAPIAsync:
         paginator = self._api.get_comments(
             project_id=project_id, task_id=task_id, limit=limit
         )
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def add_comment(
         self,
@@ -779,7 +993,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Comment dictionary.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.add_comment(
                 content,
                 project_id=project_id,
@@ -802,7 +1016,7 @@ class TodoistAPIAsync:
         :return: the updated Comment.
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.update_comment(comment_id, content))
+        return await self._run(lambda: self._api.update_comment(comment_id, content))
 
     async def delete_comment(self, comment_id: str) -> bool:
         """
@@ -813,7 +1027,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.delete_comment(comment_id))
+        return await self._run(lambda: self._api.delete_comment(comment_id))
 
     async def get_label(self, label_id: str) -> Label:
         """
@@ -824,7 +1038,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Label dictionary.
         """
-        return await run_async(lambda: self._api.get_label(label_id))
+        return await self._run(lambda: self._api.get_label(label_id))
 
     async def get_labels(
         self,
@@ -842,7 +1056,7 @@ class TodoistAPIAsync:
         :raises TypeError: If the API response structure is unexpected.
         """
         paginator = self._api.get_labels(limit=limit)
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def add_label(
         self,
@@ -863,7 +1077,7 @@ class TodoistAPIAsync:
         :raises requests.exceptions.HTTPError: If the API request fails.
         :raises TypeError: If the API response is not a valid Label dictionary.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.add_label(
                 name, color=color, item_order=item_order, is_favorite=is_favorite
             )
@@ -891,7 +1105,7 @@ class TodoistAPIAsync:
         :return: the updated Label.
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(
+        return await self._run(
             lambda: self._api.update_label(
                 label_id,
                 name=name,
@@ -912,7 +1126,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.delete_label(label_id))
+        return await self._run(lambda: self._api.delete_label(label_id))
 
     async def get_shared_labels(
         self,
@@ -936,7 +1150,7 @@ class TodoistAPIAsync:
         paginator = self._api.get_shared_labels(
             omit_personal=omit_personal, limit=limit
         )
-        return generate_async(paginator)
+        return self._generate(paginator)
 
     async def rename_shared_label(
         self,
@@ -952,7 +1166,7 @@ class TodoistAPIAsync:
                  False otherwise (possibly raise `HTTPError` instead).
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.rename_shared_label(name, new_name))
+        return await self._run(lambda: self._api.rename_shared_label(name, new_name))
 
     async def remove_shared_label(self, name: Annotated[str, MaxLen(60)]) -> bool:
         """
@@ -964,4 +1178,4 @@ class TodoistAPIAsync:
         :return: True if the removal was successful,
         :raises requests.exceptions.HTTPError: If the API request fails.
         """
-        return await run_async(lambda: self._api.remove_shared_label(name))
+        return await self._run(lambda: self._api.remove_shared_label(name))
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Literal
+from functools import cache
+from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import urlencode
 
-import requests
-from requests import Session
-
 from todoist_api_python._core.endpoints import (
     ACCESS_TOKEN_PATH,
     ACCESS_TOKENS_PATH,
@@ -13,10 +11,13 @@ from todoist_api_python._core.endpoints import (
     get_api_url,
     get_oauth_url,
 )
-from todoist_api_python._core.http_requests import delete, post
+from todoist_api_python._core.http_requests import create_session, delete, post
 from todoist_api_python._core.utils import run_async
 from todoist_api_python.models import AuthResult
 
+if TYPE_CHECKING:
+    from requests import Session
+
 """
 Possible permission scopes:
 
@@ -37,6 +38,16 @@ Scope = Literal[
 ]
 
 
+@cache
+def _shared_session() -> Session:
+    """
+    Session the helpers share when none is given, so their calls reuse connections.
+
+    It is separate from any client's session; pass one in to share its pool.
+    """
+    return create_session()
+
+
 def get_authentication_url(client_id: str, scopes: list[Scope], state: str) -> str:
     """Get authorization URL to initiate OAuth flow."""
     if len(scopes) == 0:
@@ -56,7 +67,7 @@ def get_auth_token(
 ) -> AuthResult:
     """Get access token using provided client ID, client secret, and auth code."""
     endpoint = get_oauth_url(ACCESS_TOKEN_PATH)
-    session = session or requests.Session()
+    session = session or _shared_session()
     data = {
         "client_id": client_id,
         "client_secret": client_secret,
@@ -67,9 +78,11 @@ def get_auth_token(
 
 
 async def get_auth_token_async(
-    client_id: str, client_secret: str, code: str
+    client_id: str, client_secret: str, code: str, session: Session | None = None
 ) -> AuthResult:
-    return await run_async(lambda: get_auth_token(client_id, client_secret, code))
+    return await run_async(
+        lambda: get_auth_token(client_id, client_secret, code, session)
+    )
 
 
 def revoke_auth_token(
@@ -78,7 +91,7 @@ def revoke_auth_token(
     """Revoke an access token."""
     # `get_api_url` is not a typo. Deleting access tokens is done using the regular API.
     endpoint = get_api_url(ACCESS_TOKENS_PATH)
-    session = session or requests.Session()
+    session = session or _shared_session()
     params = {
         "client_id": client_id,
         "client_secret": client_secret,
@@ -88,6 +101,8 @@ def revoke_auth_token(
 
 
 async def revoke_auth_token_async(
-    client_id: str, client_secret: str, token: str
+    client_id: str, client_secret: str, token: str, session: Session | None = None
 ) -> bool:
-    return await run_async(lambda: revoke_auth_token(client_id, client_secret, token))
+    return await run_async(
+        lambda: revoke_auth_token(client_id, client_secret, token, session)
+    )
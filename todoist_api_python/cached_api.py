@@ -1,168 +1,2054 @@
+from __future__ import annotations
+
+import hashlib
+import json
 import logging
-from typing import Callable, Iterable
-from functools import wraps
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import update_wrapper, wraps
+from http import HTTPStatus
+from inspect import getattr_static, signature
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, TypeVar, cast, overload
+
+import requests
 
+from todoist_api_python._core.cache import EntityStore, LRUCache, estimate_size
+from todoist_api_python._core.deadline import DeadlineExceeded, time_left
+from todoist_api_python._core.http_requests import TIMEOUT, Transport, TransportStats
+from todoist_api_python._core.persistent_cache import SQLiteCache, token_namespace
+from todoist_api_python._core.retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from todoist_api_python._core.utils import (
+    default_request_id_fn,
+    format_date,
+    format_datetime,
+)
 from todoist_api_python.api import TodoistAPI
 
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Iterator, Mapping
+    from inspect import Signature
+    from os import PathLike
+    from types import TracebackType
+
+    from todoist_api_python._core.json_codec import JSONCodec
+    from todoist_api_python._core.rate_limit import RateLimiter
+
+    # An entity, e.g. a task, as returned by the API
+    Entity = dict[str, Any]
+    # A call's arguments by parameter name, as bound by _bind_params()
+    Params = dict[str, Any]
+    # Labels an entry with a piece of data it depends on (see "Cache tags" below)
+    Tag = tuple[Hashable, ...]
+    # Function of (params, result) returning the tags of a cached method's entry
+    TagBuilder = Callable[[Params, Any], set[Tag]]
+    # Function of (instance, params, result) returning the tags a mutator affects
+    Invalidates = Callable[[Any, Params, Any], set[Tag]]
+    # An entry to write to the on-disk cache: (cache name, key, value, tags, TTL)
+    DiskWrite = tuple[str, Hashable, object, Iterable[Hashable], float | None]
+
 logger = logging.getLogger(__name__)
 
-# Utility to make function arguments hashable as a key for caching
-def make_args_hashable(args : tuple, kwargs : dict):
-    # TODO research the best practice for doing this
-    # for now we are making a big tuple
-    return args + tuple(sorted(kwargs.items()))
-    # we sort the kwargs because the order should be irrelevant (dict should be unordered anyway, but Python sometimes retains the order for some reason?)
-
-# Decorator to cache function return values
-# Provides methods to clear the cache, invalidate a specific entry, and force a specific entry
-def cached(func):
-    logger.debug(f"Initialising cache for {func}")
-    func._cached_values = {}
-    func._cache_hits = 0
-    func._cache_misses = 0
-    @wraps(func)
-    def wrapped_function(*args,**kwargs):
-        key = make_args_hashable(args,kwargs)
-        if key in func._cached_values:
-            logger.debug(f"Cache hit on {func} for args {key}. Returning cached value")
-            func._cache_hits += 1
-            return func._cached_values[key]
-        else:
-            logger.debug(f"Cache miss on {func} for args {key}. Calling function")
-            func._cache_misses += 1
-            result = func(*args,**kwargs)
-            func._cached_values[key] = result
+T = TypeVar("T")
+
+
+# Build the cache key for a call from its bound parameters (with defaults applied,
+# and without 'self')
+# Calls sending the same request get the same key: positional and keyword forms,
+# omitted and explicit defaults, lists and tuples, and datetimes in any timezone are
+# all normalized, so e.g. get_tasks(ids=[...]) can be cached too.
+# The key is a short digest of the canonical form, so keys stay small however large
+# the arguments are.
+def make_cache_key(params: Params) -> str:
+    canonical = json.dumps(
+        _canonical(params), sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+# Turn an argument into a JSON-compatible form, as it would be sent to the API
+def _canonical(value: object) -> object:
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, date):
+        return format_date(value)
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item) for item in value), key=repr)
+    return value
+
+
+# Default limits applied to each cached method
+# Caches are bounded so that a long-running CachedTodoistAPI has a predictable
+# memory ceiling
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# seconds, or None for entries that never expire
+DEFAULT_CACHE_TTL = None
+# seconds, or None to never refresh entries in the background
+DEFAULT_CACHE_SOFT_TTL = None
+# seconds, or None to never cache "404 Not Found" errors
+DEFAULT_CACHE_NOT_FOUND_TTL = None
+DEFAULT_CACHE_REFRESH_WORKERS = 4
+
+##################################################################################
+#
+# Cache tags
+#
+# Every cached entry is labelled with tags describing the data it depends on, and
+# every mutator names the tags its change affects. Only entries sharing a tag are
+# dropped.
+#
+#   (kind, id)                    the entity itself, e.g. ("task", "123")
+#   ("kind", kind)                any entity of that kind
+#   ("in", kind, id)              entities contained in another, e.g.
+#                                 ("in", "project", "456") for a task in it
+#   ("has_label", name)           tasks carrying a label
+#   ("list", kind)                any list of that kind of entity
+#   ("list", kind, field, value)  lists filtered on a field, e.g.
+#                                 get_tasks(project_id="456")
+#   ("list", kind, "*")           unfiltered lists, e.g. get_projects()
+#   ("not_found", kind)           cached "not found" errors for that kind of
+#                                 entity, which creating one may resolve
+#   ANY_CHANGE                    results of free-form queries (filters,
+#                                 completed tasks) that any change can affect
+#
+##################################################################################
+
+ANY_CHANGE = ("any",)
+
+# For each entity kind, the fields that point at the entity containing it
+# fmt: off
+CONTAINERS = {
+    "task":    {"project_id": "project", "section_id": "section", "parent_id": "task"},
+    "section": {"project_id": "project"},
+    "project": {"parent_id": "project"},
+    "comment": {"project_id": "project", "task_id": "task"},
+    "label":   {},
+}
+# fmt: on
+
+
+# Tags for a single entity dict
+def _entity_tags(kind: str, entity: object) -> set[Tag]:
+    if not isinstance(entity, dict):
+        return set()
+    tags: set[Tag] = {("kind", kind), (kind, entity.get("id"))}
+    for name, container in CONTAINERS[kind].items():
+        if entity.get(name) is not None:
+            tags.add(("in", container, entity[name]))
+    if kind == "task":
+        tags |= {("has_label", label) for label in entity.get("labels") or ()}
+    return tags
+
+
+# Tags for every list the entity would appear in
+# Used when an entity is created or changed, to drop lists it may have joined
+def _membership_tags(kind: str, entity: object) -> set[Tag]:
+    tags: set[Tag] = {("list", kind, "*")}
+    if not isinstance(entity, dict):
+        return tags | {("list", kind)}
+    for name in CONTAINERS[kind]:
+        if entity.get(name) is not None:
+            tags.add(("list", kind, name, entity[name]))
+    if kind == "task":
+        tags |= {
+            ("list", "task", "label", label) for label in entity.get("labels") or ()
+        }
+    return tags
+
+
+# Tag builder for methods returning a single entity
+def entity_tags(kind: str) -> TagBuilder:
+    return lambda params, result: _entity_tags(kind, result)
+
+
+# Tag builder for methods returning a list of entities, filtered on the given
+# parameters
+def list_tags(kind: str, *filters: str, any_change: bool = False) -> TagBuilder:
+    def tags(params: Params, result: Iterable[object]) -> set[Tag]:
+        tags: set[Tag] = {("list", kind)}
+        given = {name: params[name] for name in filters if params.get(name) is not None}
+        if "ids" in given:
+            tags |= {(kind, entity_id) for entity_id in given.pop("ids")}
+        elif not given:
+            tags.add(("list", kind, "*"))
+        tags |= {("list", kind, name, value) for name, value in given.items()}
+        if any_change:
+            tags.add(ANY_CHANGE)
+        for item in result:
+            tags |= _entity_tags(kind, item)
+        return tags
+
+    return tags
+
+
+##################################################################################
+#
+# Normalized storage
+#
+# Entities returned by methods with a 'kind' are kept once per instance in an
+# EntityStore, keyed by (kind, id). Cache entries hold EntityRefs pointing into it,
+# so a task appearing in several lists takes memory once, every list sees the
+# latest version fetched, and get_task(task_id) can be answered from any list
+# holding that task.
+#
+##################################################################################
+
+
+# Value stored in a cache entry in place of the entities themselves
+class EntityRefs(NamedTuple):
+    keys: tuple[Hashable, ...]  # of (kind, id)
+    single: bool  # a single entity rather than a list of them
+
+
+# Fetch (or lazily create) the entity store of an instance
+def _store_for(instance: object) -> EntityStore[Entity]:
+    return cast(
+        "EntityStore[Entity]",
+        instance.__dict__.setdefault("_entity_store", EntityStore()),
+    )
+
+
+# Value stored for the results a paginated method had returned so far when its
+# iteration stopped
+# 'value' is the list of results, or of their (kind, id) keys into the entity store
+# when 'refs' is set, and 'cursor' the cursor of the page to continue from
+# An iteration extends its _Partial in place, recording each page's entities and
+# adding up their sizes, so a page costs the same to record however many came
+# before it
+@dataclass(eq=False)
+class _Partial:
+    value: list[Any]
+    refs: bool
+    cursor: str = ""
+    nbytes: int = 0
+    tags: set[Tag] = field(default_factory=set)
+
+
+# Value stored in place of a result when the API answered "404 Not Found", so the
+# error is raised again without a request
+class _NotFound(NamedTuple):
+    error: requests.HTTPError
+
+    # A fresh copy, so raising it repeatedly doesn't build up a traceback on the
+    # stored error
+    def copy(self) -> requests.HTTPError:
+        return requests.HTTPError(
+            *self.error.args, request=self.error.request, response=self.error.response
+        )
+
+
+# Key under which a _Partial is stored, alongside the entry for the complete results
+class _PartialKey(NamedTuple):
+    key: Hashable
+
+
+# Turn a cached value back into what the method returned
+# Raises KeyError if a referenced entity has gone missing, so that the caller
+# refetches
+def _resolve(store: EntityStore[Entity], value: object) -> object:
+    if not isinstance(value, EntityRefs):
+        return value
+    entities = _resolve_keys(store, value.keys)
+    return entities[0] if value.single else entities
+
+
+def _resolve_keys(store: EntityStore[Entity], keys: Iterable[Hashable]) -> list[Entity]:
+    entities = [store.get(key) for key in keys]
+    if any(entity is None for entity in entities):
+        raise KeyError(keys)
+    return cast("list[Entity]", entities)
+
+
+# Check whether entities can be kept in the entity store, i.e. all have IDs
+def _normalizable(kind: str | None, entities: Iterable[object]) -> bool:
+    return kind is not None and all(
+        isinstance(entity, dict) and entity.get("id") is not None for entity in entities
+    )
+
+
+# Store a method's result in its cache, moving entities into the entity store where
+# possible
+# 'age' is the number of seconds since the result was fetched, for results that
+# didn't just come from the API
+def _store_result(
+    cache: LRUCache[Any],
+    store: EntityStore[Entity],
+    kind: str | None,
+    key: Hashable,
+    result: object,
+    tags: Iterable[Hashable],
+    ttl: float | None = None,
+    age: float | None = None,
+) -> None:
+    entities = (
+        [result]
+        if isinstance(result, dict)
+        else result
+        if isinstance(result, list)
+        else None
+    )
+    if kind is None or entities is None or not _normalizable(kind, entities):
+        cache.set(key, result, ttl=ttl, tags=tags)
+        return
+    refs = EntityRefs(
+        tuple((kind, entity["id"]) for entity in entities),
+        single=isinstance(result, dict),
+    )
+    for entity_key, entity in zip(refs.keys, entities):
+        store.acquire(entity_key, entity, _entity_tags(kind, entity), age=age)
+    cache.set(key, refs, ttl=ttl, tags=tags, size=_refs_size(store, refs))
+    if key not in cache:  # too big to store
+        _release(store, refs)
+
+
+# Size of an EntityRefs entry, counting the referenced entities against the cache's
+# byte limit even if other entries share them
+def _refs_size(store: EntityStore[Entity], refs: EntityRefs) -> int:
+    return estimate_size(refs) + sum(store.size(key) for key in refs.keys)
+
+
+def _release(store: EntityStore[Entity], value: object) -> None:
+    keys: Iterable[Hashable]
+    if isinstance(value, _Partial):
+        keys = value.value if value.refs else ()
+    elif isinstance(value, EntityRefs):
+        keys = value.keys
+    else:
+        return
+    for key in keys:
+        store.release(key)
+
+
+##################################################################################
+#
+# Concurrency
+#
+# A CachedTodoistAPI can be shared between threads. Each instance has one
+# re-entrant lock guarding its caches, entity store and invalidation; it is never
+# held while waiting on the network, nor on the on-disk cache, which may wait up to
+# its busy timeout for other processes.
+# Concurrent misses on the same key are coalesced ("single-flight"): the first
+# thread calls the API, and the others wait for its result (or exception) instead
+# of sending the same request again.
+#
+##################################################################################
+
+
+# Fetch (or lazily create) the lock of an instance
+def _lock_for(instance: object) -> threading.RLock:
+    return cast(
+        "threading.RLock",
+        instance.__dict__.setdefault("_cache_lock", threading.RLock()),
+    )
+
+
+# Every invalidation bumps the instance's generation, so a request that was in
+# flight when the data changed can tell that its result may be outdated and should
+# not be cached
+def _generation(instance: object) -> int:
+    return cast("int", instance.__dict__.get("_cache_generation", 0))
+
+
+def _bump_generation(instance: object) -> None:
+    instance.__dict__["_cache_generation"] = _generation(instance) + 1
+
+
+# Invalidations reach the on-disk cache after the instance's lock is released, so
+# entries they are about to drop could still be read from disk meanwhile. Disk reads
+# are skipped while any invalidation is on its way there
+def _disk_pending(instance: object) -> int:
+    return cast("int", instance.__dict__.get("_cache_disk_pending", 0))
+
+
+# Apply an invalidation to the on-disk cache, if any, outside the instance's lock
+# 'apply' is called with the SQLiteCache; must be called right after the in-memory
+# invalidation, holding the lock, and returns a function that completes it and must
+# be called once the lock is released
+def _invalidate_disk(
+    instance: object, apply: Callable[[SQLiteCache], object]
+) -> Callable[[], None]:
+    persistent = instance.__dict__.get("_persistent_cache")
+    if persistent is None:
+        return lambda: None
+    instance.__dict__["_cache_disk_pending"] = _disk_pending(instance) + 1
+
+    def complete() -> None:
+        try:
+            apply(persistent)
+        finally:
+            with _lock_for(instance):
+                instance.__dict__["_cache_disk_pending"] -= 1
+
+    return complete
+
+
+# Write an entry through to the on-disk cache, if any; must be called without
+# holding the instance's lock
+# An invalidation since 'generation' may have reached the disk before this write,
+# so the entry is deleted again then
+def _persist(
+    instance: object,
+    name: str,
+    key: Hashable,
+    value: object,
+    tags: Iterable[Hashable],
+    ttl: float | None,
+    generation: int,
+) -> None:
+    persistent = instance.__dict__.get("_persistent_cache")
+    if persistent is None:
+        return
+    persistent.set(name, key, value, tags, ttl=ttl)
+    with _lock_for(instance):
+        outdated = generation != _generation(instance)
+    if outdated:
+        persistent.delete(name, key)
+
+
+# Fetch (or lazily create) the worker refreshing an instance's stale entries
+# Must be called holding the instance's lock
+def _refresher_for(instance: object) -> ThreadPoolExecutor:
+    refresher = instance.__dict__.get("_cache_refresher")
+    if refresher is None:
+        refresher = instance.__dict__["_cache_refresher"] = ThreadPoolExecutor(
+            max_workers=DEFAULT_CACHE_REFRESH_WORKERS,
+            thread_name_prefix="todoist-cache-refresh",
+        )
+    return cast("ThreadPoolExecutor", refresher)
+
+
+# A request in flight, which other threads missing on the same key wait for
+class _Flight:
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self._done = threading.Event()
+        self._result: object = None
+        self._error: BaseException | None = None
+
+    def finish(self, result: object) -> None:
+        self._result = result
+        self._done.set()
+
+    def fail(self, error: BaseException) -> None:
+        self._error = error
+        self._done.set()
+
+    # Waiters keep to their own deadline, if any, rather than to the leader's
+    def wait(self) -> object:
+        if not self._done.wait(time_left()):
+            raise DeadlineExceeded(
+                "Deadline exceeded while waiting for an identical request"
+            )
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+# Decorator to cache method return values
+# Can be used bare (@cached) or with limits (@cached(ttl=60, max_entries=100))
+# Least recently used entries are evicted once max_entries or max_bytes is exceeded,
+# and entries older than ttl seconds are refetched
+# Entries older than soft_ttl seconds are still returned straight away, but
+# refetched in the background ("stale-while-revalidate")
+# With not_found_ttl, "404 Not Found" errors are cached for that many seconds too,
+# and raised again without a request
+# 'kind' names the entity kind returned, and 'tags' is a function of (params, result)
+# labelling each entry for invalidate_tags()
+# 'entity_id' names the parameter holding the ID for methods returning a single
+# entity, so they can be answered from the entity store
+# 'paginated' marks methods returning a ResultsPaginator; their results are cached
+# page by page as a list (see _stream)
+@overload
+def cached(
+    func: Callable[..., Any],
+    *,
+    ttl: float | None = ...,
+    soft_ttl: float | None = ...,
+    not_found_ttl: float | None = ...,
+    max_entries: int | None = ...,
+    max_bytes: int | None = ...,
+    kind: str | None = ...,
+    tags: TagBuilder | None = ...,
+    entity_id: str | None = ...,
+    paginated: bool = ...,
+) -> CachedMethod: ...
+
+
+@overload
+def cached(
+    func: None = ...,
+    *,
+    ttl: float | None = ...,
+    soft_ttl: float | None = ...,
+    not_found_ttl: float | None = ...,
+    max_entries: int | None = ...,
+    max_bytes: int | None = ...,
+    kind: str | None = ...,
+    tags: TagBuilder | None = ...,
+    entity_id: str | None = ...,
+    paginated: bool = ...,
+) -> Callable[[Callable[..., Any]], CachedMethod]: ...
+
+
+def cached(
+    func: Callable[..., Any] | None = None,
+    *,
+    ttl: float | None = DEFAULT_CACHE_TTL,
+    soft_ttl: float | None = DEFAULT_CACHE_SOFT_TTL,
+    not_found_ttl: float | None = DEFAULT_CACHE_NOT_FOUND_TTL,
+    max_entries: int | None = DEFAULT_CACHE_MAX_ENTRIES,
+    max_bytes: int | None = DEFAULT_CACHE_MAX_BYTES,
+    kind: str | None = None,
+    tags: TagBuilder | None = None,
+    entity_id: str | None = None,
+    paginated: bool = False,
+) -> CachedMethod | Callable[[Callable[..., Any]], CachedMethod]:
+    if func is None:
+        return lambda func: cached(
+            func,
+            ttl=ttl,
+            soft_ttl=soft_ttl,
+            not_found_ttl=not_found_ttl,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            kind=kind,
+            tags=tags,
+            entity_id=entity_id,
+            paginated=paginated,
+        )
+    return CachedMethod(
+        func,
+        ttl=ttl,
+        soft_ttl=soft_ttl,
+        not_found_ttl=not_found_ttl,
+        max_entries=max_entries,
+        max_bytes=max_bytes,
+        kind=kind,
+        tags=tags,
+        entity_id=entity_id,
+        paginated=paginated,
+    )
+
+
+##################################################################################
+#
+# Statistics
+#
+# Each method's LRUCache counts its own hits, misses and evictions. On top of those,
+# the cached layer counts requests actually sent ('fetches', and the time they took)
+# and misses that joined a request already in flight ('coalesced'), from which the
+# network time saved is estimated as (hits + coalesced) x average fetch time.
+#
+##################################################################################
+
+
+@dataclass(frozen=True)
+class MethodCacheStats:
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    entries: int
+    nbytes: int  # approximate, counting entities shared with other entries in full
+    fetches: int
+    fetch_seconds: float
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def seconds_saved(self) -> float:
+        if not self.fetches:
+            return 0.0
+        return (self.hits + self.coalesced) * self.fetch_seconds / self.fetches
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    methods: dict[str, MethodCacheStats]
+    entities: int  # held once in the entity store, however many entries share them
+    entity_nbytes: int
+    # bytes sent and received, and saved by compression
+    transport: TransportStats | None = None
+
+    @property
+    def hits(self) -> int:
+        return sum(stats.hits for stats in self.methods.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(stats.misses for stats in self.methods.values())
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def seconds_saved(self) -> float:
+        return sum(stats.seconds_saved for stats in self.methods.values())
+
+
+# The cache of one method on one instance: an LRUCache holding the method's entries,
+# plus the options of the method that the cached layer applies on top of it, and the
+# cached layer's counters
+class MethodCache(LRUCache[Any]):
+    def __init__(
+        self,
+        *,
+        kind: str | None = None,
+        soft_ttl: float | None = None,
+        not_found_ttl: float | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        on_remove: Callable[[Hashable, Any], None] | None = None,
+    ) -> None:
+        """Initialize the cache, with the cached layer's options on top of its own."""
+        super().__init__(
+            max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, on_remove=on_remove
+        )
+        self.kind = kind
+        self.soft_ttl = soft_ttl
+        self.not_found_ttl = not_found_ttl
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+        self.coalesced = 0
+
+    def reset_stats(self) -> None:
+        super().reset_stats()
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+        self.coalesced = 0
+
+
+# Snapshot the statistics of all of an instance's caches, optionally zeroing the
+# counters in the same step
+def cache_stats(instance: object, reset: bool = False) -> CacheStats:
+    store = _store_for(instance)
+    with _lock_for(instance):
+        methods = {}
+        for name, cache in instance.__dict__.get("_caches", {}).items():
+            methods[name] = MethodCacheStats(
+                hits=cache.hits,
+                misses=cache.misses,
+                coalesced=cache.coalesced,
+                evictions=cache.evictions,
+                entries=len(cache),
+                nbytes=cache.nbytes,
+                fetches=cache.fetches,
+                fetch_seconds=cache.fetch_seconds,
+            )
+            if reset:
+                cache.reset_stats()
+        transport_stats = getattr(instance, "transport_stats", None)
+        return CacheStats(
+            methods=methods,
+            entities=len(store),
+            entity_nbytes=store.nbytes,
+            transport=transport_stats(reset) if transport_stats is not None else None,
+        )
+
+
+# Bind a call's arguments to the method's parameter names, dropping 'self'
+def _bind_params(
+    method_signature: Signature,
+    instance: object,
+    args: tuple[object, ...],
+    kwargs: dict[str, object],
+) -> Params:
+    params = dict(method_signature.bind(instance, *args, **kwargs).arguments)
+    params.pop("self", None)
+    return params
+
+
+# Descriptor returned by cached()
+# The cache itself is stored on each instance (in instance._caches) rather than on
+# the function, so two clients never share entries, and a client's cache is garbage
+# collected along with it.
+# 'self' is therefore not part of the cache key.
+class CachedMethod:
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        *,
+        ttl: float | None,
+        max_entries: int | None,
+        max_bytes: int | None,
+        soft_ttl: float | None = None,
+        not_found_ttl: float | None = None,
+        kind: str | None = None,
+        tags: TagBuilder | None = None,
+        entity_id: str | None = None,
+        paginated: bool = False,
+    ) -> None:
+        """Wrap a method to cache its results (see `cached` for the options)."""
+        logger.debug("Initialising cache for %s", func)
+        update_wrapper(self, func)
+        self._func = func
+        self._signature = signature(func)
+        self.ttl = ttl
+        self.soft_ttl = soft_ttl
+        self.not_found_ttl = not_found_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.kind = kind
+        self.tags = tags
+        self.entity_id = entity_id
+        self.paginated = paginated
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """Remember the attribute name, which caches are looked up by."""
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return getattr(self, "_name", self._func.__name__)
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> CachedMethod: ...
+
+    @overload
+    def __get__(
+        self, instance: object, owner: type | None = None
+    ) -> BoundCachedMethod: ...
+
+    def __get__(
+        self, instance: object | None, owner: type | None = None
+    ) -> CachedMethod | BoundCachedMethod:
+        """Bind the method to an instance, and so to that instance's cache."""
+        if instance is None:
+            return self
+        return BoundCachedMethod(self, instance)
+
+    # Calling through the class, e.g. CachedTodoistAPI.get_task(api, task_id)
+    # Results keep the type of the wrapped method's, except paginated ones (lists)
+    def __call__(self, instance: object, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        return self.__get__(instance)(*args, **kwargs)
+
+    # The key a call with these arguments is cached under
+    def cache_key(
+        self, instance: object, args: tuple[object, ...], kwargs: dict[str, object]
+    ) -> str:
+        bound = self._signature.bind(instance, *args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        params.pop(next(iter(self._signature.parameters)), None)  # 'self'
+        return make_cache_key(params)
+
+    # Fetch (or lazily create) this method's cache on the given instance
+    def cache_for(self, instance: object) -> MethodCache:
+        caches: dict[str, MethodCache] = instance.__dict__.setdefault("_caches", {})
+        name = self.name
+        if name not in caches:
+            store = _store_for(instance)
+            caches[name] = MethodCache(
+                kind=self.kind,
+                soft_ttl=self.soft_ttl,
+                not_found_ttl=self.not_found_ttl,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                ttl=self.ttl,
+                on_remove=lambda key, value: _release(store, value),
+            )
+        return caches[name]
+
+
+# A CachedMethod bound to one instance, as returned by e.g. api.get_task
+# Provides methods to clear the cache, invalidate a specific entry, and force a
+# specific entry
+# Entries are addressed by the key from cache_key(*args, **kwargs), or by a tuple of
+# positional arguments
+class BoundCachedMethod:
+    def __init__(self, method: CachedMethod, instance: object) -> None:
+        """Bind a cached method to an instance."""
+        self._method = method
+        self._instance = instance
+        self._cache = method.cache_for(instance)
+        self._store = _store_for(instance)
+        self._persistent: SQLiteCache | None = instance.__dict__.get(
+            "_persistent_cache"
+        )
+        self._lock = _lock_for(instance)
+        self._flights: dict[tuple[str, Hashable], _Flight] = (
+            instance.__dict__.setdefault("_cache_flights", {})
+        )
+        update_wrapper(self, method._func)
+
+    # Results keep the type of the wrapped method's, except paginated ones (lists)
+    def __call__(self, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        method = self._method
+        key = method.cache_key(self._instance, args, kwargs)
+        streaming = method.paginated and getattr(
+            self._instance, "_cache_streaming", False
+        )
+        with self._lock:
+            found, result = self._lookup(key, args, kwargs)
+            if found:
+                return self._hit(key, args, kwargs, result, streaming)
+            # Skip the disk while an invalidation is on its way there, as it may
+            # still hold what was invalidated
+            reading = self._persistent is not None and not _disk_pending(self._instance)
+            generation = _generation(self._instance)
+        stored = (
+            self._persistent.get(method.name, key)
+            if reading and self._persistent is not None
+            else None
+        )
+        with self._lock:
+            if stored is not None and generation == _generation(self._instance):
+                return self._hit(
+                    key, args, kwargs, self._loaded(key, stored), streaming
+                )
+            if streaming:
+                generation = _generation(self._instance)
+            else:
+                flight, leader = self._join_flight(key)
+        if streaming:
+            # Streams are not coalesced, as each caller consumes pages at its own pace
+            logger.debug(
+                "Cache miss on %s for args %s. Streaming results", method._func, key
+            )
+            return self._stream(key, args, kwargs, generation)
+        if not leader:
+            logger.debug(
+                "Cache miss on %s for args %s. "
+                "Waiting for the request already in flight",
+                method._func,
+                key,
+            )
+            with self._lock:
+                self._cache.coalesced += 1
+            return flight.wait()
+        logger.debug(
+            "Cache miss on %s for args %s. Calling function", method._func, key
+        )
+        return self._fetch(flight, key, args, kwargs)
+
+    # Return a cached result, refreshing it in the background once past its soft TTL
+    # Must be called holding the instance's lock
+    def _hit(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        result: object,
+        streaming: bool,
+    ) -> object:
+        soft_ttl = self._cache.soft_ttl
+        if soft_ttl is not None and self._cache.age(key) > soft_ttl:
+            self._refresh_in_background(key, args, kwargs)
+        return iter(result) if streaming and isinstance(result, list) else result
+
+    # Only the first thread to miss calls the API; the rest wait for its result
+    # A request sent before the latest invalidation may return outdated data, so
+    # isn't joined
+    # Returns (flight, whether this thread must send the request); must be called
+    # holding the instance's lock
+    def _join_flight(self, key: Hashable) -> tuple[_Flight, bool]:
+        flight = self._flights.get((self._method.name, key))
+        if flight is not None and flight.generation == _generation(self._instance):
+            return flight, False
+        flight = self._flights[(self._method.name, key)] = _Flight(
+            _generation(self._instance)
+        )
+        return flight, True
+
+    # Call the API for a flight this thread leads, cache the result, and hand it to
+    # the flight's waiters
+    def _fetch(
+        self,
+        flight: _Flight,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+    ) -> object:
+        method = self._method
+        try:
+            try:
+                if method.paginated:
+                    result: object = list(
+                        self._stream(key, args, kwargs, flight.generation)
+                    )
+                else:
+                    result = self._call(key, args, kwargs, flight.generation)
+            except BaseException as error:
+                flight.fail(error)
+                raise
+            flight.finish(result)
             return result
-    
-    def cache_clear():
-        logger.debug(f"Cache on {func} was cleared")
-        func._cached_values = {}
-    
-    def invalidate_cache_entry(key):
-        if key in func._cached_values:
-            logger.debug(f"Cache on {func} had this key invalidate: {key}")
-            del func._cached_values[key]
+        finally:
+            with self._lock:
+                if self._flights.get((method.name, key)) is flight:
+                    del self._flights[(method.name, key)]
+
+    def _call(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        generation: int,
+    ) -> object:
+        method = self._method
+        started = time.perf_counter()
+        try:
+            result = method._func(self._instance, *args, **kwargs)
+        except requests.HTTPError as error:
+            if (
+                self._cache.not_found_ttl is not None
+                and error.response is not None
+                and error.response.status_code == HTTPStatus.NOT_FOUND
+            ):
+                with self._lock:
+                    self._record_not_found(key, args, kwargs, error, generation)
+            raise
+        with self._lock:
+            self._cache.fetches += 1
+            self._cache.fetch_seconds += time.perf_counter() - started
+            tags = self._record(key, args, kwargs, result, generation)
+        if tags is not None:
+            _persist(
+                self._instance,
+                method.name,
+                key,
+                result,
+                tags,
+                self._cache.ttl,
+                generation,
+            )
+        return result
+
+    # Iterate over a paginated method's results, recording each page in the cache as
+    # it arrives
+    # Starts by replaying the pages an earlier, unfinished iteration left in the
+    # cache, then carries on from its cursor
+    def _stream(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        generation: int,
+    ) -> Iterator[object]:
+        method = self._method
+        with self._lock:
+            replayed, cursor = self._partial(key)
+        if replayed:
+            logger.debug(
+                "Replaying %d cached results on %s for args %s, "
+                "then resuming from cursor %s",
+                len(replayed),
+                method._func,
+                key,
+                cursor,
+            )
+        yield from replayed
+        paginator = method._func(self._instance, *args, **kwargs)
+        if cursor:
+            paginator.skip_to(cursor)
+        # The _Partial this iteration records into, created along with its first page
+        partial = None
+        recording = True
+        seconds = 0.0
+        complete = False
+        try:
+            while not complete:
+                started = time.perf_counter()
+                try:
+                    page = paginator.next_page()
+                except StopIteration:
+                    page = []
+                finally:
+                    seconds += time.perf_counter() - started
+                complete = paginator.cursor is None
+                if recording:
+                    # Record before yielding, so a caller stopping part-way through
+                    # the page still leaves it cached
+                    # A new partial starts with the replayed results, so it holds
+                    # everything from the first page on
+                    with self._lock:
+                        partial = self._record_page(
+                            key,
+                            args,
+                            kwargs,
+                            partial,
+                            page if partial is not None else replayed + page,
+                            paginator.cursor,
+                            generation,
+                        )
+                        recording = partial is not None
+                        result = None
+                        if partial is not None and complete:
+                            result = self._complete(key, partial)
+                    if partial is not None and result is not None:
+                        _persist(
+                            self._instance,
+                            method.name,
+                            key,
+                            result,
+                            partial.tags,
+                            self._cache.ttl,
+                            generation,
+                        )
+                    replayed = []
+                yield from page
+        finally:
+            if seconds:
+                with self._lock:
+                    self._cache.fetches += 1
+                    self._cache.fetch_seconds += seconds
+
+    # Add a page of results to the partial results of the iteration, creating them
+    # if 'partial' is None
+    # Returns the _Partial, or None to stop recording: once a mutation may have
+    # outdated the results, once they no longer fit in the cache, or once their entry
+    # has left the cache (evicted, invalidated or taken over)
+    # The byte limit is checked before anything is stored, so an oversized result is
+    # never buffered in full
+    # Must be called holding the instance's lock
+    def _record_page(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        partial: _Partial | None,
+        page: list[Any],
+        cursor: str | None,
+        generation: int,
+    ) -> _Partial | None:
+        method = self._method
+        kind = method.kind
+        partial_key = _PartialKey(key)
+        if generation != _generation(self._instance):
+            return None
+        if partial is None:
+            partial = _Partial([], refs=_normalizable(kind, page))
+        elif not self._recording(partial_key, partial):
+            return None
+        elif partial.refs and not _normalizable(kind, page):
+            self._cache.pop(partial_key)
+            return None
+        sizes = [estimate_size(item) for item in page]
+        nbytes = partial.nbytes + sum(sizes)
+        if partial.refs:
+            keys = [(kind, item["id"]) for item in page]
+            nbytes += sum(estimate_size(entity_key) for entity_key in keys)
+        if self._cache.max_bytes is not None and nbytes > self._cache.max_bytes:
+            logger.debug(
+                "Results on %s for args %s are too big to cache. "
+                "No longer recording them",
+                method._func,
+                key,
+            )
+            self._cache.pop(partial_key)
+            return None
+        if partial.refs and kind is not None:
+            for entity_key, item, size in zip(keys, page, sizes):
+                self._store.acquire(
+                    entity_key, item, _entity_tags(kind, item), size=size
+                )
+            partial.value.extend(keys)
         else:
-            logger.debug(f"Cache on {func} key to invalidate was not found. Key: {key}")
+            partial.value.extend(page)
+        if method.tags is not None:
+            partial.tags |= method.tags(
+                _bind_params(method._signature, self._instance, args, kwargs), page
+            )
+        partial.nbytes = nbytes
+        partial.cursor = cursor or ""
+        return self._store_partial(partial_key, partial)
+
+    # Check whether the partial results are still the ones stored under their key
+    # Must be called holding the instance's lock
+    def _recording(self, partial_key: _PartialKey, partial: _Partial) -> bool:
+        return self._cache.peek(partial_key) is partial
+
+    # Store the grown partial results, or the first page of them, in the cache
+    # Returns the _Partial, or None if it was evicted straight away
+    # Must be called holding the instance's lock
+    def _store_partial(
+        self, partial_key: _PartialKey, partial: _Partial
+    ) -> _Partial | None:
+        if self._recording(partial_key, partial):
+            self._cache.replace(partial_key, partial, partial.tags, size=partial.nbytes)
+            return partial
+        self._cache.set(partial_key, partial, tags=partial.tags, size=partial.nbytes)
+        if partial_key not in self._cache:  # evicted straight away
+            _release(self._store, partial)
+            return None
+        return partial
+
+    # Turn the partial results of a finished iteration into the entry for the
+    # complete results, handing its entity references over rather than acquiring
+    # every entity again
+    # Returns the complete results; must be called holding the instance's lock
+    def _complete(self, key: Hashable, partial: _Partial) -> object:
+        value = (
+            EntityRefs(tuple(partial.value), single=False)
+            if partial.refs
+            else partial.value
+        )
+        self._cache.set(key, value, tags=partial.tags, size=partial.nbytes)
+        if key in self._cache:
+            # Now referenced by the complete entry, so not released along with the
+            # partial one
+            partial.value = []
+        self._cache.pop(_PartialKey(key))
+        return _resolve(self._store, value) if key in self._cache else None
+
+    # Store a result, unless a mutation since 'generation' may have outdated it
+    # Returns its tags, for writing it to disk once the lock is released, or None if
+    # it was not stored
+    # Must be called holding the instance's lock
+    def _record(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        result: object,
+        generation: int,
+    ) -> Iterable[Hashable] | None:
+        method = self._method
+        if generation != _generation(self._instance):
+            return None
+        params = _bind_params(method._signature, self._instance, args, kwargs)
+        tags = method.tags(params, result) if method.tags is not None else set()
+        _store_result(self._cache, self._store, method.kind, key, result, tags)
+        return tags
+
+    # Cache a "not found" error for not_found_ttl seconds, tagged so that recreating
+    # the entity drops it
+    # Must be called holding the instance's lock
+    def _record_not_found(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        error: requests.HTTPError,
+        generation: int,
+    ) -> None:
+        method = self._method
+        if generation != _generation(self._instance):
+            return
+        tags: set[Tag] = {("not_found", method.kind or method.name)}
+        if method.entity_id is not None:
+            params = _bind_params(method._signature, self._instance, args, kwargs)
+            tags.add((method.kind, params[method.entity_id]))
+        logger.debug("Caching not found error on %s for args %s", method._func, key)
+        self._cache.set(key, _NotFound(error), ttl=self._cache.not_found_ttl, tags=tags)
+
+    # Raise a cached "not found" error, unless the entity has turned up in the entity
+    # store since (e.g. in a list)
+    # Must be called holding the instance's lock
+    def _not_found(
+        self,
+        key: Hashable,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        not_found: _NotFound,
+    ) -> tuple[bool, object]:
+        method = self._method
+        if method.entity_id is not None:
+            params = _bind_params(method._signature, self._instance, args, kwargs)
+            if (method.kind, params[method.entity_id]) in self._store:
+                del self._cache[key]
+                self._cache.hits -= 1  # counted by the lookup below instead
+                return self._lookup(key, args, kwargs)
+        logger.debug(
+            "Cache hit on %s for args %s. Raising cached not found error",
+            method._func,
+            key,
+        )
+        raise not_found.copy()
+
+    # The results and cursor an unfinished iteration left in the cache, or ([], "")
+    # if there are none
+    # Must be called holding the instance's lock
+    def _partial(self, key: Hashable) -> tuple[list[Any], str]:
+        partial = self._cache.peek(_PartialKey(key))
+        if partial is not None:
+            try:
+                results = (
+                    _resolve_keys(self._store, partial.value)
+                    if partial.refs
+                    else list(partial.value)
+                )
+            except KeyError:
+                pass
+            else:
+                return results, partial.cursor
+        return [], ""
+
+    # Refetch an entry past its soft TTL on the instance's refresh worker, unless
+    # that's already under way
+    # Must be called holding the instance's lock
+    def _refresh_in_background(
+        self, key: Hashable, args: tuple[object, ...], kwargs: dict[str, object]
+    ) -> None:
+        flight, leader = self._join_flight(key)
+        if not leader:
+            return
+        logger.debug(
+            "Cache entry on %s for args %s is stale. Refreshing it in the background",
+            self._method._func,
+            key,
+        )
+
+        def refresh() -> None:
+            try:
+                self._fetch(flight, key, args, kwargs)
+            # The stale value stays in place until the hard TTL, so the next read
+            # tries again, whatever went wrong
+            except Exception as error:  # noqa: BLE001
+                logger.debug(
+                    "Background refresh on %s for args %s failed: %r",
+                    self._method._func,
+                    key,
+                    error,
+                )
+
+        _refresher_for(self._instance).submit(refresh)
+
+    # Look the key up in memory, then in the entity store; the disk is read by the
+    # caller, without holding the lock
+    # Returns (found, value); must be called holding the instance's lock
+    def _lookup(
+        self, key: Hashable, args: tuple[object, ...], kwargs: dict[str, object]
+    ) -> tuple[bool, object]:
+        method = self._method
+        func = method._func
+        try:
+            result = _resolve(self._store, self._cache[key])
+        except KeyError:
+            pass
+        else:
+            if isinstance(result, _NotFound):
+                return self._not_found(key, args, kwargs, result)
+            logger.debug(
+                "Cache hit on %s for args %s. Returning cached value", func, key
+            )
+            return True, result
+        if method.entity_id is not None:
+            params = _bind_params(method._signature, self._instance, args, kwargs)
+            entity_key = (method.kind, params[method.entity_id])
+            entity = self._store.get(entity_key, max_age=self._cache.ttl)
+            if entity is not None:
+                logger.debug(
+                    "Cache hit on %s for args %s in the entity store. "
+                    "Returning cached value",
+                    func,
+                    key,
+                )
+                self._cache.misses -= 1  # answered after all
+                self._cache.hits += 1
+                # The entry lives only as long as the entity had left, not a full TTL
+                # from now
+                ttl = (
+                    self._cache.ttl - self._store.age(entity_key)
+                    if self._cache.ttl is not None
+                    else None
+                )
+                _store_result(
+                    self._cache,
+                    self._store,
+                    method.kind,
+                    key,
+                    entity,
+                    method.tags(params, entity) if method.tags else (),
+                    ttl=ttl,
+                )
+                return True, entity
+        return False, None
+
+    # Store an entry read from disk, as (value, tags, remaining TTL), back in memory
+    # and return its value
+    # Must be called holding the instance's lock
+    def _loaded(
+        self, key: Hashable, stored: tuple[object, list[Hashable], float | None]
+    ) -> object:
+        method = self._method
+        logger.debug(
+            "Cache hit on %s for args %s on disk. Returning cached value",
+            method._func,
+            key,
+        )
+        result, tags, ttl = stored
+        self._cache.misses -= 1  # answered after all
+        self._cache.hits += 1
+        # Date the entities back to when the entry was stored, so they expire along
+        # with it
+        age = (
+            max(0.0, self._cache.ttl - ttl)
+            if self._cache.ttl is not None and ttl is not None
+            else None
+        )
+        _store_result(
+            self._cache, self._store, method.kind, key, result, tags, ttl=ttl, age=age
+        )
+        return result
+
+    def cache_key(self, *args: object, **kwargs: object) -> str:
+        return self._method.cache_key(self._instance, args, kwargs)
 
-    def force_cache_entry(key, value):
-        logger.debug(f"Cache on {func} had this key forced: {key}")
-        func._cached_values[key] = value
+    def _as_key(self, key: Hashable) -> Hashable:
+        return self.cache_key(*key) if isinstance(key, tuple) else key
 
-    wrapped_function.cache_clear = cache_clear
-    wrapped_function.invalidate_cache_entry = invalidate_cache_entry
-    return wrapped_function
+    def cache_clear(self) -> None:
+        logger.debug("Cache on %s was cleared", self._method._func)
+        with self._lock:
+            _bump_generation(self._instance)
+            self._cache.clear()
+            complete = _invalidate_disk(
+                self._instance, lambda persistent: persistent.clear(self._method.name)
+            )
+        complete()
+
+    def invalidate_cache_entry(self, key: Hashable) -> None:
+        key = self._as_key(key)
+        with self._lock:
+            _bump_generation(self._instance)
+            if key in self._cache:
+                logger.debug(
+                    "Cache on %s had this key invalidate: %s", self._method._func, key
+                )
+                del self._cache[key]
+            else:
+                logger.debug(
+                    "Cache on %s key to invalidate was not found. Key: %s",
+                    self._method._func,
+                    key,
+                )
+            complete = _invalidate_disk(
+                self._instance,
+                lambda persistent: persistent.delete(self._method.name, key),
+            )
+        complete()
+
+    def force_cache_entry(self, key: Hashable, value: object) -> None:
+        key = self._as_key(key)
+        logger.debug("Cache on %s had this key forced: %s", self._method._func, key)
+        with self._lock:
+            _store_result(self._cache, self._store, self._method.kind, key, value, ())
+            generation = _generation(self._instance)
+        _persist(
+            self._instance,
+            self._method.name,
+            key,
+            value,
+            (),
+            self._cache.ttl,
+            generation,
+        )
+
+
+# Drop every entry, across all of an instance's caches, labelled with any of the
+# given tags
+# Dropping a container also drops the entities the entity store knows to be inside
+# it (and theirs, and so on), e.g. deleting a task drops its subtasks, and deleting a
+# project drops its sections, tasks and sub-projects
+# 'keep' maps cache names to keys that must survive, e.g. entries just patched by
+# write_through()
+def invalidate_tags(
+    instance: object,
+    tags: Iterable[Tag],
+    keep: Mapping[str, Iterable[Hashable]] | None = None,
+) -> None:
+    with _lock_for(instance):
+        complete = _invalidate_tags(instance, tags, keep)
+    complete()
+
+
+# Invalidate the tagged entries in memory, returning the function that invalidates
+# them on disk
+# Must be called holding the instance's lock, and the function called once it is
+# released
+def _invalidate_tags(
+    instance: object,
+    tags: Iterable[Tag],
+    keep: Mapping[str, Iterable[Hashable]] | None,
+) -> Callable[[], None]:
+    _bump_generation(instance)
+    keep = keep or {}
+    store = _store_for(instance)
+    tags = set(tags)
+    containers = [tag for tag in tags if tag[0] == "in"]
+    while containers:
+        # The store is keyed by (kind, id)
+        contained = cast("set[tuple[str, Hashable]]", store.tagged(containers.pop()))
+        for kind, entity_id in contained:
+            for tag in ((kind, entity_id), ("in", kind, entity_id)):
+                if tag not in tags:
+                    tags.add(tag)
+                    if tag[0] == "in":
+                        containers.append(tag)
+    logger.debug("Invalidating cache entries tagged %s", tags)
+    for name, cache in instance.__dict__.get("_caches", {}).items():
+        cache.invalidate(tags, keep=keep.get(name, ()))
+    return _invalidate_disk(
+        instance, lambda persistent: persistent.invalidate(tags, keep=keep)
+    )
+
+
+# Look up a cached entity without touching any cache entry, or None if it is not
+# cached
+def peek_entity(instance: object, kind: str, entity_id: Hashable) -> Entity | None:
+    with _lock_for(instance):
+        return _store_for(instance).get((kind, entity_id))
+
+
+# Check whether a list entry with the given tags would still hold an entity after it
+# changed
+# Lists from free-form queries could select on anything, so are never safe to patch
+def _list_still_matches(tags: Iterable[Hashable], kind: str, entity: Entity) -> bool:
+    if ANY_CHANGE in tags:
+        return False
+    for tag in tags:
+        # Only ("list", kind, field, value) tags filter on a field
+        if not isinstance(tag, tuple) or tag[:2] != ("list", kind):
+            continue
+        if tag[2:] in ((), ("*",)):
+            continue
+        name, value = tag[2:]
+        if name == "label":
+            if value not in (entity.get("labels") or ()):
+                return False
+        elif entity.get(name) != value:
+            return False
+    return True
+
+
+# Store an entity returned by a mutator straight into the instance's caches
+# The entity store is refreshed, so every cached list already holding the entity
+# sees the new version
+# With 'patch', those lists are kept where their filters still match it; otherwise
+# they are left to be invalidated
+# Returns the {cache name: keys} written, which invalidation must then leave alone,
+# and the entries to write to disk; must be called holding the instance's lock, and
+# the disk written once it is released
+def write_through(
+    instance: object, kind: str, entity: object, patch: bool = False
+) -> tuple[dict[str, set[Hashable]], list[DiskWrite]]:
+    caches: dict[str, MethodCache] = instance.__dict__.get("_caches", {})
+    store = _store_for(instance)
+    written: dict[str, set[Hashable]] = {}
+    to_persist: list[DiskWrite] = []
+    if not isinstance(entity, dict) or entity.get("id") is None:
+        return written, to_persist
+    entity_key = (kind, entity["id"])
+    logger.debug("Writing %s through to the cache", entity_key)
+    store.update(entity_key, entity, _entity_tags(kind, entity))
+    if patch:
+        for name, cache in caches.items():
+            if cache.kind != kind:
+                continue
+            for key, value, tags in cache.tagged(entity_key):
+                if (
+                    isinstance(value, EntityRefs)
+                    and not value.single
+                    and _list_still_matches(tags, kind, entity)
+                ):
+                    patched = tags | _entity_tags(kind, entity)
+                    cache.replace(key, value, patched, size=_refs_size(store, value))
+                    written.setdefault(name, set()).add(key)
+                    to_persist.append(
+                        (name, key, _resolve(store, value), patched, cache.ttl)
+                    )
+    getter = getattr_static(type(instance), f"get_{kind}", None)
+    if f"get_{kind}" in caches and isinstance(getter, CachedMethod):
+        cache = caches[f"get_{kind}"]
+        key = getter.cache_key(instance, (entity["id"],), {})
+        _store_result(cache, store, kind, key, entity, _entity_tags(kind, entity))
+        written.setdefault(f"get_{kind}", set()).add(key)
+        to_persist.append(
+            (f"get_{kind}", key, entity, _entity_tags(kind, entity), cache.ttl)
+        )
+    return written, to_persist
+
+
+# Decorator to invalidate cached entries on other methods when this method is called
+# 'invalidates' is a function of (instance, params, result) returning the tags
+# affected by the change, or a collection of cached methods whose caches should be
+# cleared entirely
+# 'writes' names the kind of entity the method returns; when the instance has
+# write-through enabled, the returned entity is stored with write_through() instead
+# of being refetched on the next read
+# TODO convert to a decorator that supports @ syntactic sugar
+# e.g. @invalidates_caches(...)
+def cache_invalidator(
+    method: Callable[..., T],
+    invalidates: Invalidates | Iterable[CachedMethod],
+    *,
+    writes: str | None = None,
+    patch: bool = False,
+) -> Callable[..., T]:
+    method_signature = signature(method)
 
-# Decorator to clear caches on other methods when this method is called
-# TODO convert to a decorator that supports @ syntactic sugar e.g. @invalidates_caches(...)
-def cache_invalidator(method, cached_methods_to_invalidate):
     @wraps(method)
-    def wrapper(self, *args, **kwargs):
+    def wrapper(self: object, *args: object, **kwargs: object) -> T:
         result = method(self, *args, **kwargs)
-        for cached_method in cached_methods_to_invalidate:
-            cached_method.cache_clear()
+        if callable(invalidates):
+            params = _bind_params(method_signature, self, args, kwargs)
+            with _lock_for(self):
+                # Before writing, as this may look up the old version
+                tags = invalidates(self, params, result)
+                written: dict[str, set[Hashable]] = {}
+                to_persist: list[DiskWrite] = []
+                if writes is not None and getattr(self, "_cache_write_through", False):
+                    written, to_persist = write_through(
+                        self, writes, result, patch=patch
+                    )
+                complete = _invalidate_tags(self, tags, written)
+                generation = _generation(self)
+            complete()
+            for name, key, value, entry_tags, ttl in to_persist:
+                _persist(self, name, key, value, entry_tags, ttl, generation)
+        else:
+            for cached_method in invalidates:
+                cached_method.__get__(self).cache_clear()
         return result
-    return wrapper
 
-# Decorator to convert paginated results into a list
-def capture_list(method : Callable[...,Iterable[list]]):
-    @wraps(method)
-    def wrapper(*args, **kwargs) -> list[list]:
-        result = method(*args, **kwargs)
-        return list(result)
     return wrapper
 
+
+##################################################################################
+#
+# What each mutator invalidates
+#
+##################################################################################
+
+
+def _task_added(api: object, params: Params, task: object) -> set[Tag]:
+    return _membership_tags("task", task) | {("not_found", "task"), ANY_CHANGE}
+
+
+def _task_added_quick(api: object, params: Params, task: object) -> set[Tag]:
+    # Quick Add can create new personal labels from '@label' in the text
+    return _task_added(api, params, task) | {("list", "label", "*")}
+
+
+def _task_updated(api: object, params: Params, task: object) -> set[Tag]:
+    return {("task", params["task_id"]), ANY_CHANGE} | (
+        _membership_tags("task", task) - {("list", "task", "*")}
+    )
+
+
+def _task_completed(api: object, params: Params, result: object) -> set[Tag]:
+    # Completing a task completes its subtasks too, and removes both from active lists
+    return {("task", params["task_id"]), ("in", "task", params["task_id"]), ANY_CHANGE}
+
+
+def _task_uncompleted(api: object, params: Params, result: object) -> set[Tag]:
+    # The task (and any completed parents and sections) reappear in lists we know
+    # nothing about
+    # Dropping ("task", task_id) also drops any cached "not found" error for it
+    tags: set[Tag] = {
+        ("task", params["task_id"]),
+        ("list", "task"),
+        ("list", "section"),
+        ANY_CHANGE,
+    }
+    task = peek_entity(api, "task", params["task_id"])
+    while task is not None and task.get("parent_id") is not None:
+        tags.add(("task", task["parent_id"]))
+        task = peek_entity(api, "task", task["parent_id"])
+    return tags
+
+
+def _task_moved(api: object, params: Params, result: object) -> set[Tag]:
+    task_id = params["task_id"]
+    tags: set[Tag] = {("task", task_id), ("in", "task", task_id), ANY_CHANGE}
+    destination = {
+        name: params.get(name)
+        for name in ("project_id", "section_id", "parent_id")
+        if params.get(name) is not None
+    }
+    if "project_id" not in destination:
+        # Moving into a section or under a task also moves into its project, if we
+        # know it
+        container = (
+            peek_entity(api, "section", destination["section_id"])
+            if "section_id" in destination
+            else peek_entity(api, "task", destination["parent_id"])
+        )
+        if container is None:
+            return tags | {("list", "task")}
+        destination["project_id"] = container.get("project_id")
+        if "parent_id" in destination:
+            destination["section_id"] = container.get("section_id")
+    return tags | _membership_tags("task", destination) - {("list", "task", "*")}
+
+
+def _task_deleted(api: object, params: Params, result: object) -> set[Tag]:
+    return {("task", params["task_id"]), ("in", "task", params["task_id"]), ANY_CHANGE}
+
+
+def _section_added(api: object, params: Params, section: object) -> set[Tag]:
+    return _membership_tags("section", section) | {
+        ("not_found", "section"),
+        ANY_CHANGE,
+    }
+
+
+def _section_updated(api: object, params: Params, result: object) -> set[Tag]:
+    return {("section", params["section_id"]), ANY_CHANGE}
+
+
+def _section_deleted(api: object, params: Params, result: object) -> set[Tag]:
+    return {
+        ("section", params["section_id"]),
+        ("in", "section", params["section_id"]),
+        ANY_CHANGE,
+    }
+
+
+def _project_added(api: object, params: Params, project: object) -> set[Tag]:
+    return _membership_tags("project", project) | {
+        ("not_found", "project"),
+        ANY_CHANGE,
+    }
+
+
+def _project_updated(api: object, params: Params, result: object) -> set[Tag]:
+    return {("project", params["project_id"]), ANY_CHANGE}
+
+
+def _project_removed(api: object, params: Params, result: object) -> set[Tag]:
+    # Archiving or deleting a project also takes its sub-projects, sections, tasks
+    # and comments with it
+    return {
+        ("project", params["project_id"]),
+        ("in", "project", params["project_id"]),
+        ANY_CHANGE,
+    }
+
+
+def _project_unarchived(api: object, params: Params, result: object) -> set[Tag]:
+    # The project's contents reappear in lists we know nothing about
+    return {
+        ("project", params["project_id"]),
+        ("list", "project"),
+        ("list", "section"),
+        ("list", "task"),
+        ANY_CHANGE,
+    }
+
+
+def _comment_added(api: object, params: Params, comment: object) -> set[Tag]:
+    tags = _membership_tags("comment", comment) | {("not_found", "comment")}
+    if isinstance(comment, dict) and comment.get("task_id") is not None:
+        tags.add(("task", comment["task_id"]))  # the task's comment count changed
+    return tags
+
+
+def _comment_updated(api: object, params: Params, result: object) -> set[Tag]:
+    return {("comment", params["comment_id"])}
+
+
+def _comment_deleted(api: object, params: Params, result: object) -> set[Tag]:
+    tags: set[Tag] = {("comment", params["comment_id"])}
+    comment = peek_entity(api, "comment", params["comment_id"])
+    if comment is not None and comment.get("task_id") is not None:
+        tags.add(("task", comment["task_id"]))  # the task's comment count changed
+    return tags
+
+
+def _label_added(api: object, params: Params, label: object) -> set[Tag]:
+    return _membership_tags("label", label) | {("not_found", "label"), ANY_CHANGE}
+
+
+def _label_updated(api: object, params: Params, result: object) -> set[Tag]:
+    if params.get("name") is None:
+        # Not renamed, so tasks carrying the label are unaffected
+        return {("label", params["label_id"]), ANY_CHANGE}
+    return _label_renamed_or_deleted(api, params, result)
+
+
+def _label_renamed_or_deleted(api: object, params: Params, result: object) -> set[Tag]:
+    tags: set[Tag] = {("label", params["label_id"]), ANY_CHANGE}
+    # Tasks carry labels by name, so find the old one
+    label = peek_entity(api, "label", params["label_id"])
+    if label is None:
+        return tags | {("kind", "task")}
+    return tags | {
+        ("has_label", label.get("name")),
+        ("list", "task", "label", label.get("name")),
+    }
+
+
+def _shared_label_renamed(api: object, params: Params, result: object) -> set[Tag]:
+    return {
+        ("has_label", params["name"]),
+        ("list", "task", "label", params["name"]),
+        ("list", "task", "label", params["new_name"]),
+        ANY_CHANGE,
+    }
+
+
+def _shared_label_removed(api: object, params: Params, result: object) -> set[Tag]:
+    return {
+        ("has_label", params["name"]),
+        ("list", "task", "label", params["name"]),
+        ANY_CHANGE,
+    }
+
+
+# Pick a cache option for one method out of a single value or a {method name: value}
+# dict
+def _cache_option(
+    option: T | dict[str, T] | None, name: str, default: T | None
+) -> T | None:
+    if isinstance(option, dict):
+        return option.get(name, default)
+    return default if option is None else option
+
+
 class CachedTodoistAPI(TodoistAPI):
     """
     Wrapper for the Todoist API client with caching on 'get' methods.
 
-    Note paginated results are returned as a 2D list instead of an iterator of lists.
-    This is to accommodate caching.
+    Note paginated results are returned as a list instead of an iterator, unless
+    cache_streaming is set. Either way, pages are cached as they arrive, and a later
+    call replays the cached pages before fetching the rest.
+
+    Each cached method holds at most DEFAULT_CACHE_MAX_ENTRIES entries and roughly
+    DEFAULT_CACHE_MAX_BYTES bytes, evicting the least recently used entries first.
+    Caches belong to the instance, so separate clients (e.g. one per token) never
+    share entries. An instance can be shared between threads; concurrent identical
+    cache misses send a single request.
     """
-    # TODO implement much smarter cache invalidation by only invalidating caches that are relevant to the data that was changed
-    # There are only two hard things in computer science: cache invalidation and naming things - Phil Karlton
+
+    def __init__(
+        self,
+        token: str,
+        request_id_fn: Callable[[], str] | None = default_request_id_fn,
+        session: requests.Session | None = None,
+        *,
+        transport: Transport | None = None,
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        pool_block: bool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = DEFAULT_RETRY_POLICY,
+        json_codec: JSONCodec | str = "auto",
+        timeout: float | tuple[float, float] = TIMEOUT,
+        compress_requests: int | None = None,
+        prefetch_pages: int = 0,
+        bulk: bool = False,
+        cache_ttl: float | dict[str, float] | None = None,
+        cache_soft_ttl: float | dict[str, float] | None = None,
+        cache_not_found_ttl: float | dict[str, float] | None = None,
+        cache_max_entries: int | dict[str, int] | None = None,
+        cache_max_bytes: int | dict[str, int] | None = None,
+        cache_write_through: bool = False,
+        cache_path: str | PathLike[str] | None = None,
+        cache_streaming: bool = False,
+    ) -> None:
+        """
+        Initialize the CachedTodoistAPI client.
+
+        The cache options override the limits each method was declared with.
+        Each may be a single value applied to every cached method,
+        or a dict mapping method names (e.g. 'get_tasks') to values.
+
+        :param token: Authentication token for the Todoist API.
+        :param request_id_fn: Generator of request IDs for the `X-Request-ID` header.
+        :param session: An optional pre-configured requests `Session` object.
+        :param transport: An optional transport to send requests through instead.
+        :param pool_connections: Number of per-host connection pools to keep.
+        :param pool_maxsize: Maximum number of connections kept alive per host.
+        :param pool_block: Wait for a free connection once `pool_maxsize` are in use.
+        :param rate_limiter: Paces requests and retries those rejected with a 429.
+        :param retry_policy: How to retry requests failing transiently, or None to
+                             never retry them.
+        :param json_codec: JSON codec to use, or the name of one ("orjson",
+                           "msgspec", "json" or "auto").
+        :param timeout: Connect and read timeouts of each request in seconds (see
+                        also `deadline`).
+        :param compress_requests: Gzip request bodies of at least this many bytes, or
+                                  None to send them as-is.
+        :param prefetch_pages: Number of pages of paginated results to fetch ahead in
+                               the background.
+        :param bulk: Fetch paginated results in pages of the largest size allowed,
+                     unless a limit is given.
+        :param cache_ttl: Seconds after which cached entries are refetched.
+        :param cache_soft_ttl: Seconds after which cached entries are refetched in the
+                               background, while the stale entry keeps being returned
+                               until cache_ttl.
+        :param cache_not_found_ttl: Seconds for which "404 Not Found" errors are cached
+                                    and raised again without a request, e.g. for deleted
+                                    tasks. Creating an entity of the same kind (or
+                                    uncompleting the task) drops them early.
+        :param cache_max_entries: Maximum number of entries held per method.
+        :param cache_max_bytes: Maximum approximate bytes held per method.
+        :param cache_write_through: Store entities returned by add/update methods in the
+                                    cache, so reading them back costs no extra request.
+        :param cache_path: Path of an SQLite database to also keep cached entries in,
+                           so they survive restarts and are shared between processes.
+                           Set cache_ttl too, to bound how stale those entries can get.
+        :param cache_streaming: Return iterators from paginated methods, yielding
+                                results as their pages arrive, instead of lists.
+        """
+        super().__init__(
+            token,
+            request_id_fn,
+            session,
+            transport=transport,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            json_codec=json_codec,
+            timeout=timeout,
+            compress_requests=compress_requests,
+            prefetch_pages=prefetch_pages,
+            bulk=bulk,
+        )
+        self._cache_write_through = cache_write_through
+        self._cache_streaming = cache_streaming
+        self._persistent_cache = (
+            SQLiteCache(cache_path, token_namespace(token))
+            if cache_path is not None
+            else None
+        )
+        self._caches: dict[str, MethodCache] = {}
+        self._entity_store: EntityStore[Entity] = EntityStore()
+        self._cache_lock = threading.RLock()
+        for name in dir(type(self)):
+            method = getattr_static(type(self), name)
+            if isinstance(method, CachedMethod):
+                cache = method.cache_for(self)
+                cache.ttl = _cache_option(cache_ttl, name, cache.ttl)
+                cache.soft_ttl = _cache_option(cache_soft_ttl, name, cache.soft_ttl)
+                cache.not_found_ttl = _cache_option(
+                    cache_not_found_ttl, name, cache.not_found_ttl
+                )
+                cache.max_entries = _cache_option(
+                    cache_max_entries, name, cache.max_entries
+                )
+                cache.max_bytes = _cache_option(cache_max_bytes, name, cache.max_bytes)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Exit the runtime context.
+
+        Waits for background refreshes, then closes the requests session and any
+        on-disk cache.
+        """
+        refresher = self.__dict__.pop("_cache_refresher", None)
+        if refresher is not None:
+            refresher.shutdown(wait=True)
+        super().__exit__(exc_type, exc_value, traceback)
+        if self._persistent_cache is not None:
+            self._persistent_cache.close()
+
+    def cache_stats(self, reset: bool = False) -> CacheStats:
+        """
+        Snapshot the cache statistics of every cached method.
+
+        Counts cover the time since the client was created or the last reset.
+        `dataclasses.asdict()` turns the snapshot into plain dicts for exporting.
+
+        :param reset: Zero the counters once read, so the next snapshot only
+                      covers what happened since this one.
+        :return: Per-method hits, misses, evictions, size and estimated network
+                 time saved, plus the size of the shared entity store and the
+                 bytes saved by compression.
+        """
+        return cache_stats(self, reset=reset)
 
     ##################################################################################
     #
     # All 'get' methods can be cached
     #
     ##################################################################################
-    get_task                                = cached(               TodoistAPI.get_task                                 )
-    get_tasks                               = cached( capture_list( TodoistAPI.get_tasks                              ) )
-    filter_tasks                            = cached( capture_list( TodoistAPI.filter_tasks                           ) )
-    get_completed_tasks_by_due_date         = cached( capture_list( TodoistAPI.get_completed_tasks_by_due_date        ) )
-    get_completed_tasks_by_completion_date  = cached( capture_list( TodoistAPI.get_completed_tasks_by_completion_date ) )
-    get_project                             = cached(               TodoistAPI.get_project                              )
-    get_projects                            = cached( capture_list( TodoistAPI.get_projects                           ) )
-    get_collaborators                       = cached( capture_list( TodoistAPI.get_collaborators                      ) )
-    get_section                             = cached(               TodoistAPI.get_section                              )
-    get_sections                            = cached( capture_list( TodoistAPI.get_sections                           ) )
-    get_comment                             = cached(               TodoistAPI.get_comment                              )
-    get_comments                            = cached( capture_list( TodoistAPI.get_comments                           ) )
-    get_label                               = cached(               TodoistAPI.get_label                                )
-    get_labels                              = cached( capture_list( TodoistAPI.get_labels                             ) )
-    get_shared_labels                       = cached( capture_list( TodoistAPI.get_shared_labels                      ) )
-    # capture_list will convert a PagintedResults object into a list
-    # this means that the return type is now List[dict[str,Any]] instead of Iterator[dict[str,Any]]
-    # it will cache better this way, but is expensive for large result sets
+    get_task = cached(
+        TodoistAPI.get_task,
+        kind="task",
+        tags=entity_tags("task"),
+        entity_id="task_id",
+    )
+    get_tasks = cached(
+        TodoistAPI.get_tasks,
+        paginated=True,
+        kind="task",
+        tags=list_tags("task", "project_id", "section_id", "parent_id", "label", "ids"),
+    )
+    filter_tasks = cached(
+        TodoistAPI.filter_tasks,
+        paginated=True,
+        kind="task",
+        tags=list_tags("task", any_change=True),
+    )
+    get_completed_tasks_by_due_date = cached(
+        TodoistAPI.get_completed_tasks_by_due_date,
+        paginated=True,
+        tags=list_tags("task", any_change=True),
+    )
+    get_completed_tasks_by_completion_date = cached(
+        TodoistAPI.get_completed_tasks_by_completion_date,
+        paginated=True,
+        tags=list_tags("task", any_change=True),
+    )
+    get_project = cached(
+        TodoistAPI.get_project,
+        kind="project",
+        tags=entity_tags("project"),
+        entity_id="project_id",
+    )
+    get_projects = cached(
+        TodoistAPI.get_projects,
+        paginated=True,
+        kind="project",
+        tags=list_tags("project"),
+    )
+    get_collaborators = cached(
+        TodoistAPI.get_collaborators,
+        paginated=True,
+        tags=lambda params, result: {("in", "project", params["project_id"])},
+    )
+    get_section = cached(
+        TodoistAPI.get_section,
+        kind="section",
+        tags=entity_tags("section"),
+        entity_id="section_id",
+    )
+    get_sections = cached(
+        TodoistAPI.get_sections,
+        paginated=True,
+        kind="section",
+        tags=list_tags("section", "project_id"),
+    )
+    get_comment = cached(
+        TodoistAPI.get_comment,
+        kind="comment",
+        tags=entity_tags("comment"),
+        entity_id="comment_id",
+    )
+    get_comments = cached(
+        TodoistAPI.get_comments,
+        paginated=True,
+        kind="comment",
+        tags=list_tags("comment", "project_id", "task_id"),
+    )
+    get_label = cached(
+        TodoistAPI.get_label,
+        kind="label",
+        tags=entity_tags("label"),
+        entity_id="label_id",
+    )
+    get_labels = cached(
+        TodoistAPI.get_labels,
+        paginated=True,
+        kind="label",
+        tags=list_tags("label"),
+    )
+    get_shared_labels = cached(
+        TodoistAPI.get_shared_labels,
+        paginated=True,
+        tags=lambda params, result: {ANY_CHANGE},
+    )
+    # paginated methods return a list of every result instead of a ResultsPaginator,
+    # unless cache_streaming is set
+    # either way, pages are cached as they arrive, so an iteration stopped part-way is
+    # resumed rather than restarted
+    # collaborators and shared labels are not entities with IDs, so they have no kind
+    # completed tasks are shaped differently to active ones, so are kept apart from them
+    # everything else is normalized into the entity store, so e.g. get_task(task_id) is
+    # a hit after get_tasks() returned that task
 
     ##################################################################################
     #
-    # 'set' methods need to be wrapped to invalidate the relevant caches
+    # 'set' methods need to be wrapped to invalidate the relevant cache entries
     #
     ##################################################################################
-
-    # TODO be smarter and only invalidate the caches for methods where it is relevant, e.g. get_task(task_id) only needs to be invalidated for that task_id
-    # This is a little complicated when it comes to things like get_tasks(project_id)
-    # For now, we will zealously invalidate any vaguely relevant cache as below:
-    HIGHLY_SENSITIVE_CACHES = {filter_tasks, get_completed_tasks_by_completion_date, get_completed_tasks_by_due_date} # always clear this cache because the filter queries can select for pretty much anything
-
-    TASK_SENSITIVE_CACHES    = HIGHLY_SENSITIVE_CACHES | {get_task, get_tasks}
-    SECTION_SENSITIVE_CACHES = HIGHLY_SENSITIVE_CACHES | {get_section, get_sections}
-    PROJECT_SENSITIVE_CACHES = HIGHLY_SENSITIVE_CACHES | {get_project, get_projects}
-    LABEL_SENSITIVE_CACHES   = HIGHLY_SENSITIVE_CACHES | {get_labels, get_label, get_shared_labels}
-    COMMENT_SENSITIVE_CACHES = HIGHLY_SENSITIVE_CACHES | {get_comment, get_comments}
-    ALL_CACHES               = TASK_SENSITIVE_CACHES | SECTION_SENSITIVE_CACHES | PROJECT_SENSITIVE_CACHES | LABEL_SENSITIVE_CACHES | COMMENT_SENSITIVE_CACHES
+    # Only entries tagged with data the change touches are dropped, e.g.
+    # update_task(task_id) drops get_task(task_id), the lists containing that task,
+    # and the get_tasks lists for its (new) project, section, parent and labels
+    # There are only two hard things in computer science: cache invalidation and
+    # naming things - Phil Karlton
+    #
+    # With cache_write_through, methods with 'writes' store the entity they return,
+    # and 'patch' ones (updates) also swap it into cached lists where that is safe
 
     ###############################################
     # Task manipulators
     ###############################################
-    add_task                                = cache_invalidator(TodoistAPI.add_task,         ALL_CACHES | TASK_SENSITIVE_CACHES)
-    add_task_quick                          = cache_invalidator(TodoistAPI.add_task_quick,   ALL_CACHES | TASK_SENSITIVE_CACHES)
-    update_task                             = cache_invalidator(TodoistAPI.update_task,      ALL_CACHES | TASK_SENSITIVE_CACHES)
-    complete_task                           = cache_invalidator(TodoistAPI.complete_task,    ALL_CACHES | TASK_SENSITIVE_CACHES)
-    uncomplete_task                         = cache_invalidator(TodoistAPI.uncomplete_task,  ALL_CACHES | TASK_SENSITIVE_CACHES)
-    move_task                               = cache_invalidator(TodoistAPI.move_task,        ALL_CACHES | TASK_SENSITIVE_CACHES)
-    delete_task                             = cache_invalidator(TodoistAPI.delete_task,      ALL_CACHES | TASK_SENSITIVE_CACHES | COMMENT_SENSITIVE_CACHES | LABEL_SENSITIVE_CACHES)
+    add_task = cache_invalidator(TodoistAPI.add_task, _task_added, writes="task")
+    add_task_quick = cache_invalidator(
+        TodoistAPI.add_task_quick, _task_added_quick, writes="task"
+    )
+    update_task = cache_invalidator(
+        TodoistAPI.update_task, _task_updated, writes="task", patch=True
+    )
+    complete_task = cache_invalidator(TodoistAPI.complete_task, _task_completed)
+    uncomplete_task = cache_invalidator(TodoistAPI.uncomplete_task, _task_uncompleted)
+    move_task = cache_invalidator(TodoistAPI.move_task, _task_moved)
+    delete_task = cache_invalidator(TodoistAPI.delete_task, _task_deleted)
 
     ###############################################
     # Section manipulators
     ###############################################
-    add_section                             = cache_invalidator(TodoistAPI.add_section,       ALL_CACHES | SECTION_SENSITIVE_CACHES)
-    update_section                          = cache_invalidator(TodoistAPI.update_section,    ALL_CACHES | SECTION_SENSITIVE_CACHES)
-    delete_section                          = cache_invalidator(TodoistAPI.delete_section,    ALL_CACHES | SECTION_SENSITIVE_CACHES | TASK_SENSITIVE_CACHES | COMMENT_SENSITIVE_CACHES | LABEL_SENSITIVE_CACHES)
+    add_section = cache_invalidator(
+        TodoistAPI.add_section, _section_added, writes="section"
+    )
+    update_section = cache_invalidator(
+        TodoistAPI.update_section, _section_updated, writes="section", patch=True
+    )
+    delete_section = cache_invalidator(TodoistAPI.delete_section, _section_deleted)
 
     ###############################################
     # Project manipulators
     ###############################################
-    add_project                             = cache_invalidator(TodoistAPI.add_project,       ALL_CACHES | PROJECT_SENSITIVE_CACHES)
-    update_project                          = cache_invalidator(TodoistAPI.update_project,    ALL_CACHES | PROJECT_SENSITIVE_CACHES)
-    archive_project                         = cache_invalidator(TodoistAPI.archive_project,   ALL_CACHES | PROJECT_SENSITIVE_CACHES)
-    unarchive_project                       = cache_invalidator(TodoistAPI.unarchive_project, ALL_CACHES | PROJECT_SENSITIVE_CACHES)
-    delete_project                          = cache_invalidator(TodoistAPI.delete_project,    ALL_CACHES | PROJECT_SENSITIVE_CACHES | SECTION_SENSITIVE_CACHES | TASK_SENSITIVE_CACHES | COMMENT_SENSITIVE_CACHES | LABEL_SENSITIVE_CACHES)
+    add_project = cache_invalidator(
+        TodoistAPI.add_project, _project_added, writes="project"
+    )
+    update_project = cache_invalidator(
+        TodoistAPI.update_project, _project_updated, writes="project", patch=True
+    )
+    archive_project = cache_invalidator(
+        TodoistAPI.archive_project, _project_removed, writes="project"
+    )
+    unarchive_project = cache_invalidator(
+        TodoistAPI.unarchive_project, _project_unarchived, writes="project"
+    )
+    delete_project = cache_invalidator(TodoistAPI.delete_project, _project_removed)
 
     ###############################################
     # Comment manipulators
     ###############################################
-    add_comment                             = cache_invalidator(TodoistAPI.add_comment,      ALL_CACHES | COMMENT_SENSITIVE_CACHES)
-    update_comment                          = cache_invalidator(TodoistAPI.update_comment,   ALL_CACHES | COMMENT_SENSITIVE_CACHES)
-    delete_comment                          = cache_invalidator(TodoistAPI.delete_comment,   ALL_CACHES | COMMENT_SENSITIVE_CACHES)
+    add_comment = cache_invalidator(
+        TodoistAPI.add_comment, _comment_added, writes="comment"
+    )
+    update_comment = cache_invalidator(
+        TodoistAPI.update_comment, _comment_updated, writes="comment", patch=True
+    )
+    delete_comment = cache_invalidator(TodoistAPI.delete_comment, _comment_deleted)
 
     ###############################################
     # Label manipulators
     ###############################################
-    add_label                               = cache_invalidator(TodoistAPI.add_label,              ALL_CACHES | LABEL_SENSITIVE_CACHES)
-    update_label                            = cache_invalidator(TodoistAPI.update_label,           ALL_CACHES | LABEL_SENSITIVE_CACHES)
-    delete_label                            = cache_invalidator(TodoistAPI.delete_label,           ALL_CACHES | LABEL_SENSITIVE_CACHES)
-    rename_shared_label                     = cache_invalidator(TodoistAPI.rename_shared_label,    ALL_CACHES | LABEL_SENSITIVE_CACHES)
-    remove_shared_label                     = cache_invalidator(TodoistAPI.remove_shared_label,    ALL_CACHES | LABEL_SENSITIVE_CACHES)
+    add_label = cache_invalidator(TodoistAPI.add_label, _label_added, writes="label")
+    update_label = cache_invalidator(
+        TodoistAPI.update_label, _label_updated, writes="label", patch=True
+    )
+    delete_label = cache_invalidator(TodoistAPI.delete_label, _label_renamed_or_deleted)
+    rename_shared_label = cache_invalidator(
+        TodoistAPI.rename_shared_label, _shared_label_renamed
+    )
+    remove_shared_label = cache_invalidator(
+        TodoistAPI.remove_shared_label, _shared_label_removed
+    )